@@ -0,0 +1,76 @@
+# src/benchmarks/bench_extraction.py
+"""
+Benchmark for SearchResultsPage.get_products
+Compares bulk and per-element extraction against a saved results page
+
+Usage:
+    python -m src.benchmarks.bench_extraction [--fixture PATH] [--rounds N]
+"""
+
+import argparse
+import os
+import time
+from typing import Dict
+
+from playwright.sync_api import sync_playwright
+
+from src.benchmarks.ipc_counter import count_ipc_calls
+from src.pages.search_results_page import SearchResultsPage
+
+DEFAULT_FIXTURE = os.path.join("src", "tests", "fixtures", "search_results_laptop.html")
+
+
+def run_mode(results_page: SearchResultsPage, bulk: bool, max_count: int, rounds: int) -> Dict[str, float]:
+    """Run one extraction mode and return per-card IPC and timing numbers"""
+    products = []
+    with count_ipc_calls() as counter:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            products = results_page.get_products(max_count=max_count, bulk=bulk)
+        elapsed = time.perf_counter() - start
+
+    cards = max(len(products), 1)
+    return {
+        'cards': len(products),
+        'ipc_calls': counter.calls / rounds,
+        'ipc_per_card': counter.calls / rounds / cards,
+        'wall_ms': elapsed * 1000 / rounds,
+        'ms_per_card': elapsed * 1000 / rounds / cards,
+        'products': products,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="Saved search results HTML")
+    parser.add_argument("--rounds", type=int, default=5, help="Extraction passes per mode")
+    parser.add_argument("--max-count", type=int, default=48, help="Cards to extract per pass")
+    args = parser.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as f:
+        html = f.read()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        page.set_content(html)
+        results_page = SearchResultsPage(page)
+
+        per_element = run_mode(results_page, bulk=False, max_count=args.max_count, rounds=args.rounds)
+        bulk = run_mode(results_page, bulk=True, max_count=args.max_count, rounds=args.rounds)
+        browser.close()
+
+    if per_element['products'] != bulk['products']:
+        raise SystemExit("Bulk and per-element extraction returned different products")
+
+    print(f"{'mode':<12} {'cards':>6} {'ipc':>8} {'ipc/card':>9} {'wall ms':>9} {'ms/card':>8}")
+    for name, result in (('per-element', per_element), ('bulk', bulk)):
+        print(
+            f"{name:<12} {result['cards']:>6} {result['ipc_calls']:>8.0f} {result['ipc_per_card']:>9.2f} "
+            f"{result['wall_ms']:>9.1f} {result['ms_per_card']:>8.2f}"
+        )
+    print(f"speedup: {per_element['wall_ms'] / max(bulk['wall_ms'], 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# src/benchmarks/bench_import.py
+"""
+Import cost of the framework entry points, each in a fresh interpreter
+Also reports what an import leaves behind: Playwright loaded, threads
+started, files created, or settings read from the environment;
+collection, sharding dry-runs and snapshot parsing should pay for none
+of these
+
+Usage:
+    python -m src.benchmarks.bench_import [--rounds 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Seconds one import may take in a fresh interpreter; generous, since
+# the point is to catch Playwright or a heavy dependency creeping back in
+BUDGETS = {
+    "src.config.config": 0.15,
+    "src.pages.search_results_page": 0.5,
+    "src.pages.snapshot": 0.5,
+    "src.utils.sharding": 0.25,
+}
+
+PROBE = """
+import importlib, json, sys, threading, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+seconds = time.perf_counter() - start
+config = sys.modules.get("src.config.config")
+print(json.dumps({
+    "seconds": seconds,
+    "playwright": any(name.split(".")[0] == "playwright" for name in sys.modules),
+    "threads": threading.active_count(),
+    "settings": sorted(config.config.__dict__) if config else [],
+    "dotenv": "dotenv" in sys.modules,
+}))
+"""
+
+
+def measure(module: str) -> Dict:
+    """
+    Import one module in a fresh interpreter, run from an empty directory
+    
+    Returns:
+        seconds, whether Playwright got loaded, live thread count, the
+        config settings resolved, whether dotenv got loaded, and the
+        files the import created
+    """
+    with tempfile.TemporaryDirectory() as cwd:
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        out = subprocess.run([sys.executable, "-c", PROBE, module], cwd=cwd, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        result["files"] = sorted(
+            os.path.relpath(os.path.join(dirpath, name), cwd)
+            for dirpath, _, names in os.walk(cwd) for name in names
+        )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="Fresh interpreters per module")
+    args = parser.parse_args()
+    
+    print(f"{'module':<32} {'median ms':>10} {'budget ms':>10}  playwright threads files settings")
+    for module, budget in BUDGETS.items():
+        runs = [measure(module) for _ in range(args.rounds)]
+        seconds = statistics.median(r["seconds"] for r in runs)
+        last = runs[-1]
+        flag = "  OVER BUDGET" if seconds > budget else ""
+        print(f"{module:<32} {seconds * 1000:>10.1f} {budget * 1000:>10.0f}  "
+              f"{str(last['playwright']):<10} {last['threads']:>7} {len(last['files']):>5} "
+              f"{len(last['settings']):>8}{flag}")
+    playwright = statistics.median(measure("playwright.sync_api")["seconds"] for _ in range(args.rounds))
+    print(f"\nfor reference, playwright.sync_api alone: {playwright * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# src/benchmarks/bench_product_store.py
+"""
+Memory and aggregation speed of ProductTable against lists of product dicts
+Products come from the stand-in catalog, shaped exactly like get_products output
+
+Usage:
+    python -m src.benchmarks.bench_product_store [--queries 50] [--pages 7] [--rounds 5]
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List
+
+from src.standin.catalog import Catalog
+from src.utils.product_store import ProductTable
+
+QUERIES = ["laptop", "monitor", "keyboard", "headphones", "webcam", "tablet", "router", "ssd"]
+
+
+def crawl(queries: int, pages: int) -> Iterator[Dict]:
+    """Product dicts as a crawl over queries x pages would yield them"""
+    catalog = Catalog(pages=pages)
+    for q in range(queries):
+        query = f"{QUERIES[q % len(QUERIES)]} {q // len(QUERIES)}".strip()
+        index = 0
+        for page in range(1, pages + 1):
+            for item in catalog.search(query, page).items:
+                index += 1
+                yield {
+                    'index': index,
+                    # Built per card, like text read back from the browser
+                    'title': "".join([item.title]),
+                    'price': item.price,
+                    'rating': item.rating,
+                    'is_prime': item.is_prime,
+                    'is_sponsored': item.is_sponsored,
+                    'query': query,
+                }
+
+
+def measure_memory(build: Callable[[], object]) -> int:
+    """Bytes still allocated once build has returned"""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def dict_aggregates(products: List[Dict]) -> tuple:
+    prices = [p['price'] for p in products if p['price'] is not None]
+    histogram: Dict[float, int] = {}
+    for p in products:
+        if p['rating'] is not None:
+            edge = int(p['rating'] * 2) / 2
+            histogram[edge] = histogram.get(edge, 0) + 1
+    sponsored = sum(1 for p in products if p['is_sponsored']) / len(products)
+    return min(prices), max(prices), statistics.fmean(prices), statistics.median(prices), histogram, sponsored
+
+
+def table_aggregates(table: ProductTable) -> tuple:
+    return table.price_stats(), table.rating_histogram(), table.sponsored_share()
+
+
+def best_of(rounds: int, func: Callable, arg) -> float:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=50, help="Distinct queries crawled")
+    parser.add_argument("--pages", type=int, default=7, help="Result pages per query")
+    parser.add_argument("--rounds", type=int, default=5, help="Aggregation rounds; best is reported")
+    args = parser.parse_args()
+    
+    dict_bytes = measure_memory(lambda: list(crawl(args.queries, args.pages)))
+    table_bytes = measure_memory(lambda: ProductTable.from_products(crawl(args.queries, args.pages)))
+    
+    products = list(crawl(args.queries, args.pages))
+    table = ProductTable.from_products(products)
+    dict_seconds = best_of(args.rounds, dict_aggregates, products)
+    table_seconds = best_of(args.rounds, table_aggregates, table)
+    
+    print(f"{len(products)} products from {args.queries} queries x {args.pages} pages")
+    print(f"{'':<16} {'memory MB':>10} {'bytes/row':>10} {'aggregate ms':>13}")
+    for name, size, seconds in (("list of dicts", dict_bytes, dict_seconds), ("ProductTable", table_bytes, table_seconds)):
+        print(f"{name:<16} {size / 1024 / 1024:>10.2f} {size / len(products):>10.0f} {seconds * 1000:>13.1f}")
+    print(f"memory ratio {dict_bytes / table_bytes:.1f}x, aggregation ratio {dict_seconds / table_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
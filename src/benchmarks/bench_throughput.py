@@ -0,0 +1,89 @@
+# src/benchmarks/bench_throughput.py
+"""
+Search and extraction throughput against the local stand-in server
+Each worker process drives its own browser through HomePage and
+SearchResultsPage; the stand-in serves every worker
+
+Usage:
+    python -m src.benchmarks.bench_throughput [--workers 1 4 16] [--searches 10] [--latency-ms 0]
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from playwright.sync_api import sync_playwright
+
+from src.config.config import config
+from src.pages.home_page import HomePage
+from src.pages.search_results_page import SearchResultsPage
+from src.standin.server import StandInConfig, StandInServer
+
+QUERIES = ["laptop", "monitor", "keyboard", "headphones", "webcam", "tablet", "router", "ssd"]
+
+
+def run_worker(base_url: str, worker: int, searches: int) -> Dict[str, float]:
+    """Run searches in one browser and time the extraction part separately"""
+    config.base_url = base_url
+    extracted = 0
+    extraction_seconds = 0.0
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        home_page = HomePage(page)
+        results_page = SearchResultsPage(page)
+        for i in range(searches):
+            home_page.goto()
+            home_page.search_product(QUERIES[(worker + i) % len(QUERIES)])
+            results_page.wait_for_results(stable_ms=0)
+            start = time.perf_counter()
+            extracted += len(results_page.get_products(max_count=48))
+            extraction_seconds += time.perf_counter() - start
+        browser.close()
+    return {"searches": searches, "products": extracted, "extraction_seconds": extraction_seconds}
+
+
+def run_level(base_url: str, workers: int, searches: int) -> Dict[str, float]:
+    """Run one concurrency level and aggregate the workers"""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results: List[Dict[str, float]] = list(pool.map(
+            run_worker, [base_url] * workers, range(workers), [searches] * workers
+        ))
+    wall = time.perf_counter() - start
+    
+    total_searches = sum(r["searches"] for r in results)
+    total_products = sum(r["products"] for r in results)
+    extraction_seconds = sum(r["extraction_seconds"] for r in results)
+    return {
+        "workers": workers,
+        "wall": wall,
+        "searches_per_second": total_searches / wall,
+        "products_per_second": total_products / wall,
+        "extract_ms_per_page": extraction_seconds * 1000 / total_searches,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16], help="Concurrency levels")
+    parser.add_argument("--searches", type=int, default=10, help="Searches per worker")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Stand-in response latency")
+    parser.add_argument("--page-size", type=int, default=48, help="Cards per results page")
+    args = parser.parse_args()
+    
+    settings = StandInConfig(latency_ms=args.latency_ms, page_size=args.page_size)
+    with StandInServer(settings) as server:
+        rows = [run_level(server.url, workers, args.searches) for workers in args.workers]
+        
+    print(f"{'workers':>7} {'wall s':>8} {'searches/s':>11} {'products/s':>11} {'extract ms/page':>16}")
+    for row in rows:
+        print(
+            f"{row['workers']:>7} {row['wall']:>8.1f} {row['searches_per_second']:>11.2f} "
+            f"{row['products_per_second']:>11.0f} {row['extract_ms_per_page']:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
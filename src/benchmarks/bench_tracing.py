@@ -0,0 +1,111 @@
+# src/benchmarks/bench_tracing.py
+"""
+Overhead of failure diagnostics: tracing off, ring buffer (with and
+without per-navigation DOM snapshots), and full Playwright tracing, on a
+search scenario against the local stand-in
+Passing rounds discard what was captured; failing rounds also write it
+
+Usage:
+    python -m src.benchmarks.bench_tracing [--rounds 10] [--latency-ms 0] [--events 100000] [--dom-snapshots 3]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Dict
+
+from playwright.sync_api import Browser, sync_playwright
+
+from src.config.config import config
+from src.pages.home_page import HomePage
+from src.pages.search_results_page import SearchResultsPage
+from src.standin.server import StandInConfig, StandInServer
+from src.utils.flight_recorder import FlightRecorder
+
+# 'ring+dom' also snapshots each document, as TRACE_DOM_SNAPSHOTS > 0 does
+MODES = ("off", "ring", "ring+dom", "on")
+
+
+def scenario(page) -> None:
+    """Homepage, search, two results pages"""
+    home_page = HomePage(page).goto()
+    home_page.search_product("laptop")
+    results_page = SearchResultsPage(page)
+    results_page.wait_for_results(stable_ms=0)
+    results_page.get_products(max_count=48)
+    results_page.navigate(results_page.next_page_url())
+    results_page.wait_for_results(stable_ms=0)
+    results_page.get_products(max_count=48)
+
+
+def run_round(browser: Browser, mode: str, fail: bool, out_dir: str, dom_snapshots: int = 3) -> Dict[str, float]:
+    """One scenario in a fresh context; returns seconds and bytes written"""
+    context = browser.new_context()
+    page = context.new_page()
+    path = os.path.join(out_dir, f"{mode}_{time.perf_counter_ns()}.zip")
+    start = time.perf_counter()
+    recorder = None
+    if mode.startswith("ring"):
+        snapshots = dom_snapshots if mode == "ring+dom" else 0
+        recorder = FlightRecorder(config.trace_buffer_size, snapshots).attach(page)
+    elif mode == "on":
+        context.tracing.start(screenshots=True, snapshots=True)
+    scenario(page)
+    if recorder is not None:
+        recorder.detach(page)
+        if fail:
+            recorder.flush(path)
+    elif mode == "on":
+        context.tracing.stop(path=path if fail else None)
+    elapsed = time.perf_counter() - start
+    context.close()
+    return {"seconds": elapsed, "bytes": os.path.getsize(path) if os.path.exists(path) else 0}
+
+
+def event_cost(events: int) -> float:
+    """Nanoseconds the ring buffer spends per network event, without a browser"""
+    recorder = FlightRecorder()
+    request = SimpleNamespace(method="GET", url="http://127.0.0.1:8000/s?k=laptop&page=2")
+    start = time.perf_counter()
+    for _ in range(events):
+        recorder._on_request(request)
+    return (time.perf_counter() - start) * 1e9 / events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10, help="Scenarios per mode and outcome")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Stand-in response delay")
+    parser.add_argument("--events", type=int, default=100000, help="Events for the per-event cost")
+    parser.add_argument("--dom-snapshots", type=int, default=3, help="Documents kept in 'ring+dom' mode")
+    args = parser.parse_args()
+    
+    print(f"ring buffer: {event_cost(args.events):.0f} ns per network event (Python side only)")
+    with StandInServer(StandInConfig(latency_ms=args.latency_ms)) as server, \
+            tempfile.TemporaryDirectory() as out_dir, sync_playwright() as p:
+        config.base_url = server.url
+        browser = p.chromium.launch(headless=True)
+        run_round(browser, "off", False, out_dir)  # warm-up
+        
+        results = {}
+        for fail in (False, True):
+            for mode in MODES:
+                rounds = [run_round(browser, mode, fail, out_dir, args.dom_snapshots) for _ in range(args.rounds)]
+                results[mode, fail] = (
+                    statistics.median(r["seconds"] for r in rounds),
+                    statistics.mean(r["bytes"] for r in rounds),
+                )
+        browser.close()
+    
+    baseline = results["off", False][0]
+    print(f"{'mode':<9} {'outcome':<8} {'median ms':>10} {'overhead':>9} {'written KB':>11}")
+    for (mode, fail), (seconds, size) in results.items():
+        print(f"{mode:<9} {'failed' if fail else 'passed':<8} {seconds * 1000:>10.1f} "
+              f"{(seconds / baseline - 1) * 100:>8.1f}% {size / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
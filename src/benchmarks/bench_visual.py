@@ -0,0 +1,114 @@
+# src/benchmarks/bench_visual.py
+"""
+Cost of visual checks: naive full-frame pixel diff against tile
+signatures with per-tile diffs, for unchanged, re-encoded and locally
+changed captures of a 1920x1080 page
+
+Usage:
+    python -m src.benchmarks.bench_visual [--rounds 5] [--png capture.png] [--tile-size 128]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict
+
+from src.utils.visual import PIXEL_TOLERANCE, Image, VisualChecker, _pillow, decode_png, diff_region, encode_png
+
+
+def synthetic_page(width: int = 1920, height: int = 1080) -> Image:
+    """White page with a header band and rows of text-like bars"""
+    rows = []
+    for y in range(height):
+        row = bytearray(b"\xff\xff\xff" * width)
+        if y < 60:
+            row[:] = b"\x13\x19\x21" * width
+        elif y % 24 < 10:
+            for x in range(40 + (y // 24) % 5 * 7, width - 300, 13):
+                row[x * 3:(x + 9) * 3] = b"\x33\x33\x33" * 9
+        rows.append(bytes(row))
+    return Image(width, height, 3, rows)
+
+
+def changed_copy(image: Image) -> Image:
+    """The same page with a price-sized patch recolored"""
+    rows = list(image.rows)
+    c = image.channels
+    for y in range(300, 324):
+        row = bytearray(rows[y])
+        row[600 * c:720 * c] = b"\xb1\x27\x04"[:c] * 120 if c >= 3 else bytes(120 * c)
+        rows[y] = bytes(row)
+    return Image(image.width, image.height, c, rows)
+
+
+def naive_diff(baseline_png: bytes, current_png: bytes) -> int:
+    """Decode both captures and compare every pixel"""
+    baseline = decode_png(baseline_png)
+    current = decode_png(current_png)
+    colors = min(current.channels, 3)
+    count = 0
+    for base_row, row in zip(baseline.rows, current.rows):
+        for i in range(0, len(row), current.channels):
+            if any(abs(base_row[i + k] - row[i + k]) > PIXEL_TOLERANCE for k in range(colors)):
+                count += 1
+    return count
+
+
+def row_skipping_diff(baseline_png: bytes, current_png: bytes) -> int:
+    """Decode both captures and compare the pixels of rows whose bytes differ"""
+    baseline = decode_png(baseline_png)
+    current = decode_png(current_png)
+    return diff_region(baseline, current, (0, 0, current.width, current.height))
+
+
+def median_ms(func: Callable[[], object], rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="Timed repetitions per case")
+    parser.add_argument("--png", default=None, help="Real capture to use instead of the synthetic page")
+    parser.add_argument("--tile-size", type=int, default=128, help="Tile edge in pixels")
+    args = parser.parse_args()
+    
+    if args.png:
+        with open(args.png, "rb") as f:
+            baseline_png = f.read()
+        image = decode_png(baseline_png)
+    else:
+        image = synthetic_page()
+        baseline_png = encode_png(image)
+    cases: Dict[str, bytes] = {
+        "unchanged": baseline_png,
+        # Same pixels, different bytes: what a new browser build tends to produce
+        "re-encoded": encode_png(image, level=1),
+        "local change": encode_png(changed_copy(image)),
+    }
+    
+    print(f"{image.width}x{image.height}, {image.channels} channels, decoder: "
+          f"{'Pillow' if _pillow() else 'standard library'}")
+    print(f"decode: {median_ms(lambda: decode_png(baseline_png), args.rounds):.1f} ms per capture\n")
+    print(f"{'case':<14} {'naive ms':>9} {'row-skip ms':>12} {'tiled ms':>9} {'tiles diffed':>13} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for case, png in cases.items():
+            checker = VisualChecker(directory, directory, tile_size=args.tile_size, update=True)
+            checker.check(baseline_png, case)
+            checker.update = False
+            naive = median_ms(lambda: naive_diff(baseline_png, png), max(1, args.rounds // 2))
+            row_skip = median_ms(lambda: row_skipping_diff(baseline_png, png), args.rounds)
+            tiled = median_ms(lambda: checker.check(png, case), args.rounds)
+            result = checker.check(png, case)
+            print(f"{case:<14} {naive:>9.1f} {row_skip:>12.1f} {tiled:>9.1f} "
+                  f"{len(result.changed_tiles):>6}/{result.tiles:<6} "
+                  f"{naive / tiled if tiled else 0:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# src/benchmarks/ipc_counter.py
+"""
+Counts Playwright driver round-trips
+Wraps the protocol channel so benchmarks can report IPC calls per operation
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from playwright._impl._connection import Channel
+
+
+class IpcCounter:
+    """Tally of protocol messages sent to the Playwright driver"""
+
+    def __init__(self):
+        self.calls = 0
+        self.by_method: Dict[str, int] = {}
+
+    def record(self, method: str) -> None:
+        self.calls += 1
+        self.by_method[method] = self.by_method.get(method, 0) + 1
+
+
+@contextmanager
+def count_ipc_calls() -> Iterator[IpcCounter]:
+    """
+    Count every message sent to the driver while the block runs
+
+    Yields:
+        IpcCounter updated in place
+    """
+    counter = IpcCounter()
+    original_send = Channel.send
+    original_send_as_dict = Channel.send_return_as_dict
+    original_send_no_reply = Channel.send_no_reply
+
+    async def send(self, method, params=None):
+        counter.record(method)
+        return await original_send(self, method, params)
+
+    async def send_return_as_dict(self, method, params=None):
+        counter.record(method)
+        return await original_send_as_dict(self, method, params)
+
+    def send_no_reply(self, method, params=None):
+        counter.record(method)
+        return original_send_no_reply(self, method, params)
+
+    Channel.send = send
+    Channel.send_return_as_dict = send_return_as_dict
+    Channel.send_no_reply = send_no_reply
+    try:
+        yield counter
+    finally:
+        Channel.send = original_send
+        Channel.send_return_as_dict = original_send_as_dict
+        Channel.send_no_reply = original_send_no_reply
@@ -1,37 +1,160 @@
 # src/config/config.py
 """
 Configuration management using environment variables
-Centralizes all configuration in one place
+Centralizes all configuration in one place; each setting is read from
+the environment (and .env) on first use, validated, and cached
 """
 
 import os
-from dataclasses import dataclass
-from dotenv import load_dotenv
+from typing import Any, Callable, Optional, Sequence
+
+_dotenv_loaded = False
+
+
+def load_env() -> None:
+    """Load .env into the environment, once per process"""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
+
+
+def _flag(raw: str) -> bool:
+    value = raw.strip().lower()
+    if value not in ('true', 'false', '1', '0', 'yes', 'no', ''):
+        raise ValueError("expected true or false")
+    return value in ('true', '1', 'yes')
+
+
+class setting:
+    """
+    A TestConfig field resolved from an environment variable on first access
+    
+    The parsed value is stored on the instance, so later reads are plain
+    attribute lookups, and assigning the attribute overrides it.
+    """
+    
+    def __init__(self, env: str, default: str, parse: Callable[[str], Any] = str,
+                 choices: Optional[Sequence] = None, lower: bool = False):
+        self.env = env
+        self.default = default
+        self.parse = parse
+        self.choices = choices
+        self.lower = lower
+    
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.resolve()
+        instance.__dict__[self.name] = value
+        return value
+    
+    def resolve(self) -> Any:
+        """Read, parse and check the variable, naming it in any error"""
+        load_env()
+        raw = os.getenv(self.env, self.default)
+        if self.lower:
+            raw = raw.lower()
+        try:
+            value = self.parse(raw)
+        except ValueError as e:
+            raise ValueError(f"Invalid {self.env}={raw!r}: {e}") from None
+        if self.choices is not None and value not in self.choices:
+            raise ValueError(f"Invalid {self.env}={raw!r}: expected one of {', '.join(map(repr, self.choices))}")
+        return value
 
-# Load environment variables
-load_dotenv()
 
-@dataclass
 class TestConfig:
     """Test configuration settings"""
     
     # Basic settings
-    base_url: str = os.getenv('BASE_URL', 'https://www.amazon.com')
-    headless: bool = os.getenv('HEADLESS', 'False').lower() == 'true'
-    timeout: int = int(os.getenv('TIMEOUT', '30000'))
+    base_url: str = setting('BASE_URL', 'https://www.amazon.com')
+    headless: bool = setting('HEADLESS', 'False', _flag)
+    timeout: int = setting('TIMEOUT', '30000', int)
     
     # Browser settings
-    browser_type: str = os.getenv('BROWSER', 'chromium')
-    viewport_width: int = int(os.getenv('VIEWPORT_WIDTH', '1920'))
-    viewport_height: int = int(os.getenv('VIEWPORT_HEIGHT', '1080'))
+    browser_type: str = setting('BROWSER', 'chromium', lower=True, choices=('chromium', 'firefox', 'webkit'))
+    viewport_width: int = setting('VIEWPORT_WIDTH', '1920', int)
+    viewport_height: int = setting('VIEWPORT_HEIGHT', '1080', int)
     
     # Test settings
-    screenshot_on_failure: bool = os.getenv('SCREENSHOT_ON_FAILURE', 'True').lower() == 'true'
-    retry_count: int = int(os.getenv('RETRY_COUNT', '2'))
+    screenshot_on_failure: bool = setting('SCREENSHOT_ON_FAILURE', 'True', _flag)
+    screenshot_budget_mb: int = setting('SCREENSHOT_BUDGET_MB', '200', int)
+    retry_count: int = setting('RETRY_COUNT', '2', int)
+    retry_backoff: float = setting('RETRY_BACKOFF', '1.0', float)
+    profile_steps: bool = setting('PROFILE_STEPS', 'False', _flag)
+    context_pool_size: int = setting('CONTEXT_POOL_SIZE', '2', int)
+    
+    # Resource blocking profile: 'full', 'no-media' or 'minimal'
+    block_profile: str = setting('BLOCK_PROFILE', 'full', lower=True, choices=('full', 'no-media', 'minimal'))
+    
+    # Local stand-in server; when enabled the suite points base_url at it
+    standin: bool = setting('STANDIN', 'False', _flag)
+    standin_latency_ms: int = setting('STANDIN_LATENCY_MS', '0', int)
+    
+    # Network replay: '' (live), 'record', 'strict' or 'fallback'
+    replay: str = setting('REPLAY', '', lower=True, choices=('', 'record', 'strict', 'fallback'))
+    replay_dir: str = setting('REPLAY_DIR', os.path.join('src', 'tests', 'fixtures', 'har'))
+    
+    # Failure diagnostics: 'off', 'ring' (in-memory window, written on
+    # failure) or 'on' (Playwright tracing, kept on failure)
+    trace_mode: str = setting('TRACE_MODE', 'off', lower=True, choices=('off', 'ring', 'on'))
+    trace_buffer_size: int = setting('TRACE_BUFFER_SIZE', '300', int)
+    # Earlier documents kept by the ring besides the final one; each costs
+    # every test a page.content() round-trip per navigation
+    trace_dom_snapshots: int = setting('TRACE_DOM_SNAPSHOTS', '0', int)
+    
+    # SQLite file for per-test, step and navigation timings; off unless set,
+    # e.g. PERF_DB=reports/perf.sqlite on the runs whose trend is gated
+    perf_db: str = setting('PERF_DB', '')
+    
+    # Visual baselines: 'assert' compares captures with them, 'update'
+    # rewrites them, 'off' skips visual checks
+    visual: str = setting('VISUAL', 'assert', lower=True, choices=('assert', 'update', 'off'))
+    visual_baseline_dir: str = setting('VISUAL_BASELINE_DIR', os.path.join('src', 'tests', 'fixtures', 'visual'))
+    visual_tile_size: int = setting('VISUAL_TILE_SIZE', '128', int)
+    # Fraction of a capture's pixels that may differ from the baseline
+    visual_threshold: float = setting('VISUAL_THRESHOLD', '0.001', float)
+    
+    # Save the HTML of every results page extracted, for offline parsing
+    snapshot_results: bool = setting('SNAPSHOT_RESULTS', 'False', _flag)
+    
+    # Signed-in identity; its storage state is cached for auth_state_ttl seconds
+    auth_email: str = setting('AUTH_EMAIL', '')
+    auth_password: str = setting('AUTH_PASSWORD', '')
+    auth_state_dir: str = setting('AUTH_STATE_DIR', os.path.join('reports', 'auth'))
+    auth_state_ttl: int = setting('AUTH_STATE_TTL', '3600', int)
+    
+    # Sharding settings (CI shards pass their index and the shard total)
+    shard_index: int = setting('SHARD_INDEX', '0', int)
+    shard_total: int = setting('SHARD_TOTAL', '1', int)
     
     # Test data
-    test_product: str = os.getenv('TEST_PRODUCT', 'laptop')
-    test_category: str = os.getenv('TEST_CATEGORY', 'Electronics')
+    test_product: str = setting('TEST_PRODUCT', 'laptop')
+    test_category: str = setting('TEST_CATEGORY', 'Electronics')
+    # Query matrix (CSV or YAML) and how many of its queries share one page
+    query_matrix: str = setting('QUERY_MATRIX', os.path.join('src', 'tests', 'fixtures', 'query_matrix.csv'))
+    matrix_batch_size: int = setting('MATRIX_BATCH_SIZE', '10', int)
+    
+    @classmethod
+    def settings(cls) -> dict:
+        """Every setting by field name"""
+        return {name: value for name, value in vars(cls).items() if isinstance(value, setting)}
+    
+    def validate(self) -> 'TestConfig':
+        """Resolve every setting now, so a bad variable fails fast"""
+        for name in self.settings():
+            getattr(self, name)
+        return self
+    
+    def reload(self) -> None:
+        """Forget resolved values and overrides; the next reads see the current environment"""
+        for name in self.settings():
+            self.__dict__.pop(name, None)
     
     @property
     def viewport(self) -> dict:
@@ -40,11 +163,36 @@ class TestConfig:
             'width': self.viewport_width,
             'height': self.viewport_height
         }
-        
+    
     @property
     def is_ci(self) -> bool:
         """Check if running in CI environment"""
         return os.getenv('CI', 'false').lower() == 'true'
 
 # Global config instance
-config = TestConfig()
\ No newline at end of file
+config = TestConfig()
+
+
+class config_default:
+    """
+    An attribute of a long-lived object that defaults to a config setting
+    
+    Like setting, the value is read on first access and stored on the
+    instance, so module-level singletons can be created at import without
+    reading the environment, later reads are plain attribute lookups, and
+    assigning the attribute overrides it.
+    """
+    
+    def __init__(self, name: str, convert: Callable[[Any], Any] = lambda value: value):
+        self.name = name
+        self.convert = convert
+    
+    def __set_name__(self, owner, attribute: str) -> None:
+        self.attribute = attribute
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.convert(getattr(config, self.name))
+        instance.__dict__[self.attribute] = value
+        return value
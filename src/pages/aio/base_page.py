@@ -0,0 +1,147 @@
+# src/pages/aio/base_page.py
+"""
+Async Base Page class with the same methods as the sync BasePage
+Lets one process drive many pages concurrently from an asyncio loop
+"""
+
+from typing import TYPE_CHECKING, Optional, List
+from src.pages.base_page import check_replay
+from src.pages.readiness import ReadinessCondition, record_timing
+from src.utils.logger import setup_logger
+from src.utils.perf_db import NAVIGATION, perf
+from src.utils.screenshots import screenshots
+from src.utils.timing import profiler, timed
+import time
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+class BasePage:
+    """
+    Async counterpart of src.pages.base_page.BasePage
+    Every method that talks to the browser is a coroutine
+    """
+    
+    def __init__(self, page: 'Page'):
+        self.page = page
+        self.logger = setup_logger(self.__class__.__name__)
+    
+    @timed
+    async def navigate(self, url: str) -> None:
+        """Navigate to a URL with logging"""
+        check_replay(self.page, url)
+        self.logger.info(f"Navigating to: {url}")
+        # goto returns at DOMContentLoaded, so timing it costs no extra round-trip
+        start = time.perf_counter()
+        await self.page.goto(url, wait_until="domcontentloaded")
+        perf.record(NAVIGATION, f"{type(self).__name__}.domcontentloaded", time.perf_counter() - start)
+    
+    async def start_navigation(self, url: str) -> None:
+        """Begin navigating without waiting, so the load overlaps other work"""
+        self.logger.info(f"Navigating in background to: {url}")
+        try:
+            # Mark the old document so the new one can be told apart from it
+            await self.page.evaluate("url => { window.__stale = true; window.location.href = url; }", url)
+        except Exception as e:
+            # The navigation can win the race against the evaluate reply
+            if "Execution context was destroyed" not in str(e):
+                raise
+    
+    @timed
+    async def finish_navigation(self, timeout: int = 30000) -> None:
+        """Wait until a navigation begun with start_navigation has replaced the old document"""
+        await self.page.wait_for_function(
+            "() => window.__stale !== true && document.readyState !== 'loading'", timeout=timeout
+        )
+    
+    @timed(selector=True)
+    async def wait_and_click(self, selector: str, timeout: int = 30000) -> None:
+        """Wait for element and click with error handling"""
+        try:
+            self.logger.info(f"Clicking element: {selector}")
+            element = self.page.locator(selector)
+            with profiler.step("wait_for visible"):
+                await element.wait_for(state="visible", timeout=timeout)
+            await element.scroll_into_view_if_needed()
+            await element.click()
+        except Exception as e:
+            self.logger.error(f"Failed to click {selector}: {str(e)}")
+            await self.take_screenshot(f"click_failure_{selector.replace('/', '_')}")
+            raise
+    
+    @timed(selector=True)
+    async def wait_and_fill(self, selector: str, text: str, timeout: int = 30000, secret: bool = False) -> None:
+        """Wait for element and fill text; a secret text is masked in the log"""
+        try:
+            self.logger.info(f"Filling '{'***' if secret else text}' in {selector}")
+            element = self.page.locator(selector)
+            with profiler.step("wait_for visible"):
+                await element.wait_for(state="visible", timeout=timeout)
+            await element.fill(text)
+        except Exception as e:
+            self.logger.error(f"Failed to fill {selector}: {str(e)}")
+            await self.take_screenshot("fill_failure")
+            raise
+    
+    @timed(selector=True)
+    async def get_text(self, selector: str, timeout: int = 30000) -> str:
+        """Get text from element with wait"""
+        element = self.page.locator(selector)
+        with profiler.step("wait_for visible"):
+            await element.wait_for(state="visible", timeout=timeout)
+        return (await element.text_content()).strip()
+    
+    @timed(selector=True)
+    async def is_visible(self, selector: str, timeout: int = 5000) -> bool:
+        """Check if element is visible without throwing exception"""
+        try:
+            await self.page.locator(selector).wait_for(state="visible", timeout=timeout)
+            return True
+        except:
+            return False
+    
+    @timed(selector=True)
+    async def is_visible_now(self, selector: str) -> bool:
+        """Check visibility immediately, without waiting - the fast path for absence checks"""
+        return await self.page.locator(selector).first.is_visible()
+    
+    @timed
+    async def wait_for_condition(self, condition: ReadinessCondition, timeout: int = 30000) -> float:
+        """
+        Wait until a readiness condition holds
+        
+        Args:
+            condition: Condition polled inside the page
+            timeout: Maximum wait in milliseconds
+        
+        Returns:
+            Seconds the condition took to be met
+        """
+        start = time.perf_counter()
+        await self.page.wait_for_function(
+            condition.expression, arg=condition.arg, timeout=timeout, polling=condition.polling
+        )
+        elapsed = time.perf_counter() - start
+        record_timing(condition.name, elapsed)
+        self.logger.info(f"Condition '{condition.name}' met in {elapsed * 1000:.0f} ms")
+        return elapsed
+    
+    @timed
+    async def take_screenshot(self, name: str) -> str:
+        """Take screenshot; writing happens in the background"""
+        filepath = screenshots.save(await self.page.screenshot(), name)
+        self.logger.info(f"Screenshot saved: {filepath}")
+        return filepath
+    
+    @timed
+    async def wait_for_page_load(self) -> None:
+        """Wait for page to be fully loaded - using domcontentloaded instead of networkidle"""
+        await self.page.wait_for_load_state("domcontentloaded")
+    
+    async def get_page_title(self) -> str:
+        """Get page title"""
+        return await self.page.title()
+    
+    def get_current_url(self) -> str:
+        """Get current URL"""
+        return self.page.url
@@ -0,0 +1,59 @@
+# src/pages/aio/home_page.py
+"""
+Async Amazon Home Page Object
+Same interactions as src.pages.home_page.HomePage, awaited
+"""
+
+from src.config.config import config
+from src.pages.aio.base_page import BasePage
+from src.pages.selectors import HomeSelectors
+from src.utils.perf_db import NAVIGATION, perf
+from src.utils.timing import timed
+import time
+
+class HomePage(HomeSelectors, BasePage):
+    """Amazon Homepage interactions; selectors come from the registry"""
+    
+    @timed
+    async def goto(self) -> 'HomePage':
+        """Navigate to the configured homepage (amazon.com or the local stand-in)"""
+        start = time.perf_counter()
+        await self.navigate(config.base_url)
+        await self.page.wait_for_selector(self.SEARCH_BOX, timeout=15000)
+        perf.record(NAVIGATION, "HomePage.search_box_visible", time.perf_counter() - start)
+        return self
+    
+    @timed
+    async def search_product(self, product: str) -> None:
+        """
+        Search for a product
+        
+        Args:
+            product: Product name to search
+        """
+        self.logger.info(f"Searching for product: {product}")
+        await self.wait_and_fill(self.SEARCH_BOX, product)
+        await self.wait_and_click(self.SEARCH_BUTTON)
+        # Wait only for the results URL to commit; callers wait for results readiness
+        await self.page.wait_for_url("**/s?k=*", timeout=10000, wait_until="commit")
+    
+    @timed
+    async def get_cart_count(self) -> int:
+        """Get current cart item count"""
+        try:
+            count_text = await self.get_text(self.CART_COUNT)
+            return int(count_text) if count_text.isdigit() else 0
+        except:
+            self.logger.warning("Could not get cart count, returning 0")
+            return 0
+    
+    @timed
+    async def is_logged_in(self) -> bool:
+        """Check if user is logged in"""
+        account_text = await self.get_text(self.ACCOUNT_MENU)
+        return not account_text.startswith("Hello, sign in")
+    
+    @timed
+    async def click_cart(self) -> None:
+        """Click on cart icon"""
+        await self.wait_and_click(self.CART_COUNT)
@@ -0,0 +1,243 @@
+# src/pages/aio/search_results_page.py
+"""
+Async Amazon Search Results Page Object
+Same interactions as src.pages.search_results_page.SearchResultsPage, awaited
+"""
+
+from src.config.config import config
+from src.pages.aio.base_page import BasePage
+from src.pages.search_results_page import BULK_EXTRACT_JS, CrawlProgress, SearchResultsLogic
+from src.pages.selectors import parse_results_count, selectors
+from src.pages.snapshot import save_snapshot
+from src.utils.perf_db import NAVIGATION, perf
+from src.utils.product_store import ProductTable
+from src.utils.timing import timed
+from typing import AsyncIterator, List, Dict, Optional
+import time
+
+class SearchResultsPage(SearchResultsLogic, BasePage):
+    """Search results page interactions; selectors come from the registry"""
+    
+    @timed
+    async def get_results_count(self) -> int:
+        """Get total number of results"""
+        try:
+            # Extract number from "1-48 of over 10,000 results"
+            return parse_results_count(await self.get_text(self.RESULTS_INFO))
+        except Exception as e:
+            self.logger.error(f"Could not extract results count: {e}")
+        return 0
+    
+    @timed
+    async def wait_for_results(self, min_cards: int = 1, stable_ms: int = 300, timeout: int = 15000) -> float:
+        """Wait only as long as the results page needs to settle"""
+        return await self.wait_for_condition(self.results_ready(min_cards, stable_ms), timeout=timeout)
+    
+    @timed
+    async def has_results(self) -> bool:
+        """Check if search returned results"""
+        try:
+            await self.wait_for_results(stable_ms=0)
+        except Exception as e:
+            self.logger.warning(f"Results page did not settle: {e}")
+        return not await self.is_visible_now(self.NO_RESULTS_MESSAGE)
+    
+    @timed
+    async def get_products(self, max_count: Optional[int] = 10, bulk: bool = True) -> List[Dict[str, any]]:
+        """
+        Extract product information from search results
+        
+        Args:
+            max_count: Maximum number of products to extract; None for all
+            bulk: Read every card in a single evaluate_all round-trip instead
+                of querying each field of each card separately
+        
+        Returns:
+            List of product dictionaries
+        """
+        if config.snapshot_results:
+            await self.save_snapshot()
+        
+        start = time.perf_counter()
+        if not bulk:
+            products = await self._get_products_per_element(max_count)
+            perf.record(NAVIGATION, "SearchResultsPage.extraction", time.perf_counter() - start)
+            return products
+        
+        title_selectors = selectors.candidates(self.PAGE_TYPE, "title")
+        raw_cards = await self.page.locator(self.PRODUCT_CARDS).evaluate_all(
+            BULK_EXTRACT_JS, self._bulk_options(max_count, title_selectors)
+        )
+        products = self._products_from_cards(raw_cards, title_selectors)
+        
+        perf.record(NAVIGATION, "SearchResultsPage.extraction", time.perf_counter() - start)
+        self.logger.info(f"Extracted {len(products)} products in bulk")
+        return products
+    
+    async def save_snapshot(self, name: Optional[str] = None) -> Optional[str]:
+        """
+        Save the results page HTML for offline parsing, once per URL
+        
+        Args:
+            name: File name without extension; defaults to query and page number
+        
+        Returns:
+            Path of the snapshot, or None if this URL was already saved
+        """
+        url = self.page.url
+        if name is None and getattr(self, "_snapshot_url", None) == url:
+            return None
+        path = save_snapshot(await self.page.content(), name or self._snapshot_name(url))
+        self._snapshot_url = url
+        self.logger.info(f"Snapshot saved: {path}")
+        return path
+    
+    async def _get_products_per_element(self, max_count: Optional[int]) -> List[Dict[str, any]]:
+        """Extract products by querying each card through its own locators"""
+        products = []
+        product_elements = (await self.page.locator(self.PRODUCT_CARDS).all())[:max_count]
+        title_selectors = selectors.candidates(self.PAGE_TYPE, "title")
+        
+        for idx, element in enumerate(product_elements):
+            try:
+                # Try the fallback title selectors, last run's winner first
+                title = ""
+                matched = -1
+                for position, selector in enumerate(title_selectors):
+                    try:
+                        title_elem = element.locator(selector).first
+                        if await title_elem.is_visible():
+                            title = (await title_elem.text_content()).strip()
+                            if title:
+                                matched = position
+                                break
+                    except:
+                        continue
+                selectors.record_index(self.PAGE_TYPE, "title", title_selectors, matched)
+                
+                products.append({
+                    'index': idx + 1,
+                    'title': title,
+                    'price': await self._extract_price(element),
+                    'rating': await self._extract_rating(element),
+                    'is_prime': await self._check_prime(element),
+                    'is_sponsored': 'Sponsored' in await element.text_content()
+                })
+                self.logger.debug(f"Extracted product {idx + 1}: {title[:50] if title else 'No title'}...")
+            
+            except Exception as e:
+                self.logger.warning(f"Failed to extract product {idx + 1}: {e}")
+        
+        return products
+    
+    async def _check_prime(self, element) -> bool:
+        """Check if product has Prime"""
+        try:
+            return await element.locator(self.PRIME_BADGE).first.is_visible()
+        except:
+            return False
+    
+    async def _extract_price(self, element) -> Optional[float]:
+        """Extract price as float"""
+        try:
+            price_elem = element.locator(self.PRODUCT_PRICE).first
+            if await price_elem.is_visible():
+                return self._parse_price(await price_elem.text_content())
+        except:
+            return None
+    
+    async def _extract_rating(self, element) -> Optional[float]:
+        """Extract rating value"""
+        try:
+            rating_elem = element.locator(self.PRODUCT_RATING).first
+            if await rating_elem.is_visible():
+                return self._parse_rating(await rating_elem.get_attribute('aria-label'))
+        except:
+            return None
+    
+    @timed
+    async def goto(self, query: str, page: int = 1, sort: Optional[str] = None) -> 'SearchResultsPage':
+        """Open a results page by URL, skipping the homepage and its search form"""
+        await self.navigate(self.results_url(query, page, sort))
+        await self.wait_for_results(stable_ms=0)
+        return self
+    
+    async def next_page_url(self) -> Optional[str]:
+        """Absolute URL of the next results page, or None on the last page"""
+        return await self.page.evaluate(
+            "sel => { const link = document.querySelector(sel); return link && link.href ? link.href : null; }",
+            f"a{self.NEXT_PAGE}"
+        )
+    
+    async def iter_products(self, query: str, limit: Optional[int] = None, prefetch: bool = True) -> AsyncIterator[Dict[str, any]]:
+        """
+        Stream products for a query across result pages
+        
+        Behaves like the sync iter_products: the next page loads in a
+        second tab while the current page's products are consumed.
+        """
+        await self.navigate(self.results_url(query))
+        current = self
+        spare_tab = None
+        extra_tab = None
+        progress = CrawlProgress(limit)
+        
+        try:
+            while True:
+                await current.wait_for_results(stable_ms=0)
+                products = await current.get_products(max_count=progress.remaining)
+                next_url = await current.next_page_url() if products else None
+                
+                upcoming = None
+                if prefetch and progress.wants_next(next_url, len(products)):
+                    if spare_tab is None:
+                        spare_tab = extra_tab = await self.page.context.new_page()
+                    upcoming = SearchResultsPage(spare_tab)
+                    await upcoming.start_navigation(next_url)
+                
+                for product in products:
+                    yield progress.number(product)
+                
+                if progress.finished(next_url):
+                    return
+                
+                if upcoming is None:
+                    await current.navigate(next_url)
+                else:
+                    await upcoming.finish_navigation()
+                    spare_tab = current.page
+                    current = upcoming
+        finally:
+            if extra_tab is not None:
+                # Leave this page's tab on the last page read, as the sync crawl does
+                if current.page is extra_tab:
+                    await self._return_to(extra_tab.url)
+                await extra_tab.close()
+    
+    async def _return_to(self, url: str) -> None:
+        """Bring this page's tab back to a results page after a crawl"""
+        try:
+            await self.navigate(url)
+        except Exception as e:
+            self.logger.warning(f"Could not return to {url} after the crawl: {e}")
+    
+    async def collect_products(self, query: str, limit: Optional[int] = None, prefetch: bool = True) -> ProductTable:
+        """Crawl a query's result pages into a column-oriented ProductTable"""
+        table = ProductTable()
+        async for product in self.iter_products(query, limit, prefetch):
+            table.append(product, query)
+        self.logger.info(f"Collected {len(table)} products for '{query}'")
+        return table
+    
+    @timed
+    async def click_product(self, index: int = 1) -> None:
+        """Click on a product by index"""
+        product = self.page.locator(self.PRODUCT_CARDS).nth(index - 1)
+        await product.locator('h2 a').first.click()
+        await self.wait_for_page_load()
+    
+    @timed
+    async def sort_by(self, option: str) -> None:
+        """Sort results by given option"""
+        await self.page.select_option(self.SORT_DROPDOWN, option)
+        await self.wait_for_page_load()
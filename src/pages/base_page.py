@@ -5,11 +5,24 @@ Base Page class with common functionality for all pages
 This implements core methods that every page will need
 """
 
-from playwright.sync_api import Page, expect
-from typing import Optional, List
-import logging
-from datetime import datetime
-import os
+from typing import TYPE_CHECKING, Optional, List
+from src.pages.readiness import ReadinessCondition, record_timing
+from src.utils.logger import setup_logger
+from src.utils.perf_db import NAVIGATION, perf
+from src.utils.replay import ReplayMissError
+from src.utils.screenshots import screenshots
+from src.utils.timing import profiler, timed
+import time
+
+if TYPE_CHECKING:
+    # Only for annotations; page objects import without loading Playwright
+    from playwright.sync_api import Page
+
+def check_replay(page: 'Page', url: str) -> None:
+    """Fail at once on a document strict replay has no recording of, instead of timing out"""
+    replay = getattr(page.context, "_replay_session", None)
+    if replay is not None and replay.strict and not replay.has_document(url):
+        raise ReplayMissError(f"No recorded response for {url}; re-record with REPLAY=record")
 
 class BasePage:
     """
@@ -17,46 +30,76 @@ class BasePage:
     Follows DRY principle - Don't Repeat Yourself
     """
     
-    def __init__(self, page: Page):
+    def __init__(self, page: 'Page'):
         self.page = page
-        self.logger = logging.getLogger(self.__class__.__name__)
-        
+        self.logger = setup_logger(self.__class__.__name__)
+    
+    @timed
     def navigate(self, url: str) -> None:
         """Navigate to a URL with logging"""
+        check_replay(self.page, url)
         self.logger.info(f"Navigating to: {url}")
+        # goto returns at DOMContentLoaded, so timing it costs no extra round-trip
+        start = time.perf_counter()
         self.page.goto(url, wait_until="domcontentloaded")
-        
+        perf.record(NAVIGATION, f"{type(self).__name__}.domcontentloaded", time.perf_counter() - start)
+    
+    def start_navigation(self, url: str) -> None:
+        """Begin navigating without waiting, so the load overlaps other work"""
+        self.logger.info(f"Navigating in background to: {url}")
+        try:
+            # Mark the old document so the new one can be told apart from it
+            self.page.evaluate("url => { window.__stale = true; window.location.href = url; }", url)
+        except Exception as e:
+            # The navigation can win the race against the evaluate reply
+            if "Execution context was destroyed" not in str(e):
+                raise
+    
+    @timed
+    def finish_navigation(self, timeout: int = 30000) -> None:
+        """Wait until a navigation begun with start_navigation has replaced the old document"""
+        self.page.wait_for_function(
+            "() => window.__stale !== true && document.readyState !== 'loading'", timeout=timeout
+        )
+    
+    @timed(selector=True)
     def wait_and_click(self, selector: str, timeout: int = 30000) -> None:
         """Wait for element and click with error handling"""
         try:
             self.logger.info(f"Clicking element: {selector}")
             element = self.page.locator(selector)
-            element.wait_for(state="visible", timeout=timeout)
+            with profiler.step("wait_for visible"):
+                element.wait_for(state="visible", timeout=timeout)
             element.scroll_into_view_if_needed()
             element.click()
         except Exception as e:
             self.logger.error(f"Failed to click {selector}: {str(e)}")
             self.take_screenshot(f"click_failure_{selector.replace('/', '_')}")
             raise
-            
-    def wait_and_fill(self, selector: str, text: str, timeout: int = 30000) -> None:
-        """Wait for element and fill text"""
+    
+    @timed(selector=True)
+    def wait_and_fill(self, selector: str, text: str, timeout: int = 30000, secret: bool = False) -> None:
+        """Wait for element and fill text; a secret text is masked in the log"""
         try:
-            self.logger.info(f"Filling '{text}' in {selector}")
+            self.logger.info(f"Filling '{'***' if secret else text}' in {selector}")
             element = self.page.locator(selector)
-            element.wait_for(state="visible", timeout=timeout)
+            with profiler.step("wait_for visible"):
+                element.wait_for(state="visible", timeout=timeout)
             element.fill(text)
         except Exception as e:
             self.logger.error(f"Failed to fill {selector}: {str(e)}")
             self.take_screenshot("fill_failure")
             raise
-            
+    
+    @timed(selector=True)
     def get_text(self, selector: str, timeout: int = 30000) -> str:
         """Get text from element with wait"""
         element = self.page.locator(selector)
-        element.wait_for(state="visible", timeout=timeout)
+        with profiler.step("wait_for visible"):
+            element.wait_for(state="visible", timeout=timeout)
         return element.text_content().strip()
-        
+    
+    @timed(selector=True)
     def is_visible(self, selector: str, timeout: int = 5000) -> bool:
         """Check if element is visible without throwing exception"""
         try:
@@ -64,28 +107,49 @@ class BasePage:
             return True
         except:
             return False
-            
-    def take_screenshot(self, name: str) -> str:
-        """Take screenshot with timestamp"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{name}_{timestamp}.png"
-        filepath = os.path.join("reports", "screenshots", filename)
+    
+    @timed(selector=True)
+    def is_visible_now(self, selector: str) -> bool:
+        """Check visibility immediately, without waiting - the fast path for absence checks"""
+        return self.page.locator(selector).first.is_visible()
+    
+    @timed
+    def wait_for_condition(self, condition: ReadinessCondition, timeout: int = 30000) -> float:
+        """
+        Wait until a readiness condition holds
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        Args:
+            condition: Condition polled inside the page
+            timeout: Maximum wait in milliseconds
         
-        self.page.screenshot(path=filepath)
+        Returns:
+            Seconds the condition took to be met
+        """
+        start = time.perf_counter()
+        self.page.wait_for_function(
+            condition.expression, arg=condition.arg, timeout=timeout, polling=condition.polling
+        )
+        elapsed = time.perf_counter() - start
+        record_timing(condition.name, elapsed)
+        self.logger.info(f"Condition '{condition.name}' met in {elapsed * 1000:.0f} ms")
+        return elapsed
+    
+    @timed
+    def take_screenshot(self, name: str) -> str:
+        """Take screenshot; writing happens in the background"""
+        filepath = screenshots.capture(self.page, name)
         self.logger.info(f"Screenshot saved: {filepath}")
         return filepath
-        
+    
+    @timed
     def wait_for_page_load(self) -> None:
         """Wait for page to be fully loaded - using domcontentloaded instead of networkidle"""
         self.page.wait_for_load_state("domcontentloaded")
-        
+    
     def get_page_title(self) -> str:
         """Get page title"""
         return self.page.title()
-        
+    
     def get_current_url(self) -> str:
         """Get current URL"""
         return self.page.url
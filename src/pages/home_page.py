@@ -5,30 +5,27 @@ Amazon Home Page Object
 Contains all interactions specific to the Amazon homepage
 """
 
+from src.config.config import config
 from src.pages.base_page import BasePage
-from src.utils.logger import setup_logger
+from src.pages.selectors import HomeSelectors
+from src.utils.perf_db import NAVIGATION, perf
+from src.utils.timing import timed
+import time
 
-class HomePage(BasePage):
-    """Amazon Homepage interactions"""
+class HomePage(HomeSelectors, BasePage):
+    """Amazon Homepage interactions; selectors come from the registry"""
     
-    def __init__(self, page):
-        super().__init__(page)
-        self.logger = setup_logger(self.__class__.__name__)
-        
-        # Element selectors
-        self.SEARCH_BOX = "#twotabsearchtextbox"
-        self.SEARCH_BUTTON = "#nav-search-submit-button"
-        self.CART_COUNT = "#nav-cart-count"
-        self.ACCOUNT_MENU = "#nav-link-accountList"
-        self.LOGO = "#nav-logo"
-        
+    @timed
     def goto(self) -> 'HomePage':
-        """Navigate to Amazon homepage"""
-        self.navigate("https://www.amazon.com")
+        """Navigate to the configured homepage (amazon.com or the local stand-in)"""
+        start = time.perf_counter()
+        self.navigate(config.base_url)
         # Don't wait for networkidle - just wait for search box
         self.page.wait_for_selector(self.SEARCH_BOX, timeout=15000)
+        perf.record(NAVIGATION, "HomePage.search_box_visible", time.perf_counter() - start)
         return self
-        
+    
+    @timed
     def search_product(self, product: str) -> None:
         """
         Search for a product
@@ -39,9 +36,10 @@ class HomePage(BasePage):
         self.logger.info(f"Searching for product: {product}")
         self.wait_and_fill(self.SEARCH_BOX, product)
         self.wait_and_click(self.SEARCH_BUTTON)
-        # Wait for URL to change to search results
-        self.page.wait_for_url("**/s?k=*", timeout=10000)
-        
+        # Wait only for the results URL to commit; callers wait for results readiness
+        self.page.wait_for_url("**/s?k=*", timeout=10000, wait_until="commit")
+    
+    @timed
     def get_cart_count(self) -> int:
         """Get current cart item count"""
         try:
@@ -50,12 +48,14 @@ class HomePage(BasePage):
         except:
             self.logger.warning("Could not get cart count, returning 0")
             return 0
-            
+    
+    @timed
     def is_logged_in(self) -> bool:
         """Check if user is logged in"""
         account_text = self.get_text(self.ACCOUNT_MENU)
         return not account_text.startswith("Hello, sign in")
-        
+    
+    @timed
     def click_cart(self) -> None:
         """Click on cart icon"""
         self.wait_and_click(self.CART_COUNT)
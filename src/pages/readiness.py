@@ -0,0 +1,89 @@
+# src/pages/readiness.py
+"""
+Readiness conditions for page objects
+A condition is a predicate polled inside the page, so waiting costs one
+round-trip and ends as soon as the page is actually ready
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from src.utils.perf_db import NAVIGATION, perf
+
+# Polled in the page: true once enough nodes match and the watched nodes
+# have not changed for quietMs, or as soon as an alternative selector shows
+SETTLED_JS = """
+(opts) => {
+    const state = (window.__readiness = window.__readiness || {});
+    if (opts.orSelector && document.querySelector(opts.orSelector)) return true;
+    const count = document.querySelectorAll(opts.selector).length;
+    const watched = opts.stableSelector
+        ? Array.from(document.querySelectorAll(opts.stableSelector), (el) => el.textContent).join('|')
+        : '';
+    const signature = count + '#' + watched;
+    const now = performance.now();
+    const previous = state[opts.key];
+    if (!previous || previous.signature !== signature) {
+        state[opts.key] = { signature: signature, since: now };
+        return count >= opts.minCount && opts.quietMs === 0;
+    }
+    return count >= opts.minCount && now - previous.since >= opts.quietMs;
+}
+"""
+
+_keys = itertools.count()
+
+# Seconds each condition took to be met, by condition name
+readiness_timings: Dict[str, List[float]] = {}
+
+
+@dataclass
+class ReadinessCondition:
+    """A named in-page predicate and its argument"""
+    name: str
+    expression: str
+    arg: Dict[str, Any] = field(default_factory=dict)
+    polling: int = 50
+
+
+def settled(name: str, selector: str, min_count: int = 1, stable_selector: Optional[str] = None,
+            quiet_ms: int = 0, or_selector: Optional[str] = None) -> ReadinessCondition:
+    """
+    Condition met when at least min_count nodes match selector and nodes
+    matching stable_selector have kept the same text for quiet_ms
+    
+    Args:
+        name: Label used in logs and the timing report
+        selector: Nodes that must be attached
+        min_count: How many of them are required
+        stable_selector: Nodes whose text must stop changing
+        quiet_ms: How long they must stay unchanged
+        or_selector: Alternative outcome that ends the wait immediately
+    """
+    return ReadinessCondition(
+        name=name,
+        expression=SETTLED_JS,
+        arg={
+            'key': f"c{next(_keys)}",
+            'selector': selector,
+            'minCount': min_count,
+            'stableSelector': stable_selector,
+            'quietMs': quiet_ms,
+            'orSelector': or_selector,
+        }
+    )
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """Remember how long a condition took to be met, for the report and the perf database"""
+    readiness_timings.setdefault(name, []).append(seconds)
+    perf.record(NAVIGATION, name, seconds)
+
+
+def timing_report() -> List[str]:
+    """One line per condition with count, mean and max wait"""
+    lines = []
+    for name, samples in sorted(readiness_timings.items()):
+        mean_ms = sum(samples) * 1000 / len(samples)
+        lines.append(f"{name}: {len(samples)} waits, avg {mean_ms:.0f} ms, max {max(samples) * 1000:.0f} ms")
+    return lines
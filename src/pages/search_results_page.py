@@ -3,72 +3,246 @@ Amazon Search Results Page Object
 Handles interactions with search results
 """
 
+from src.config.config import config
 from src.pages.base_page import BasePage
-from src.utils.logger import setup_logger
-from typing import List, Dict, Optional
-import re
+from src.pages.readiness import ReadinessCondition, settled
+from src.pages.selectors import SearchResultsSelectors, parse_price, parse_rating, parse_results_count, selectors
+from src.pages.snapshot import save_snapshot
+from src.utils.perf_db import NAVIGATION, perf
+from src.utils.product_store import ProductTable
+from src.utils.timing import timed
+from typing import Iterator, List, Dict, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+import time
 
-class SearchResultsPage(BasePage):
-    """Search results page interactions"""
+# Runs inside the page and collects the raw fields of every card in one
+# round-trip; visibility mirrors Playwright's is_visible() check
+BULK_EXTRACT_JS = """
+(cards, opts) => {
+    const visible = (el) => {
+        if (!el) return false;
+        if (window.getComputedStyle(el).visibility === 'hidden') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    return (opts.maxCount === null ? cards : cards.slice(0, opts.maxCount)).map((card) => {
+        let title = '';
+        let titleIndex = -1;
+        for (let i = 0; i < opts.titleSelectors.length; i++) {
+            const el = card.querySelector(opts.titleSelectors[i]);
+            if (visible(el)) {
+                title = (el.textContent || '').trim();
+                if (title) {
+                    titleIndex = i;
+                    break;
+                }
+            }
+        }
+        const price = card.querySelector(opts.priceSelector);
+        const rating = card.querySelector(opts.ratingSelector);
+        return {
+            title: title,
+            titleIndex: titleIndex,
+            priceText: visible(price) ? price.textContent : null,
+            ratingLabel: visible(rating) ? rating.getAttribute('aria-label') : null,
+            isPrime: visible(card.querySelector(opts.primeSelector)),
+            isSponsored: (card.textContent || '').includes('Sponsored'),
+        };
+    });
+}
+"""
+
+class SearchResultsLogic(SearchResultsSelectors):
+    """
+    Browser-free parts of the results page objects: URLs, readiness,
+    snapshot names and parsing of bulk-extracted cards
     
-    def __init__(self, page):
-        super().__init__(page)
-        self.logger = setup_logger(self.__class__.__name__)
-        
-        # Element selectors - updated for better reliability
-        self.RESULTS_INFO = '[data-component-type="s-result-info-bar"]'
-        self.PRODUCT_CARDS = '[data-component-type="s-search-result"]'
-        self.PRODUCT_TITLE = 'h2 span'  # Simplified selector
-        self.PRODUCT_PRICE = '.a-price-whole'
-        self.PRODUCT_RATING = '[aria-label*="out of 5 stars"]'
-        self.NO_RESULTS_MESSAGE = '.s-no-results-message'
-        self.NEXT_PAGE = '.s-pagination-next'
-        self.SORT_DROPDOWN = '#s-result-sort-select'
-        
+    Shared by the sync and async SearchResultsPage, so the two only differ
+    in how they talk to the browser.
+    """
+    
+    # Parsers use the registry's precompiled patterns
+    _parse_price = staticmethod(parse_price)
+    _parse_rating = staticmethod(parse_rating)
+    
+    def results_url(self, query: str, page: int = 1, sort: Optional[str] = None) -> str:
+        """Build the results URL for a query, page and sort option"""
+        params = {'k': query}
+        if page > 1:
+            params['page'] = page
+        if sort:
+            params['s'] = sort
+        return f"{config.base_url.rstrip('/')}/s?{urlencode(params)}"
+    
+    def results_ready(self, min_cards: int = 1, stable_ms: int = 300) -> ReadinessCondition:
+        """Results are ready when cards are attached and their prices stop changing, or no-results shows"""
+        return settled(
+            "results ready",
+            selector=self.PRODUCT_CARDS,
+            min_count=min_cards,
+            stable_selector=f"{self.PRODUCT_CARDS} {self.PRODUCT_PRICE}",
+            quiet_ms=stable_ms,
+            or_selector=self.NO_RESULTS_MESSAGE
+        )
+    
+    @staticmethod
+    def _snapshot_name(url: str) -> str:
+        """Default snapshot name: query, page number and sort of a results URL"""
+        params = parse_qs(urlparse(url).query)
+        return f"{params.get('k', ['results'])[0]}_p{params.get('page', ['1'])[0]}_{params.get('s', ['default'])[0]}"
+    
+    def _bulk_options(self, max_count: Optional[int], title_selectors: List[str]) -> Dict[str, any]:
+        """Argument of BULK_EXTRACT_JS"""
+        return {
+            'maxCount': max_count,
+            'titleSelectors': title_selectors,
+            'priceSelector': self.PRODUCT_PRICE,
+            'ratingSelector': self.PRODUCT_RATING,
+            'primeSelector': self.PRIME_BADGE,
+        }
+    
+    def _products_from_cards(self, raw_cards: List[Dict], title_selectors: List[str]) -> List[Dict[str, any]]:
+        """Product dictionaries from BULK_EXTRACT_JS results; records which title selector matched"""
+        products = []
+        for idx, raw in enumerate(raw_cards):
+            selectors.record_index(self.PAGE_TYPE, "title", title_selectors, raw['titleIndex'])
+            products.append({
+                'index': idx + 1,
+                'title': raw['title'],
+                'price': self._parse_price(raw['priceText']),
+                'rating': self._parse_rating(raw['ratingLabel']),
+                'is_prime': raw['isPrime'],
+                'is_sponsored': raw['isSponsored']
+            })
+            self.logger.debug(f"Extracted product {idx + 1}: {raw['title'][:50] if raw['title'] else 'No title'}...")
+        return products
+
+
+class CrawlProgress:
+    """Products handed out by an iter_products crawl, against its limit"""
+    
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.yielded = 0
+    
+    @property
+    def remaining(self) -> Optional[int]:
+        """Products still wanted from the current page, None for all of them"""
+        return self.limit - self.yielded if self.limit is not None else None
+    
+    def wants_next(self, next_url: Optional[str], page_products: int) -> bool:
+        """Whether the next page will be needed once this page's products are handed out"""
+        return bool(next_url) and (self.limit is None or self.yielded + page_products < self.limit)
+    
+    def number(self, product: Dict[str, any]) -> Dict[str, any]:
+        """Count a product, renumbering its index across pages"""
+        self.yielded += 1
+        product['index'] = self.yielded
+        return product
+    
+    def finished(self, next_url: Optional[str]) -> bool:
+        return not next_url or (self.limit is not None and self.yielded >= self.limit)
+
+
+class SearchResultsPage(SearchResultsLogic, BasePage):
+    """Search results page interactions; selectors come from the registry"""
+    
+    @timed
     def get_results_count(self) -> int:
         """Get total number of results"""
         try:
-            info_text = self.get_text(self.RESULTS_INFO)
             # Extract number from "1-48 of over 10,000 results"
-            match = re.search(r'of\s+(?:over\s+)?([\d,]+)\s+results', info_text)
-            if match:
-                return int(match.group(1).replace(',', ''))
+            return parse_results_count(self.get_text(self.RESULTS_INFO))
         except Exception as e:
             self.logger.error(f"Could not extract results count: {e}")
         return 0
-        
+    
+    @timed
+    def wait_for_results(self, min_cards: int = 1, stable_ms: int = 300, timeout: int = 15000) -> float:
+        """Wait only as long as the results page needs to settle"""
+        return self.wait_for_condition(self.results_ready(min_cards, stable_ms), timeout=timeout)
+    
+    @timed
     def has_results(self) -> bool:
         """Check if search returned results"""
-        return not self.is_visible(self.NO_RESULTS_MESSAGE)
-        
-    def get_products(self, max_count: int = 10) -> List[Dict[str, any]]:
+        try:
+            self.wait_for_results(stable_ms=0)
+        except Exception as e:
+            self.logger.warning(f"Results page did not settle: {e}")
+        return not self.is_visible_now(self.NO_RESULTS_MESSAGE)
+    
+    @timed
+    def get_products(self, max_count: Optional[int] = 10, bulk: bool = True) -> List[Dict[str, any]]:
         """
         Extract product information from search results
         
         Args:
-            max_count: Maximum number of products to extract
-            
+            max_count: Maximum number of products to extract; None for all
+            bulk: Read every card in a single evaluate_all round-trip instead
+                of querying each field of each card separately
+        
         Returns:
             List of product dictionaries
         """
+        if config.snapshot_results:
+            self.save_snapshot()
+        
+        start = time.perf_counter()
+        if not bulk:
+            products = self._get_products_per_element(max_count)
+            perf.record(NAVIGATION, "SearchResultsPage.extraction", time.perf_counter() - start)
+            return products
+        
+        title_selectors = selectors.candidates(self.PAGE_TYPE, "title")
+        raw_cards = self.page.locator(self.PRODUCT_CARDS).evaluate_all(
+            BULK_EXTRACT_JS, self._bulk_options(max_count, title_selectors)
+        )
+        products = self._products_from_cards(raw_cards, title_selectors)
+        
+        perf.record(NAVIGATION, "SearchResultsPage.extraction", time.perf_counter() - start)
+        self.logger.info(f"Extracted {len(products)} products in bulk")
+        return products
+    
+    def save_snapshot(self, name: Optional[str] = None) -> Optional[str]:
+        """
+        Save the results page HTML for offline parsing, once per URL
+        
+        Args:
+            name: File name without extension; defaults to query and page number
+        
+        Returns:
+            Path of the snapshot, or None if this URL was already saved
+        """
+        url = self.page.url
+        if name is None and getattr(self, "_snapshot_url", None) == url:
+            return None
+        path = save_snapshot(self.page.content(), name or self._snapshot_name(url))
+        self._snapshot_url = url
+        self.logger.info(f"Snapshot saved: {path}")
+        return path
+    
+    def _get_products_per_element(self, max_count: Optional[int]) -> List[Dict[str, any]]:
+        """Extract products by querying each card through its own locators"""
         products = []
         product_elements = self.page.locator(self.PRODUCT_CARDS).all()[:max_count]
+        title_selectors = selectors.candidates(self.PAGE_TYPE, "title")
         
         for idx, element in enumerate(product_elements):
             try:
-                # Try multiple selectors for title
+                # Try the fallback title selectors, last run's winner first
                 title = ""
-                title_selectors = ['h2 span', 'h2 a span', 'h2', '.s-size-medium']
-                
-                for selector in title_selectors:
+                matched = -1
+                for position, selector in enumerate(title_selectors):
                     try:
                         title_elem = element.locator(selector).first
                         if title_elem.is_visible():
                             title = title_elem.text_content().strip()
                             if title:
+                                matched = position
                                 break
                     except:
                         continue
+                selectors.record_index(self.PAGE_TYPE, "title", title_selectors, matched)
                 
                 product = {
                     'index': idx + 1,
@@ -81,50 +255,133 @@ class SearchResultsPage(BasePage):
                 products.append(product)
                 
                 # Log what we found
-                self.logger.info(f"Extracted product {idx + 1}: {title[:50] if title else 'No title'}...")
-                
+                self.logger.debug(f"Extracted product {idx + 1}: {title[:50] if title else 'No title'}...")
+            
             except Exception as e:
                 self.logger.warning(f"Failed to extract product {idx + 1}: {e}")
-                
-        return products
         
+        return products
+    
     def _check_prime(self, element) -> bool:
         """Check if product has Prime"""
         try:
-            return element.locator('[aria-label="Amazon Prime"]').is_visible()
+            return element.locator(self.PRIME_BADGE).first.is_visible()
         except:
             return False
-            
+    
     def _extract_price(self, element) -> Optional[float]:
         """Extract price as float"""
         try:
             price_elem = element.locator(self.PRODUCT_PRICE).first
             if price_elem.is_visible():
-                price_text = price_elem.text_content()
-                # Remove currency symbols and convert to float
-                price = re.sub(r'[^\d.]', '', price_text)
-                return float(price) if price else None
+                return self._parse_price(price_elem.text_content())
         except:
             return None
-            
+    
     def _extract_rating(self, element) -> Optional[float]:
         """Extract rating value"""
         try:
             rating_elem = element.locator(self.PRODUCT_RATING).first
             if rating_elem.is_visible():
-                aria_label = rating_elem.get_attribute('aria-label')
-                match = re.search(r'([\d.]+) out of 5 stars', aria_label)
-                if match:
-                    return float(match.group(1))
+                return self._parse_rating(rating_elem.get_attribute('aria-label'))
         except:
             return None
-            
+    
+    @timed
+    def goto(self, query: str, page: int = 1, sort: Optional[str] = None) -> 'SearchResultsPage':
+        """Open a results page by URL, skipping the homepage and its search form"""
+        self.navigate(self.results_url(query, page, sort))
+        self.wait_for_results(stable_ms=0)
+        return self
+    
+    def next_page_url(self) -> Optional[str]:
+        """Absolute URL of the next results page, or None on the last page"""
+        return self.page.evaluate(
+            "sel => { const link = document.querySelector(sel); return link && link.href ? link.href : null; }",
+            f"a{self.NEXT_PAGE}"
+        )
+    
+    def iter_products(self, query: str, limit: Optional[int] = None, prefetch: bool = True) -> Iterator[Dict[str, any]]:
+        """
+        Stream products for a query across result pages
+        
+        Page N+1 starts loading in a second tab before the products of
+        page N are handed out, so the network wait overlaps the caller's
+        work. Only one page of products is held at a time, and nothing
+        more is loaded once the caller stops iterating or limit is hit.
+        Either way this page object's tab is left on the last page read.
+        
+        Args:
+            query: Search term
+            limit: Maximum number of products to yield (None for all pages)
+            prefetch: Load the next page in a second tab while yielding
+        
+        Yields:
+            Product dictionaries as returned by get_products, with index
+            counting across pages
+        """
+        self.navigate(self.results_url(query))
+        current = self
+        spare_tab = None
+        extra_tab = None
+        progress = CrawlProgress(limit)
+        
+        try:
+            while True:
+                current.wait_for_results(stable_ms=0)
+                products = current.get_products(max_count=progress.remaining)
+                next_url = current.next_page_url() if products else None
+                
+                upcoming = None
+                if prefetch and progress.wants_next(next_url, len(products)):
+                    if spare_tab is None:
+                        spare_tab = extra_tab = self.page.context.new_page()
+                    upcoming = SearchResultsPage(spare_tab)
+                    upcoming.start_navigation(next_url)
+                
+                for product in products:
+                    yield progress.number(product)
+                
+                if progress.finished(next_url):
+                    return
+                
+                if upcoming is None:
+                    current.navigate(next_url)
+                else:
+                    upcoming.finish_navigation()
+                    spare_tab = current.page
+                    current = upcoming
+        finally:
+            if extra_tab is not None:
+                # The tabs swap roles; when the crawl ends in the extra one,
+                # this page's tab is the spare and may be loading an
+                # unrequested page
+                if current.page is extra_tab:
+                    self._return_to(extra_tab.url)
+                extra_tab.close()
+    
+    def _return_to(self, url: str) -> None:
+        """Bring this page's tab back to a results page after a crawl"""
+        try:
+            self.navigate(url)
+        except Exception as e:
+            self.logger.warning(f"Could not return to {url} after the crawl: {e}")
+    
+    def collect_products(self, query: str, limit: Optional[int] = None, prefetch: bool = True) -> ProductTable:
+        """Crawl a query's result pages into a column-oriented ProductTable"""
+        table = ProductTable()
+        table.extend(self.iter_products(query, limit, prefetch), query)
+        self.logger.info(f"Collected {len(table)} products for '{query}'")
+        return table
+    
+    @timed
     def click_product(self, index: int = 1) -> None:
         """Click on a product by index"""
         product = self.page.locator(self.PRODUCT_CARDS).nth(index - 1)
         product.locator('h2 a').first.click()
         self.wait_for_page_load()
-        
+    
+    @timed
     def sort_by(self, option: str) -> None:
         """Sort results by given option"""
         self.page.select_option(self.SORT_DROPDOWN, option)
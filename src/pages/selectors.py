@@ -0,0 +1,216 @@
+# src/pages/selectors.py
+"""
+Selector registry for page objects
+Holds every selector and parse pattern once, orders fallback selectors so
+the one that matched before is tried first, and keeps hit rates per run
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_STATS_PATH = os.path.join("reports", "selector_stats.json")
+
+# Parse patterns, compiled once at import
+RESULTS_COUNT_PATTERN = re.compile(r'of\s+(?:over\s+)?([\d,]+)\s+results')
+PRICE_STRIP_PATTERN = re.compile(r'[^\d.]')
+RATING_PATTERN = re.compile(r'([\d.]+) out of 5 stars')
+
+
+class HomeSelectors:
+    """Amazon homepage selectors"""
+    PAGE_TYPE = "home"
+    
+    SEARCH_BOX = "#twotabsearchtextbox"
+    SEARCH_BUTTON = "#nav-search-submit-button"
+    CART_COUNT = "#nav-cart-count"
+    ACCOUNT_MENU = "#nav-link-accountList"
+    LOGO = "#nav-logo"
+
+
+class SignInSelectors:
+    """Sign-in page selectors"""
+    PAGE_TYPE = "signin"
+    
+    EMAIL = "#ap_email"
+    CONTINUE = "#continue"
+    PASSWORD = "#ap_password"
+    SUBMIT = "#signInSubmit"
+    ERROR = "#auth-error-message-box"
+
+
+class SearchResultsSelectors:
+    """Search results page selectors"""
+    PAGE_TYPE = "search_results"
+    
+    RESULTS_INFO = '[data-component-type="s-result-info-bar"]'
+    PRODUCT_CARDS = '[data-component-type="s-search-result"]'
+    PRODUCT_TITLE = 'h2 span'
+    PRODUCT_PRICE = '.a-price-whole'
+    PRODUCT_RATING = '[aria-label*="out of 5 stars"]'
+    NO_RESULTS_MESSAGE = '.s-no-results-message'
+    NEXT_PAGE = '.s-pagination-next'
+    SORT_DROPDOWN = '#s-result-sort-select'
+    PRIME_BADGE = '[aria-label="Amazon Prime"]'
+    
+    # Declared fallback order; the registry reorders it by past hits
+    TITLE_SELECTORS = ('h2 span', 'h2 a span', 'h2', '.s-size-medium')
+
+
+def parse_results_count(info_text: Optional[str]) -> int:
+    """Total from a results bar such as '1-48 of over 10,000 results'; 0 when absent"""
+    match = RESULTS_COUNT_PATTERN.search(info_text or "")
+    return int(match.group(1).replace(',', '')) if match else 0
+
+
+def parse_price(price_text: Optional[str]) -> Optional[float]:
+    """Convert price text such as '1,299.' to a float"""
+    if not price_text:
+        return None
+    price = PRICE_STRIP_PATTERN.sub('', price_text)
+    try:
+        return float(price) if price else None
+    except ValueError:
+        return None
+
+
+def parse_rating(aria_label: Optional[str]) -> Optional[float]:
+    """Convert a '4.5 out of 5 stars' label to a float"""
+    if not aria_label:
+        return None
+    match = RATING_PATTERN.search(aria_label)
+    if match:
+        try:
+            return float(match.group(1))
+        except ValueError:
+            return None
+    return None
+
+
+class SelectorRegistry:
+    """
+    Fallback selector chains with per-selector hit statistics
+    
+    A chain is keyed by page type and field, e.g. 'search_results.title'.
+    Counts from earlier runs are loaded from a JSON file on first use and
+    this session's counts are merged back into it at the end.
+    """
+    
+    def __init__(self, path: str = DEFAULT_STATS_PATH):
+        self.path = path
+        self.chains: Dict[str, Sequence[str]] = {}
+        # {chain: {selector: {"tried": n, "hits": n}}}
+        self.session: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._history: Optional[Dict[str, Dict[str, Dict[str, int]]]] = None
+    
+    def register(self, page_type: str, name: str, selectors: Sequence[str]) -> None:
+        """Declare the fallback chain for a field"""
+        self.chains[f"{page_type}.{name}"] = tuple(selectors)
+    
+    def candidates(self, page_type: str, name: str) -> List[str]:
+        """
+        Selectors of a chain, best first; ties keep declared order
+        
+        Selectors are ranked by hits minus misses over all runs, so a
+        winner that stops matching sinks and never-matching fallbacks
+        go last.
+        """
+        key = f"{page_type}.{name}"
+        declared = self.chains[key]
+        history = self._load().get(key, {})
+        session = self.session.get(key, {})
+        score = {}
+        for selector in declared:
+            past = history.get(selector, {})
+            now = session.get(selector, {})
+            hits = past.get("hits", 0) + now.get("hits", 0)
+            tried = past.get("tried", 0) + now.get("tried", 0)
+            score[selector] = hits - (tried - hits)
+        return sorted(declared, key=lambda selector: -score[selector])
+    
+    def record(self, page_type: str, name: str, tried: Sequence[str], matched: Optional[str]) -> None:
+        """
+        Count one lookup
+        
+        Args:
+            tried: Selectors tried, in order, up to and including the match
+            matched: Selector that produced a value, or None when all missed
+        """
+        chain = self.session.setdefault(f"{page_type}.{name}", {})
+        for selector in tried:
+            counts = chain.setdefault(selector, {"tried": 0, "hits": 0})
+            counts["tried"] += 1
+            if selector == matched:
+                counts["hits"] += 1
+    
+    def record_index(self, page_type: str, name: str, ordered: Sequence[str], index: int) -> None:
+        """Count one lookup given the position of the match in ordered (-1 for none)"""
+        if index < 0:
+            self.record(page_type, name, ordered, None)
+        else:
+            self.record(page_type, name, ordered[:index + 1], ordered[index])
+    
+    def hit_rates(self) -> Dict[str, Dict[str, float]]:
+        """This session's share of tries that matched, per chain and selector"""
+        return {
+            key: {
+                selector: counts["hits"] / counts["tried"]
+                for selector, counts in chain.items() if counts["tried"]
+            }
+            for key, chain in sorted(self.session.items())
+        }
+    
+    def report_lines(self) -> List[str]:
+        """One line per selector tried this session, dead fallbacks flagged"""
+        lines = []
+        for key, chain in sorted(self.session.items()):
+            for selector, counts in sorted(chain.items(), key=lambda item: -item[1]["hits"]):
+                rate = counts["hits"] / counts["tried"] if counts["tried"] else 0.0
+                flag = "  (never matched)" if counts["tried"] and not counts["hits"] else ""
+                lines.append(f"{key:<24} {rate:6.1%} of {counts['tried']:5d} tries  {selector}{flag}")
+        return lines
+    
+    def reset(self) -> None:
+        self.session.clear()
+        self._history = None
+    
+    def save(self) -> None:
+        """Merge this session's counts into the stats file"""
+        self.merge_into(self.path, self.session)
+    
+    @staticmethod
+    def merge_into(path: str, delta: Dict[str, Dict[str, Dict[str, int]]]) -> None:
+        """Add a session's counts to the stats file"""
+        if not delta:
+            return
+        chains = SelectorRegistry._read(path)
+        for key, chain in delta.items():
+            target = chains.setdefault(key, {})
+            for selector, counts in chain.items():
+                entry = target.setdefault(selector, {"tried": 0, "hits": 0})
+                entry["tried"] += counts["tried"]
+                entry["hits"] += counts["hits"]
+        
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "chains": dict(sorted(chains.items()))}, f, indent=2)
+        os.replace(tmp_path, path)
+    
+    def _load(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        if self._history is None:
+            self._history = self._read(self.path)
+        return self._history
+    
+    @staticmethod
+    def _read(path: str) -> Dict[str, Dict[str, Dict[str, int]]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f).get("chains", {})
+        except (OSError, ValueError):
+            return {}
+
+
+selectors = SelectorRegistry()
+selectors.register(SearchResultsSelectors.PAGE_TYPE, "title", SearchResultsSelectors.TITLE_SELECTORS)
@@ -0,0 +1,45 @@
+# src/pages/signin_page.py
+"""
+Amazon Sign-In Page Object
+Signs in with email and password; Amazon asks for them on one page or
+two, the stand-in on one
+"""
+
+from src.config.config import config
+from src.pages.base_page import BasePage
+from src.pages.selectors import SignInSelectors
+from src.utils.timing import timed
+
+
+class SignInPage(SignInSelectors, BasePage):
+    """Sign-in form interactions; selectors come from the registry"""
+    
+    @timed
+    def goto(self) -> 'SignInPage':
+        self.navigate(f"{config.base_url.rstrip('/')}/ap/signin")
+        self.page.wait_for_selector(self.EMAIL, timeout=15000)
+        return self
+    
+    @timed
+    def sign_in(self, email: str, password: str) -> None:
+        """
+        Submit the credentials and wait to leave the sign-in page
+        
+        Raises:
+            RuntimeError: When the form reports an error instead
+        """
+        self.logger.info(f"Signing in as {email}")
+        self.wait_and_fill(self.EMAIL, email)
+        if self.is_visible_now(self.CONTINUE):
+            self.wait_and_click(self.CONTINUE)
+        self.wait_and_fill(self.PASSWORD, password, secret=True)
+        self.wait_and_click(self.SUBMIT)
+        # The old document is still loaded right after the click; wait for
+        # the outcome itself instead of a load state it already reached
+        self.page.wait_for_function(
+            "sel => !location.pathname.startsWith('/ap/signin') || !!document.querySelector(sel)",
+            arg=self.ERROR, timeout=15000
+        )
+        if "/ap/signin" in self.page.url:
+            message = self.get_text(self.ERROR) if self.is_visible_now(self.ERROR) else "still on the sign-in page"
+            raise RuntimeError(f"Sign-in as {email} failed: {message}")
@@ -0,0 +1,431 @@
+# src/pages/snapshot.py
+"""
+Offline parsing of saved search results pages
+Builds a light DOM from snapshot HTML with the standard library and runs
+the page objects' own selectors against it, so extraction logic can be
+re-validated over thousands of saved pages without a browser
+
+Usage:
+    python -m src.pages.snapshot DIR_OR_FILES... [--workers N] [--max-count N]
+"""
+
+import argparse
+import functools
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.pages.selectors import SearchResultsSelectors, parse_price, parse_rating, parse_results_count, selectors
+
+SNAPSHOT_DIR = os.path.join("reports", "snapshots")
+
+# Elements that never have an end tag
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+})
+
+# Elements whose content is never rendered
+HIDDEN_ELEMENTS = frozenset({"head", "script", "style", "template", "noscript", "title"})
+
+# Elements that take up space even without content
+REPLACED_ELEMENTS = frozenset({
+    "img", "svg", "video", "canvas", "iframe", "embed", "object", "input", "textarea", "select", "button", "hr",
+})
+
+_HIDDEN_STYLE = re.compile(r"(?:^|;)\s*(?:display\s*:\s*none|visibility\s*:\s*hidden)", re.IGNORECASE)
+_SIZED_STYLE = re.compile(r"(?:^|;)\s*(?:min-)?(?:width|height)\s*:\s*(?!0(?:px)?\s*(?:;|$))", re.IGNORECASE)
+
+
+def _hides(node: 'Node') -> bool:
+    """Whether the element hides itself and its descendants"""
+    return (node.tag in HIDDEN_ELEMENTS or "hidden" in node.attrs
+            or bool(_HIDDEN_STYLE.search(node.attrs.get("style") or "")))
+
+
+class Node:
+    """One element of a parsed snapshot"""
+    
+    __slots__ = ("tag", "attrs", "children", "elements", "parent")
+    
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional['Node'] = None):
+        self.tag = tag
+        self.attrs = attrs
+        # Child elements and text strings, in document order
+        self.children: List = []
+        # Child elements only, kept separately so selector walks skip text
+        self.elements: List['Node'] = []
+        self.parent = parent
+    
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.attrs.get(name)
+    
+    def text_content(self) -> str:
+        """Concatenated text of the element and all its descendants"""
+        parts: List[str] = []
+        stack: List = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return "".join(parts)
+    
+    def iter_descendants(self) -> Iterator['Node']:
+        """Descendant elements in document order"""
+        stack = self.elements[::-1]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.elements:
+                stack.extend(reversed(node.elements))
+    
+    def select(self, selector: str) -> List['Node']:
+        """Descendants matching a CSS selector, like querySelectorAll"""
+        groups = compile_selector(selector)
+        return [node for node in self.iter_descendants() if any(_matches(node, group) for group in groups)]
+    
+    def select_one(self, selector: str) -> Optional['Node']:
+        """First descendant matching a CSS selector, like querySelector"""
+        groups = compile_selector(selector)
+        for node in self.iter_descendants():
+            if any(_matches(node, group) for group in groups):
+                return node
+        return None
+    
+    def is_rendered(self) -> bool:
+        """
+        Whether the element would be rendered with a non-empty box
+        
+        Mirrors Playwright's is_visible() without layout: an element is
+        hidden if it or an ancestor is, and empty - no text, replaced
+        element or explicit size below it - counts as zero-sized, as an
+        unstyled icon is in the browser.
+        """
+        node = self
+        while node is not None:
+            if _hides(node):
+                return False
+            node = node.parent
+        return self._has_box()
+    
+    def _has_box(self) -> bool:
+        stack: List = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                if node.strip():
+                    return True
+                continue
+            if node is not self and _hides(node):
+                continue
+            if node.tag in REPLACED_ELEMENTS or _SIZED_STYLE.search(node.attrs.get("style") or ""):
+                return True
+            stack.extend(node.children)
+        return False
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds Node trees, closing unclosed elements the way browsers mostly do"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self.stack = [self.root]
+    
+    def handle_starttag(self, tag, attrs):
+        node = self._append(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(node)
+    
+    def handle_startendtag(self, tag, attrs):
+        self._append(tag, attrs)
+    
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+    
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+    
+    def _append(self, tag, attrs) -> Node:
+        parent = self.stack[-1]
+        node = Node(tag, {name: value if value is not None else "" for name, value in attrs}, parent)
+        parent.children.append(node)
+        parent.elements.append(node)
+        return node
+
+
+def parse_html(html: str) -> Node:
+    """Parse snapshot HTML into a document node"""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# A compound selector: (tag, id, classes, [(attr, operator, value)])
+Compound = Tuple[Optional[str], Optional[str], Tuple[str, ...], Tuple[Tuple[str, str, Optional[str]], ...]]
+
+_TOKEN = re.compile(r"""
+    \s*(?P<combinator>[>,])\s*
+  | (?P<space>\s+)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+)))?\s*\]
+  | (?P<tag>\*|[a-zA-Z][\w-]*)
+""", re.VERBOSE)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_selector(selector: str) -> Tuple[Tuple[Tuple[str, Compound], ...], ...]:
+    """
+    Compile a selector list into groups of (combinator, compound) steps
+    
+    Supports tag, #id, .class, attribute tests (=, *=, ^=, $=, ~=, |=),
+    descendant and child combinators and comma lists - what the page
+    objects use.
+    """
+    groups: List[Tuple[Tuple[str, Compound], ...]] = []
+    steps: List[Tuple[str, Compound]] = []
+    combinator = " "
+    tag = element_id = None
+    classes: List[str] = []
+    attrs: List[Tuple[str, str, Optional[str]]] = []
+    pending = False
+    
+    def close_compound():
+        nonlocal tag, element_id, classes, attrs, pending
+        if pending:
+            steps.append((combinator, (tag, element_id, tuple(classes), tuple(attrs))))
+        tag = element_id = None
+        classes, attrs, pending = [], [], False
+    
+    position = 0
+    selector = selector.strip()
+    while position < len(selector):
+        match = _TOKEN.match(selector, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unsupported selector: {selector!r} at {position}")
+        position = match.end()
+        if match.group("combinator") or match.group("space"):
+            close_compound()
+            if match.group("combinator") == ",":
+                groups.append(tuple(steps))
+                steps.clear()
+                combinator = " "
+            else:
+                combinator = match.group("combinator") or " "
+            continue
+        pending = True
+        if match.group("id"):
+            element_id = match.group("id")
+        elif match.group("cls"):
+            classes.append(match.group("cls"))
+        elif match.group("attr"):
+            value = next((v for v in (match.group("dq"), match.group("sq"), match.group("bare")) if v is not None), None)
+            attrs.append((match.group("attr"), match.group("op") or "", value))
+        else:
+            tag = None if match.group("tag") == "*" else match.group("tag").lower()
+    close_compound()
+    groups.append(tuple(steps))
+    return tuple(group for group in groups if group)
+
+
+def _matches_compound(node: Node, compound: Compound) -> bool:
+    tag, element_id, classes, attrs = compound
+    if tag is not None and node.tag != tag:
+        return False
+    if element_id is not None and node.attrs.get("id") != element_id:
+        return False
+    if classes:
+        node_classes = (node.attrs.get("class") or "").split()
+        if any(cls not in node_classes for cls in classes):
+            return False
+    for name, op, value in attrs:
+        actual = node.attrs.get(name)
+        if actual is None:
+            return False
+        if op == "=" and actual != value:
+            return False
+        if op == "*=" and (not value or value not in actual):
+            return False
+        if op == "^=" and (not value or not actual.startswith(value)):
+            return False
+        if op == "$=" and (not value or not actual.endswith(value)):
+            return False
+        if op == "~=" and value not in actual.split():
+            return False
+        if op == "|=" and actual != value and not actual.startswith(f"{value}-"):
+            return False
+    return True
+
+
+def _matches(node: Node, steps: Tuple[Tuple[str, Compound], ...], index: int = -1) -> bool:
+    """Match right to left; like element.querySelector, ancestors may lie outside the element"""
+    if index < 0:
+        index += len(steps)
+    combinator, compound = steps[index]
+    if not _matches_compound(node, compound):
+        return False
+    if index == 0:
+        return True
+    ancestor = node.parent
+    while ancestor is not None:
+        if _matches(ancestor, steps, index - 1):
+            return True
+        if combinator == ">":
+            return False
+        ancestor = ancestor.parent
+    return False
+
+
+class SnapshotResultsPage(SearchResultsSelectors):
+    """
+    Read-only SearchResultsPage over a saved snapshot
+    
+    Uses the same selectors, fallback order and parsers as the live page
+    object, so results can be compared directly with get_products.
+    """
+    
+    def __init__(self, html: str, url: str = ""):
+        self.document = parse_html(html)
+        self.url = url
+    
+    def get_results_count(self) -> int:
+        """Get total number of results"""
+        info = self.document.select_one(self.RESULTS_INFO)
+        return parse_results_count(info.text_content() if info is not None else None)
+    
+    def has_results(self) -> bool:
+        """Check if the snapshot shows results"""
+        message = self.document.select_one(self.NO_RESULTS_MESSAGE)
+        return message is None or not message.is_rendered()
+    
+    def next_page_url(self) -> Optional[str]:
+        """href of the next-page link, or None on the last page"""
+        link = self.document.select_one(f"a{self.NEXT_PAGE}")
+        return link.get_attribute("href") if link is not None else None
+    
+    def get_products(self, max_count: Optional[int] = 10) -> List[Dict[str, any]]:
+        """Extract products the way the bulk extraction script does in the page"""
+        title_selectors = selectors.candidates(self.PAGE_TYPE, "title")
+        products = []
+        for idx, card in enumerate(self.document.select(self.PRODUCT_CARDS)[:max_count]):
+            title = ""
+            for selector in title_selectors:
+                element = card.select_one(selector)
+                if element is not None and element.is_rendered():
+                    title = element.text_content().strip()
+                    if title:
+                        break
+            price = _rendered(card.select_one(self.PRODUCT_PRICE))
+            rating = _rendered(card.select_one(self.PRODUCT_RATING))
+            products.append({
+                'index': idx + 1,
+                'title': title,
+                'price': parse_price(price.text_content()) if price is not None else None,
+                'rating': parse_rating(rating.get_attribute('aria-label')) if rating is not None else None,
+                'is_prime': _rendered(card.select_one(self.PRIME_BADGE)) is not None,
+                'is_sponsored': 'Sponsored' in card.text_content()
+            })
+        return products
+
+
+def _rendered(node: Optional[Node]) -> Optional[Node]:
+    return node if node is not None and node.is_rendered() else None
+
+
+@dataclass
+class SnapshotResult:
+    """Products extracted from one snapshot file"""
+    path: str
+    results_count: int = 0
+    products: List[Dict[str, any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def save_snapshot(html: str, name: str, directory: str = SNAPSHOT_DIR) -> str:
+    """Write page HTML to the snapshot directory; returns the file path"""
+    os.makedirs(directory, exist_ok=True)
+    safe_name = re.sub(r"[^\w.-]+", "_", name).strip("_")[:120] or "snapshot"
+    path = os.path.join(directory, f"{safe_name}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return path
+
+
+def parse_snapshot(path: str, max_count: int = 10000) -> SnapshotResult:
+    """Parse one snapshot file; errors are returned, not raised, so a pool keeps going"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            page = SnapshotResultsPage(f.read(), url=path)
+        return SnapshotResult(path, page.get_results_count(), page.get_products(max_count))
+    except Exception as e:
+        return SnapshotResult(path, error=f"{type(e).__name__}: {e}")
+
+
+def find_snapshots(targets: List[str]) -> List[str]:
+    """Expand directories into the .html files below them"""
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            paths.extend(sorted(glob.glob(os.path.join(target, "**", "*.html"), recursive=True)))
+        else:
+            paths.append(target)
+    return paths
+
+
+def parse_snapshots(paths: List[str], workers: Optional[int] = None, max_count: int = 10000) -> List[SnapshotResult]:
+    """
+    Parse many snapshots across a process pool
+    
+    Args:
+        paths: Snapshot files
+        workers: Worker processes (default: one per CPU); 1 parses in-process
+        max_count: Products extracted per snapshot
+    
+    Returns:
+        One result per path, in input order
+    """
+    if workers == 1 or len(paths) <= 1:
+        return [parse_snapshot(path, max_count) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_snapshot, paths, [max_count] * len(paths), chunksize=chunksize))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=[SNAPSHOT_DIR], help="Snapshot files or directories")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-count", type=int, default=10000, help="Products extracted per snapshot")
+    args = parser.parse_args()
+    
+    paths = find_snapshots(args.targets)
+    start = time.perf_counter()
+    results = parse_snapshots(paths, args.workers, args.max_count)
+    wall = time.perf_counter() - start
+    
+    failed = [result for result in results if result.error]
+    products = sum(len(result.products) for result in results)
+    for result in failed:
+        print(f"{result.path}: {result.error}")
+    print(
+        f"{len(results)} snapshots, {products} products, {len(failed)} failed "
+        f"in {wall:.2f}s ({len(results) / wall if wall else 0:.0f} pages/s)"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
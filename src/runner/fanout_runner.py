@@ -0,0 +1,291 @@
+# src/runner/fanout_runner.py
+"""
+Cross-browser fan-out of one search scenario
+Runs the same page-object steps on several browser engines at once, one
+process per engine, replaying a shared network recording where there is
+one, then diffs per-step timings and extracted results across engines
+
+Usage:
+    python -m src.runner.fanout_runner [--engines chromium,firefox,webkit] [--standin] [--replay fallback] [query]
+"""
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.config.config import config
+from src.utils.replay import FALLBACK, MODES, RECORD, archive_path
+
+ENGINES = ("chromium", "firefox", "webkit")
+
+# Product fields compared across engines; index and sponsored slots follow layout
+COMPARED_FIELDS = ("price", "rating", "is_prime")
+
+
+@dataclass
+class EngineResult:
+    """One engine's run of the scenario"""
+    engine: str
+    seconds: float = 0.0
+    # Top-level page-object steps, seconds each
+    steps: Dict[str, float] = field(default_factory=dict)
+    has_results: bool = False
+    products: List[Dict] = field(default_factory=list)
+    replay_served: int = 0
+    replay_missed: int = 0
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class EngineDiff:
+    """How one engine's results differ from the reference engine's"""
+    engine: str
+    reference: str
+    missing: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    
+    @property
+    def matches(self) -> bool:
+        return not (self.missing or self.extra or self.changed)
+
+
+@dataclass
+class FanoutReport:
+    """All engines of one fan-out"""
+    query: str
+    results: List[EngineResult]
+    wall: float = 0.0
+    archive: Optional[str] = None
+    
+    @property
+    def serial(self) -> float:
+        """What running the engines one after another would have taken"""
+        return sum(result.seconds for result in self.results)
+    
+    @property
+    def failures(self) -> List[EngineResult]:
+        return [result for result in self.results if not result.ok]
+
+
+def search_scenario(page, query: str, max_products: int) -> Dict:
+    """Homepage, search, results readiness and extraction"""
+    from src.pages.home_page import HomePage
+    from src.pages.search_results_page import SearchResultsPage
+    
+    home_page = HomePage(page).goto()
+    home_page.search_product(query)
+    results_page = SearchResultsPage(page)
+    has_results = results_page.has_results()
+    products = results_page.get_products(max_count=max_products) if has_results else []
+    return {"has_results": has_results, "products": products}
+
+
+def run_engine(engine: str, query: str, base_url: str, replay: str = "", archive: Optional[str] = None,
+               max_products: int = 10, headless: bool = True) -> EngineResult:
+    """
+    Run the scenario on one engine; executes in its own process
+    
+    Args:
+        engine: chromium, firefox or webkit
+        query: Search term
+        base_url: Site under test, passed explicitly since workers start fresh
+        replay: Replay mode for the shared archive, '' for live traffic
+        archive: HAR file recorded or replayed by every engine
+        max_products: Products extracted
+        headless: Launch the browser headless
+    """
+    from playwright.sync_api import sync_playwright
+    from src.utils.replay import ReplaySession
+    from src.utils.timing import profiler
+    
+    config.base_url = base_url
+    config.browser_type = engine
+    profiler.enabled = True
+    profiler.current_test = engine
+    profiler.reset()
+    result = EngineResult(engine)
+    
+    start = time.perf_counter()
+    try:
+        with sync_playwright() as p:
+            browser = getattr(p, engine).launch(headless=headless)
+            args = {"viewport": config.viewport, "ignore_https_errors": True}
+            if replay:
+                # Service workers fetch outside of route interception
+                args["service_workers"] = "block"
+            context = browser.new_context(**args)
+            context.set_default_timeout(config.timeout)
+            session = None
+            if replay:
+                session = ReplaySession(replay, archive)
+                session.attach(context)
+            try:
+                outcome = search_scenario(context.new_page(), query, max_products)
+                result.has_results = outcome["has_results"]
+                result.products = outcome["products"]
+            finally:
+                if session is not None:
+                    session.detach(context)
+                    result.replay_served, result.replay_missed = session.served, len(session.missed)
+                context.close()
+                browser.close()
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    
+    for key, stats in profiler.stats.items():
+        # (engine, step) keys are the scenario's top-level steps
+        if len(key) == 2:
+            result.steps[key[1]] = result.steps.get(key[1], 0.0) + stats.total
+    return result
+
+
+def run_fanout(query: str, engines: List[str], replay: str = "", archive: Optional[str] = None,
+               max_products: int = 10, headless: bool = True) -> FanoutReport:
+    """
+    Run the scenario on every engine concurrently
+    
+    In record mode the first engine records the archive on its own, and
+    the others then replay it with live fallback, so every engine still
+    sees the same responses.
+    
+    Returns:
+        Report with one result per engine, in input order
+    """
+    if replay and replay not in MODES:
+        raise ValueError(f"Unknown replay mode '{replay}', expected one of {MODES}")
+    archive = archive or (archive_path(config.replay_dir, f"fanout::{query}") if replay else None)
+    start = time.perf_counter()
+    results: List[EngineResult] = []
+    pending = list(engines)
+    modes = {engine: replay for engine in engines}
+    # Spawned workers start without the parent's Playwright or threads
+    with ProcessPoolExecutor(max_workers=max(1, len(pending)),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        if replay == RECORD:
+            engine = pending.pop(0)
+            results.append(pool.submit(
+                run_engine, engine, query, config.base_url, RECORD, archive, max_products, headless
+            ).result())
+            modes.update((engine, FALLBACK) for engine in pending)
+        futures = [
+            pool.submit(run_engine, engine, query, config.base_url, modes[engine], archive, max_products, headless)
+            for engine in pending
+        ]
+        results.extend(future.result() for future in futures)
+    return FanoutReport(query, results, time.perf_counter() - start, archive)
+
+
+def _product_key(product: Dict) -> str:
+    return " ".join(str(product.get("title") or "").split()).lower()
+
+
+def diff_results(results: List[EngineResult], reference: Optional[str] = None) -> List[EngineDiff]:
+    """
+    Compare every engine's extracted products with a reference engine
+    
+    Products are matched by normalized title; for matched products the
+    COMPARED_FIELDS are compared. The reference defaults to the first
+    engine that succeeded; failed engines are left out.
+    """
+    succeeded = [result for result in results if result.ok]
+    if not succeeded:
+        return []
+    base = next((result for result in succeeded if result.engine == reference), succeeded[0])
+    base_products = {_product_key(product): product for product in base.products}
+    
+    diffs = []
+    for result in succeeded:
+        if result is base:
+            continue
+        diff = EngineDiff(result.engine, base.engine)
+        if result.has_results != base.has_results:
+            diff.changed.append(f"has_results: {base.has_results} -> {result.has_results}")
+        products = {_product_key(product): product for product in result.products}
+        diff.missing = [key for key in base_products if key not in products]
+        diff.extra = [key for key in products if key not in base_products]
+        for key, product in products.items():
+            expected = base_products.get(key)
+            if expected is None:
+                continue
+            for name in COMPARED_FIELDS:
+                if product.get(name) != expected.get(name):
+                    diff.changed.append(f"{key[:40]}: {name} {expected.get(name)!r} -> {product.get(name)!r}")
+        diffs.append(diff)
+    return diffs
+
+
+def print_report(report: FanoutReport, diffs: List[EngineDiff]) -> None:
+    """Print per-step timings side by side, then the result diff"""
+    engines = [result.engine for result in report.results]
+    steps = list(dict.fromkeys(step for result in report.results for step in result.steps))
+    print(f"{'step':<40} " + " ".join(f"{engine:>10}" for engine in engines))
+    for step in steps:
+        cells = [result.steps.get(step) for result in report.results]
+        print(f"{step[-40:]:<40} " + " ".join(
+            f"{cell * 1000:>8.0f}ms" if cell is not None else f"{'-':>10}" for cell in cells
+        ))
+    print(f"{'total':<40} " + " ".join(f"{result.seconds * 1000:>8.0f}ms" for result in report.results))
+    
+    print()
+    for result in report.results:
+        if not result.ok:
+            print(f"{result.engine}: FAILED: {result.error.splitlines()[0][:100]}")
+            continue
+        replayed = f", replay {result.replay_served} served / {result.replay_missed} missed" if report.archive else ""
+        print(f"{result.engine}: {len(result.products)} products, has_results={result.has_results}{replayed}")
+    for diff in diffs:
+        if diff.matches:
+            print(f"{diff.engine} matches {diff.reference}")
+            continue
+        print(f"{diff.engine} differs from {diff.reference}:")
+        for title in diff.missing:
+            print(f"  - {title[:70]}")
+        for title in diff.extra:
+            print(f"  + {title[:70]}")
+        for change in diff.changed:
+            print(f"  ~ {change}")
+    
+    print(f"\n{len(engines)} engines, {len(report.failures)} failed, "
+          f"serial {report.serial:.1f}s, wall {report.wall:.1f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("query", nargs="?", default=None, help="Search term (default: TEST_PRODUCT)")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="Comma-separated browser engines")
+    parser.add_argument("--reference", default=None, help="Engine the others are diffed against")
+    parser.add_argument("--replay", default=config.replay, choices=("",) + MODES, help="Replay mode for the shared archive")
+    parser.add_argument("--archive", default=None, help="HAR file to record or replay (default: one per query)")
+    parser.add_argument("--max-products", type=int, default=10, help="Products extracted per engine")
+    parser.add_argument("--standin", action="store_true", help="Run against the local stand-in server")
+    args = parser.parse_args()
+    
+    engines = [engine.strip().lower() for engine in args.engines.split(",") if engine.strip()]
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engines: {', '.join(unknown)}")
+    query = args.query or config.test_product
+    if args.standin:
+        from src.standin.server import StandInConfig, StandInServer
+        with StandInServer(StandInConfig(latency_ms=config.standin_latency_ms)) as server:
+            config.base_url = server.url
+            report = run_fanout(query, engines, args.replay, args.archive, args.max_products)
+    else:
+        report = run_fanout(query, engines, args.replay, args.archive, args.max_products, config.headless)
+    
+    diffs = diff_results(report.results, args.reference)
+    print_report(report, diffs)
+    return 1 if report.failures or not all(diff.matches for diff in diffs) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,155 @@
+# src/runner/scenario_runner.py
+"""
+Concurrent multi-query search scenarios on asyncio
+Runs many queries at once across pages of a single browser, limited by a
+semaphore, and reports per-query latency percentiles
+
+Usage:
+    python -m src.runner.scenario_runner [--concurrency 8] [--standin] [queries...]
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from playwright.async_api import Browser, async_playwright
+
+from src.config.config import config
+from src.pages.aio.home_page import HomePage
+from src.pages.aio.search_results_page import SearchResultsPage
+from src.utils.logger import logger
+from src.utils.perf_db import percentile
+
+# Appended to config.test_product when no queries are given
+VARIANT_SUFFIXES = ["", "pro", "gaming", "cheap", "16gb", "touchscreen", "refurbished", "2 in 1"]
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class QueryResult:
+    """Outcome of one search scenario"""
+    query: str
+    seconds: float
+    products: int = 0
+    has_results: bool = False
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class ScenarioReport:
+    """All query results of one run"""
+    results: List[QueryResult] = field(default_factory=list)
+    wall: float = 0.0
+    concurrency: int = 1
+    
+    @property
+    def failures(self) -> List[QueryResult]:
+        return [result for result in self.results if not result.ok]
+    
+    def latency_percentiles(self) -> Dict[str, float]:
+        """p50/p90/p95/p99 and max latency of the successful queries, in seconds"""
+        latencies = [result.seconds for result in self.results if result.ok]
+        summary = {f"p{pct}": percentile(latencies, pct) for pct in PERCENTILES}
+        summary["max"] = max(latencies) if latencies else 0.0
+        return summary
+
+
+def query_variants(term: str = None) -> List[str]:
+    """Relevance-check variants of the configured test product"""
+    term = term or config.test_product
+    return [f"{term} {suffix}".strip() for suffix in VARIANT_SUFFIXES]
+
+
+async def run_query(browser: Browser, query: str, semaphore: asyncio.Semaphore, max_products: int = 10) -> QueryResult:
+    """Search for one query in its own context once a slot is free"""
+    async with semaphore:
+        context = await browser.new_context(viewport=config.viewport)
+        start = time.perf_counter()
+        try:
+            page = await context.new_page()
+            home_page = HomePage(page)
+            results_page = SearchResultsPage(page)
+            await home_page.goto()
+            await home_page.search_product(query)
+            has_results = await results_page.has_results()
+            products = await results_page.get_products(max_count=max_products) if has_results else []
+            return QueryResult(query, time.perf_counter() - start, len(products), has_results)
+        except Exception as e:
+            logger.error(f"Scenario '{query}' failed: {e}")
+            return QueryResult(query, time.perf_counter() - start, error=str(e))
+        finally:
+            await context.close()
+
+
+async def run_scenarios(queries: List[str], concurrency: int = 8, max_products: int = 10,
+                        headless: bool = True) -> ScenarioReport:
+    """
+    Run every query concurrently in one browser
+    
+    Args:
+        queries: Search terms, one scenario each
+        concurrency: Maximum number of scenarios in flight at once
+        max_products: Products extracted per query
+        headless: Launch the browser headless
+    
+    Returns:
+        Report with one result per query, in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await getattr(p, config.browser_type).launch(headless=headless)
+        try:
+            results = await asyncio.gather(*(
+                run_query(browser, query, semaphore, max_products) for query in queries
+            ))
+        finally:
+            await browser.close()
+    return ScenarioReport(list(results), time.perf_counter() - start, concurrency)
+
+
+def print_report(report: ScenarioReport) -> None:
+    """Print per-query results followed by the latency percentiles"""
+    print(f"{'query':<32} {'seconds':>8} {'products':>9}  status")
+    for result in report.results:
+        status = "ok" if result.ok else f"FAILED: {result.error.splitlines()[0][:60]}"
+        print(f"{result.query[:32]:<32} {result.seconds:>8.2f} {result.products:>9}  {status}")
+    
+    summary = report.latency_percentiles()
+    print("\n" + "  ".join(f"{name}={seconds:.2f}s" for name, seconds in summary.items()))
+    print(
+        f"{len(report.results)} queries, {len(report.failures)} failed, "
+        f"concurrency {report.concurrency}, wall {report.wall:.1f}s"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("queries", nargs="*", help="Search terms (default: variants of TEST_PRODUCT)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Scenarios in flight at once")
+    parser.add_argument("--max-products", type=int, default=10, help="Products extracted per query")
+    parser.add_argument("--standin", action="store_true", help="Run against the local stand-in server")
+    args = parser.parse_args()
+    
+    queries = args.queries or query_variants()
+    if args.standin:
+        from src.standin.server import StandInConfig, StandInServer
+        with StandInServer(StandInConfig(latency_ms=config.standin_latency_ms)) as server:
+            config.base_url = server.url
+            report = asyncio.run(run_scenarios(queries, args.concurrency, args.max_products))
+    else:
+        report = asyncio.run(run_scenarios(queries, args.concurrency, args.max_products, config.headless))
+    
+    print_report(report)
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
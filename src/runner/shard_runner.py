@@ -0,0 +1,119 @@
+# src/runner/shard_runner.py
+"""
+Parallel sharded test runner
+Spawns one pytest process per shard, each with its own browser, then
+merges the measured durations back into the history
+
+Usage:
+    python -m src.runner.shard_runner --workers 4 [pytest args...]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+from src.config.config import config
+from src.pages.selectors import DEFAULT_STATS_PATH, SelectorRegistry
+from src.utils.impact import DEFAULT_CACHE_PATH, ImpactCache
+from src.utils.logger import merge_worker_logs, run_id
+from src.utils.perf_db import PerfDatabase
+from src.utils.retry import DEFAULT_LEDGER_PATH, RetryLedger
+from src.utils.sharding import DEFAULT_HISTORY_PATH, DurationHistory, imbalance
+from src.utils.visual import INDEX_NAME, VisualIndex, default_baseline_dir
+
+# pytest exit code when a shard ends up with nothing to run
+NO_TESTS_COLLECTED = 5
+
+
+def run_shards(workers: int, history_path: str, pytest_args: List[str]) -> int:
+    """
+    Run every shard concurrently and print a balance report
+    
+    Returns:
+        The worst pytest exit code across shards
+    """
+    report_dir = tempfile.mkdtemp(prefix="shards_")
+    processes = []
+    start = time.perf_counter()
+    for index in range(workers):
+        report_path = os.path.join(report_dir, f"shard_{index}.json")
+        command = [
+            sys.executable, "-m", "pytest",
+            f"--shard-index={index}",
+            f"--shard-count={workers}",
+            f"--shard-history={history_path}",
+            f"--shard-report={report_path}",
+            *pytest_args,
+        ]
+        # Workers share the run ID so their log files can be merged afterwards
+        env = dict(os.environ, LOG_RUN_ID=run_id, LOG_WORKER=f"shard{index}")
+        processes.append((index, report_path, subprocess.Popen(command, env=env)))
+    
+    exit_codes = [process.wait() for _, _, process in processes]
+    wall = time.perf_counter() - start
+    
+    reports = []
+    for index, report_path, _ in processes:
+        try:
+            with open(report_path, encoding="utf-8") as f:
+                reports.append(json.load(f))
+        except (OSError, ValueError):
+            print(f"shard {index}: no report written")
+    
+    history = DurationHistory.load(history_path)
+    for report in reports:
+        history.update(report["tests"])
+        RetryLedger.merge_into(DEFAULT_LEDGER_PATH, report.get("retries", {}))
+        SelectorRegistry.merge_into(DEFAULT_STATS_PATH, report.get("selectors", {}))
+        ImpactCache.merge_into(DEFAULT_CACHE_PATH, report.get("impact", {}))
+        VisualIndex.merge_into(os.path.join(default_baseline_dir(), INDEX_NAME), report.get("visual", {}))
+    history.save()
+    samples = [sample for report in reports for sample in report.get("perf", [])]
+    if config.perf_db and samples:
+        # All shards are one run of the suite
+        with PerfDatabase(config.perf_db) as db:
+            db.add_run(samples, run_id)
+    
+    print_balance_report(reports, wall)
+    merged_log = merge_worker_logs()
+    if merged_log:
+        print(f"merged worker logs: {merged_log}")
+    
+    failures = [code for code in exit_codes if code not in (0, NO_TESTS_COLLECTED)]
+    return max(failures) if failures else 0
+
+
+def print_balance_report(reports: List[dict], wall: float) -> None:
+    """Print predicted vs actual load per shard and the speedup over serial"""
+    print("\n" + " shard balance ".center(60, "="))
+    actual_loads = []
+    predicted_loads = []
+    for report in sorted(reports, key=lambda r: r["index"]):
+        actual = sum(report["tests"].values())
+        actual_loads.append(actual)
+        predicted_loads.append(report["predicted"])
+        print(
+            f"shard {report['index']}: {len(report['tests'])} tests, "
+            f"predicted {report['predicted']:.1f}s, actual {actual:.1f}s"
+        )
+    
+    serial = sum(actual_loads)
+    print(f"imbalance (max/mean): predicted {imbalance(predicted_loads):.2f}, actual {imbalance(actual_loads):.2f}")
+    print(f"serial estimate {serial:.1f}s, wall {wall:.1f}s, speedup {serial / wall if wall else 0:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the suite across duration-balanced shards")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Number of parallel shards")
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH, help="Duration history JSON")
+    args, pytest_args = parser.parse_known_args()
+    sys.exit(run_shards(args.workers, args.history, pytest_args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# src/standin/__main__.py
+"""
+Run the stand-in server in the foreground
+
+Usage:
+    python -m src.standin [--port 8000] [--latency-ms 50] [--page-size 48] [--pages 7]
+"""
+
+import argparse
+import time
+
+from src.standin.server import StandInConfig, StandInServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for amazon.com")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every response")
+    parser.add_argument("--page-size", type=int, default=48, help="Cards per results page")
+    parser.add_argument("--pages", type=int, default=7, help="Pagination depth")
+    args = parser.parse_args()
+    
+    settings = StandInConfig(args.host, args.port, args.latency_ms, args.page_size, args.pages)
+    with StandInServer(settings) as server:
+        print(f"Stand-in serving at {server.url} (BASE_URL={server.url})")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# src/standin/catalog.py
+"""
+Synthetic product catalog for the stand-in server
+Every query yields a deterministic, paginated list of products, so runs
+against the stand-in are repeatable
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List, Optional
+
+BRANDS = ["Acer", "ASUS", "Dell", "HP", "Lenovo", "Apple", "MSI", "Samsung", "Microsoft", "Razer", "LG", "Gigabyte"]
+LINES = ["Aspire 5", "VivoBook 15", "Inspiron 14", "Pavilion 15", "IdeaPad Slim 3", "MacBook Air",
+         "Katana 15", "Galaxy Book3", "Surface Laptop 5", "Blade 14", "gram 16", "G5"]
+SPECS = [
+    '15.6" FHD IPS Display, Intel Core i5-1235U, 8GB DDR4, 512GB SSD',
+    '14" Touchscreen, AMD Ryzen 7 7730U, 16GB RAM, 1TB SSD, Backlit Keyboard',
+    '13.6" Liquid Retina Display, 8GB Unified Memory, 256GB SSD Storage',
+    '16" QHD+ 165Hz, Intel Core i7-13700H, 16GB DDR5, 1TB SSD',
+    '15.6" HD, Intel Celeron N4500, 4GB RAM, 128GB eMMC',
+]
+RATINGS = [3.9, 4.1, 4.2, 4.3, 4.4, 4.5, 4.6, 4.7, 4.8]
+
+# Queries starting with this prefix return the no-results page
+NO_RESULTS_PREFIX = "zzz"
+
+SORT_OPTIONS = {
+    "relevanceblender": "Featured",
+    "price-asc-rank": "Price: Low to High",
+    "price-desc-rank": "Price: High to Low",
+    "review-rank": "Avg. Customer Review",
+    "date-desc-rank": "Newest Arrivals",
+}
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    """One product card"""
+    asin: str
+    title: str
+    price: Optional[float]
+    rating: Optional[float]
+    reviews: int
+    is_prime: bool
+    is_sponsored: bool
+
+
+@dataclass
+class SearchPage:
+    """One page of search results"""
+    query: str
+    page: int
+    items: List[CatalogItem]
+    total_results: int
+    page_size: int
+    has_next: bool
+    sort: str = "relevanceblender"
+    
+    @property
+    def first_index(self) -> int:
+        return (self.page - 1) * self.page_size + 1
+
+
+class Catalog:
+    """
+    Deterministic product generator
+    
+    Args:
+        seed: Base seed; the same seed, query and page always give the same cards
+        page_size: Cards per results page
+        pages: Pagination depth - the last page has no next link
+        total_results: Result count shown in the info bar
+    """
+    
+    def __init__(self, seed: int = 27008, page_size: int = 48, pages: int = 7, total_results: int = 10000):
+        self.seed = seed
+        self.page_size = page_size
+        self.pages = pages
+        self.total_results = total_results
+        
+    def search(self, query: str, page: int = 1, sort: str = "relevanceblender") -> SearchPage:
+        """Results for a query; pages past the pagination depth are empty"""
+        query = query.strip()
+        if not query or query.lower().startswith(NO_RESULTS_PREFIX):
+            return SearchPage(query, page, [], 0, self.page_size, False, sort)
+            
+        items = self._items(query, page) if 1 <= page <= self.pages else []
+        if sort == "price-asc-rank":
+            items.sort(key=lambda item: (item.price is None, item.price or 0))
+        elif sort == "price-desc-rank":
+            items.sort(key=lambda item: (item.price is None, -(item.price or 0)))
+        elif sort == "review-rank":
+            items.sort(key=lambda item: -(item.rating or 0))
+        return SearchPage(query, page, items, self.total_results, self.page_size, page < self.pages, sort)
+        
+    def product(self, asin: str) -> Optional[CatalogItem]:
+        """Look a product up again from its ASIN"""
+        try:
+            query, page, index = self._decode_asin(asin)
+        except ValueError:
+            return None
+        items = self._items(query, page)
+        return items[index] if index < len(items) else None
+        
+    def _items(self, query: str, page: int) -> List[CatalogItem]:
+        rng = random.Random(f"{self.seed}:{query.lower()}:{page}")
+        items = []
+        for index in range(self.page_size):
+            whole = rng.randint(149, 2899)
+            cents = rng.choice([0, 49, 95, 99])
+            items.append(CatalogItem(
+                asin=self._encode_asin(query, page, index),
+                title=f"{rng.choice(BRANDS)} {rng.choice(LINES)} {query.title()} {rng.choice(SPECS)}",
+                price=whole + cents / 100 if rng.random() > 0.1 else None,
+                rating=rng.choice(RATINGS) if rng.random() > 0.15 else None,
+                reviews=rng.randint(3, 9000),
+                is_prime=rng.random() > 0.4,
+                is_sponsored=rng.random() < 0.2,
+            ))
+        return items
+        
+    # ASINs carry the query, page and index so /dp/<asin> needs no lookup table
+    @staticmethod
+    def _encode_asin(query: str, page: int, index: int) -> str:
+        return f"SI{page:03d}{index:03d}-{query.encode('utf-8').hex()}"
+        
+    @staticmethod
+    def _decode_asin(asin: str):
+        head, _, encoded_query = asin.partition("-")
+        if not head.startswith("SI") or len(head) != 8:
+            raise ValueError(asin)
+        return bytes.fromhex(encoded_query).decode("utf-8"), int(head[2:5]), int(head[5:8])
@@ -0,0 +1,139 @@
+# src/standin/markup.py
+"""
+HTML for the stand-in server
+Mirrors the Amazon markup that HomePage and SearchResultsPage select on
+"""
+
+from html import escape
+from typing import Optional
+from urllib.parse import urlencode
+
+from src.standin.catalog import SORT_OPTIONS, CatalogItem, SearchPage
+
+HEADER = """<header id="navbar">
+<a id="nav-logo" href="/">Amazon</a>
+<form action="/s" method="get" role="search">
+<input type="text" id="twotabsearchtextbox" name="k" value="{query}" aria-label="Search Amazon">
+<input type="submit" id="nav-search-submit-button" value="Go">
+</form>
+<a id="nav-link-accountList" href="/ap/signin"><span>{greeting}</span> Account &amp; Lists</a>
+<a id="nav-cart" href="/cart" aria-label="{cart_count} items in cart"><span id="nav-cart-count">{cart_count}</span> Cart</a>
+</header>"""
+
+PAGE = """<!doctype html>
+<html lang="en-us">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+{header}
+{body}
+</body>
+</html>
+"""
+
+
+def page(title: str, body: str, query: str = "", user: Optional[str] = None, cart_count: int = 0) -> str:
+    greeting = f"Hello, {escape(user)}" if user else "Hello, sign in"
+    header = HEADER.format(query=escape(query), greeting=greeting, cart_count=cart_count)
+    return PAGE.format(title=escape(title), header=header, body=body)
+
+
+def home(user: Optional[str] = None, cart_count: int = 0) -> str:
+    body = '<main id="pageContent"><h1>Deals and more</h1></main>'
+    return page("Amazon.com. Spend less. Smile more.", body, user=user, cart_count=cart_count)
+
+
+def card(item: CatalogItem, position: int) -> str:
+    parts = [
+        f'<div data-component-type="s-search-result" data-asin="{item.asin}" data-index="{position}" class="s-result-item s-asin">',
+        '<div class="a-section a-spacing-base">',
+    ]
+    if item.is_sponsored:
+        parts.append('<div class="a-row a-spacing-micro"><span class="puis-label-popover-default">'
+                     '<span class="a-color-secondary">Sponsored</span></span></div>')
+    parts.append(f'<h2 class="a-size-mini a-spacing-none a-color-base s-line-clamp-2">'
+                 f'<a class="a-link-normal s-link-style a-text-normal" href="/dp/{item.asin}">'
+                 f'<span class="a-size-medium a-color-base a-text-normal">{escape(item.title)}</span></a></h2>')
+    if item.rating is not None:
+        parts.append(f'<div class="a-row a-size-small"><span aria-label="{item.rating} out of 5 stars">'
+                     f'<i class="a-icon a-icon-star-small"><span class="a-icon-alt">{item.rating} out of 5 stars</span></i></span> '
+                     f'<span aria-label="{item.reviews:,}"><span class="a-size-base s-underline-text">{item.reviews:,}</span></span></div>')
+    if item.price is not None:
+        whole = int(item.price)
+        cents = round((item.price - whole) * 100)
+        parts.append(f'<div class="a-row"><a class="a-link-normal s-no-hover a-text-normal" href="/dp/{item.asin}">'
+                     f'<span class="a-price" data-a-size="xl"><span class="a-offscreen">${whole:,}.{cents:02d}</span>'
+                     f'<span aria-hidden="true"><span class="a-price-symbol">$</span><span class="a-price-whole">{whole:,}'
+                     f'<span class="a-price-decimal">.</span></span><span class="a-price-fraction">{cents:02d}</span></span></span></a></div>')
+    if item.is_prime:
+        parts.append('<div class="a-row"><i class="a-icon a-icon-prime a-icon-medium" role="img" aria-label="Amazon Prime" '
+                     'style="display:inline-block;width:53px;height:15px"></i></div>')
+    parts.append('</div>\n</div>')
+    return "\n".join(parts)
+
+
+def _results_url(results: SearchPage, page_number: int) -> str:
+    params = {"k": results.query, "page": page_number}
+    if results.sort != "relevanceblender":
+        params["s"] = results.sort
+    return "/s?" + escape(urlencode(params))
+
+
+def search_results(results: SearchPage, user: Optional[str] = None, cart_count: int = 0) -> str:
+    title = f"Amazon.com : {results.query}"
+    if not results.items:
+        body = ('<div class="s-no-results-message"><span>No results for '
+                f'<span class="a-color-state">{escape(results.query)}</span>.</span></div>')
+        return page(title, body, results.query, user, cart_count)
+    
+    last_index = results.first_index + len(results.items) - 1
+    options = "".join(
+        f'<option value="{value}"{" selected" if value == results.sort else ""}>{label}</option>'
+        for value, label in SORT_OPTIONS.items()
+    )
+    # Selecting a sort order reloads the page, as on the real site
+    sort_script = (
+        "const u = new URL(location.href); u.searchParams.set('s', this.value); "
+        "u.searchParams.delete('page'); location.href = u.toString();"
+    )
+    info_bar = (
+        f'<div data-component-type="s-result-info-bar"><span>{results.first_index}-{last_index} of over '
+        f'{results.total_results:,} results for</span> <span>"{escape(results.query)}"</span>\n'
+        f'<select id="s-result-sort-select" name="s" onchange="{sort_script}">{options}</select></div>'
+    )
+    cards = "\n".join(card(item, results.first_index + i) for i, item in enumerate(results.items))
+    
+    pagination = [f'<span class="s-pagination-item s-pagination-selected">{results.page}</span>']
+    if results.has_next:
+        pagination.append(f'<a class="s-pagination-item s-pagination-next s-pagination-button" '
+                          f'href="{_results_url(results, results.page + 1)}">Next</a>')
+    else:
+        pagination.append('<span class="s-pagination-item s-pagination-next s-pagination-disabled">Next</span>')
+    
+    body = (f'{info_bar}\n<div class="s-main-slot s-result-list">\n{cards}\n</div>\n'
+            f'<div class="s-pagination-container">{" ".join(pagination)}</div>')
+    return page(title, body, results.query, user, cart_count)
+
+
+def product(item: CatalogItem, user: Optional[str] = None, cart_count: int = 0) -> str:
+    price = f"${item.price:,.2f}" if item.price is not None else "Currently unavailable."
+    body = (f'<div id="dp"><span id="productTitle">{escape(item.title)}</span>'
+            f'<span class="a-price"><span class="a-offscreen">{price}</span></span></div>')
+    return page(item.title, body, user=user, cart_count=cart_count)
+
+
+def signin(email: str = "", error: Optional[str] = None) -> str:
+    alert = f'<div id="auth-error-message-box" role="alert">{escape(error)}</div>' if error else ""
+    body = (f'<main id="authportal-main-section"><h1>Sign in</h1>{alert}'
+            '<form name="signIn" method="post" action="/ap/signin">'
+            f'<input type="email" id="ap_email" name="email" value="{escape(email)}">'
+            '<input type="password" id="ap_password" name="password">'
+            '<input type="submit" id="signInSubmit" value="Sign in">'
+            '</form></main>')
+    return page("Amazon Sign-In", body)
+
+
+def not_found() -> str:
+    return page("Page Not Found", "<h1>Looking for something?</h1>")
@@ -0,0 +1,158 @@
+# src/standin/server.py
+"""
+Local stand-in for amazon.com
+Serves the synthetic catalog over HTTP with configurable latency, page
+size and pagination depth so the suite and benchmarks can run offline
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from src.standin import markup
+from src.standin.catalog import Catalog
+
+
+@dataclass
+class StandInConfig:
+    """Knobs for the stand-in server"""
+    host: str = "127.0.0.1"
+    port: int = 0
+    latency_ms: int = 0
+    page_size: int = 48
+    pages: int = 7
+    seed: int = 27008
+    # The one account /ap/signin accepts
+    email: str = "standin@example.com"
+    password: str = "standin-pass"
+
+
+class StandInServer:
+    """
+    Threaded HTTP server in a background thread
+    
+    Usage:
+        with StandInServer(StandInConfig(latency_ms=50)) as server:
+            page.goto(server.url)
+    """
+    
+    def __init__(self, settings: Optional[StandInConfig] = None):
+        self.settings = settings or StandInConfig()
+        self.catalog = Catalog(seed=self.settings.seed, page_size=self.settings.page_size, pages=self.settings.pages)
+        self.requests_served = 0
+        self.sign_ins = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> 'StandInServer':
+        self._httpd = ThreadingHTTPServer((self.settings.host, self.settings.port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+    
+    def render(self, path: str, query: dict, cookies: dict) -> tuple:
+        """Status code and HTML for a GET request"""
+        user = unquote(cookies["standin-user"]) if "standin-user" in cookies else None
+        if path == "/":
+            return 200, markup.home(user=user)
+        if path == "/ap/signin":
+            return 200, markup.signin()
+        if path == "/s":
+            results = self.catalog.search(
+                query.get("k", [""])[0],
+                page=self._page_number(query),
+                sort=query.get("s", ["relevanceblender"])[0],
+            )
+            return 200, markup.search_results(results, user=user)
+        if path.startswith("/dp/"):
+            item = self.catalog.product(path[len("/dp/"):])
+            if item is not None:
+                return 200, markup.product(item, user=user)
+        return 404, markup.not_found()
+    
+    @staticmethod
+    def _page_number(query: dict) -> int:
+        """Requested results page; like Amazon, a malformed page= shows the first"""
+        try:
+            return int(query.get("page", ["1"])[0])
+        except ValueError:
+            return 1
+    
+    def sign_in(self, form: dict) -> tuple:
+        """
+        Status, HTML and the signed-in user for a sign-in form post
+        
+        The user, the email's local part, is kept in the 'standin-user'
+        cookie the way Amazon keeps its session cookies.
+        """
+        email = form.get("email", [""])[0]
+        if email != self.settings.email or form.get("password", [""])[0] != self.settings.password:
+            return 401, markup.signin(email, "Your email or password is incorrect"), None
+        self.sign_ins += 1
+        return 303, "", email.split("@")[0]
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.settings.latency_ms:
+                    time.sleep(server.settings.latency_ms / 1000)
+                parts = urlsplit(self.path)
+                cookies = dict(
+                    pair.strip().split("=", 1) for pair in self.headers.get("Cookie", "").split(";") if "=" in pair
+                )
+                status, html = server.render(parts.path, parse_qs(parts.query), cookies)
+                body = html.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server.requests_served += 1
+            
+            def do_POST(self):
+                if server.settings.latency_ms:
+                    time.sleep(server.settings.latency_ms / 1000)
+                if urlsplit(self.path).path != "/ap/signin":
+                    self.send_error(405)
+                    return
+                length = int(self.headers.get("Content-Length", "0"))
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                status, html, user = server.sign_in(form)
+                body = html.encode("utf-8")
+                self.send_response(status)
+                if user is not None:
+                    self.send_header("Set-Cookie", f"standin-user={quote(user)}; Path=/; Max-Age=86400")
+                    self.send_header("Location", "/")
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server.requests_served += 1
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
@@ -5,97 +5,482 @@ Fixtures are reusable test components
 """
 
 import pytest
-from playwright.sync_api import Page, Browser
-from typing import Generator
+from _pytest.runner import runtestprotocol
+from playwright.sync_api import Page, Browser, BrowserContext
+from typing import Generator, Optional
+from src.config.config import config
+from src.pages.readiness import timing_report
+from src.pages.selectors import selectors
+from src.pages.signin_page import SignInPage
+from src.standin.server import StandInConfig, StandInServer
+from src.utils.auth_state import StorageStateCache
+from src.utils.context_pool import ContextPool, PooledContext
+from src.utils.flight_recorder import FlightRecorder, trace_path
+from src.utils.impact import DEFAULT_CACHE_PATH, CallRecorder, DependencyGraph, ImpactCache, ImpactSelector
+from src.utils.logger import flush_logs, logger, run_id, set_current_test
+from src.utils.perf_db import STEP, TEST, PerfDatabase, current_target, perf
+from src.utils.replay import ReplaySession, archive_path
+from src.utils.resource_blocking import ResourceBlocker, get_profile
+from src.utils.retry import DEFAULT_LEDGER_PATH, TRANSIENT, RetryLedger, backoff_delay, classify_failure
+from src.utils.screenshots import screenshots
+from src.utils.sharding import DEFAULT_HISTORY_PATH, DurationHistory, Shard, plan_shards
+from src.utils.timing import profiler
+from src.utils.visual import VisualChecker, VisualIndex, VisualResult, baseline_key
+import json
+import time
 
-@pytest.fixture(scope="function")
-def page(browser: Browser) -> Generator[Page, None, None]:
-    """
-    Create a new page for each test
-    'function' scope means fresh page per test
-    """
-    # Create new browser context (like incognito window)
-    context = browser.new_context(
-        viewport={'width': 1920, 'height': 1080},
-        user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    )
+context_pool_key = pytest.StashKey[ContextPool]()
+shard_key = pytest.StashKey[Shard]()
+
+# Responses served from and missing in replay archives, across tests
+replay_stats = {"tests": 0, "served": 0, "missed": 0}
+
+# Requests aborted by the blocking profile, across tests
+blocking_stats = {"tests": 0, "blocked": 0, "allowed": 0, "saved_bytes": 0}
+
+# Retries and flaky passes in this session
+retry_ledger = RetryLedger()
+
+# Signed-in snapshots, shared by the workers through the state directory
+auth_states = StorageStateCache()
+
+# Visual baselines of the site under test; new ones are indexed at session end
+visual_baselines = VisualChecker()
+
+# Trace archives written for failed attempts in this session
+failure_traces = []
+
+# Setup + call + teardown time per test in this session; skipped tests are left out
+test_durations = {}
+skipped_tests = set()
+
+# Outcome, dependency fingerprint and (with --impact-record) calls per test
+impact_graph = DependencyGraph()
+impact_results = {}
+
+def _impact_fingerprint(nodeid: str) -> str:
+    """Fingerprint of a test's dependencies and of the site it runs against"""
+    # A green run on the stand-in or a replay says nothing about the live site
+    target = f"{current_target()}|replay={config.replay}"
+    return impact_graph.fingerprint(nodeid.split("::")[0], target=target)
+
+# Cookies every context starts with, to appear more legitimate
+SEED_COOKIES = [
+    {
+        "name": "session-id",
+        "value": "test-session",
+        "domain": ".amazon.com",
+        "path": "/"
+    }
+]
+
+def pytest_addoption(parser):
+    """Command line options for sharded runs"""
+    group = parser.getgroup("sharding")
+    group.addoption("--shard-index", type=int, default=config.shard_index,
+                    help="Index of the shard to run (0-based)")
+    group.addoption("--shard-count", type=int, default=config.shard_total,
+                    help="Total number of shards")
+    group.addoption("--shard-history", default=DEFAULT_HISTORY_PATH,
+                    help="JSON file with per-test durations from past runs")
+    group.addoption("--shard-report", default=None,
+                    help="Write this shard's durations to a file instead of updating the history")
+    group = parser.getgroup("impact", "change-impact selection")
+    group.addoption("--impact-base", default=None,
+                    help="Run only tests affected by changes since this git revision")
+    group.addoption("--impact-skip-green", action="store_true", default=False,
+                    help="Skip tests whose dependencies are unchanged since they last passed")
+    group.addoption("--impact-record", action="store_true", default=False,
+                    help="Record the project functions each test calls, for finer selection")
+    group.addoption("--impact-cache", default=DEFAULT_CACHE_PATH,
+                    help="JSON file with per-test outcomes, fingerprints and calls")
+
+def pytest_configure(config):
+    """Run on the BROWSER engine unless --browser names the engines"""
+    from src.config.config import config as test_config
+    browsers = getattr(config.option, "browser", None)
+    if browsers is None:
+        return
+    if not browsers:
+        config.option.browser = [test_config.browser_type]
+    elif len(browsers) == 1:
+        # Timings and traces are labelled with the engine that produced them
+        test_config.browser_type = browsers[0]
+
+@pytest.fixture(scope="session", autouse=True)
+def standin_server() -> Generator[Optional[StandInServer], None, None]:
+    """Point the suite at the local stand-in server when STANDIN=true"""
+    if not config.standin:
+        yield None
+        return
     
-    # Create new page
-    page = context.new_page()
+    server = StandInServer(StandInConfig(latency_ms=config.standin_latency_ms)).start()
+    original = config.base_url, config.auth_email, config.auth_password
+    config.base_url = server.url
+    if not config.auth_email:
+        config.auth_email, config.auth_password = server.settings.email, server.settings.password
+    logger.info(f"Running against the stand-in at {server.url}")
     
-    # Provide page to test
-    yield page
+    yield server
     
-    # Cleanup after test
-    page.close()
-    context.close()
-
-    # src/tests/conftest.py
-"""
-Enhanced pytest configuration with better fixtures
-"""
-
-import pytest
-from playwright.sync_api import Page, Browser, BrowserContext
-from typing import Generator
-from src.config.config import config
-from src.utils.logger import logger
-import os
+    config.base_url, config.auth_email, config.auth_password = original
+    server.stop()
 
 @pytest.fixture(scope="session")
 def browser_context_args():
     """Browser context configuration"""
-    return {
+    args = {
         "viewport": config.viewport,
         "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
         "ignore_https_errors": True,
     }
+    if config.replay:
+        # Service workers fetch outside of route interception
+        args["service_workers"] = "block"
+    return args
+
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser, browser_context_args, pytestconfig) -> Generator[ContextPool, None, None]:
+    """Warm contexts shared by every test in this worker"""
+    pool = ContextPool(browser, browser_context_args, cookies=SEED_COOKIES, size=config.context_pool_size)
+    pool.warm()
+    pytestconfig.stash[context_pool_key] = pool
+    
+    yield pool
+    pool.close()
 
 @pytest.fixture(scope="function")
-def context(browser: Browser, browser_context_args) -> Generator[BrowserContext, None, None]:
-    """Create browser context for each test"""
-    context = browser.new_context(**browser_context_args)
-    
-    # Add some basic cookies to appear more legitimate
-    context.add_cookies([
-        {
-            "name": "session-id", 
-            "value": "test-session",
-            "domain": ".amazon.com",
-            "path": "/"
-        }
-    ])
+def pooled_context(context_pool: ContextPool) -> Generator[PooledContext, None, None]:
+    """Lease a warm context for the duration of one test"""
+    pooled = context_pool.acquire()
+    yield pooled
+    context_pool.release(pooled)
+
+@pytest.fixture(scope="function")
+def context(pooled_context: PooledContext, request) -> Generator[BrowserContext, None, None]:
+    """Browser context for each test, with seed cookies, network replay and resource blocking in place"""
+    context = pooled_context.context
+    session = None
+    if config.replay:
+        session = ReplaySession(config.replay, archive_path(config.replay_dir, request.node.nodeid))
+        session.attach(context)
+    
+    # Routes run newest first, so blocked requests never reach replay
+    blocker = ResourceBlocker(get_profile(config.block_profile))
+    blocker.attach(context)
+    
+    yield context
     
+    blocker.detach(context)
+    stats = blocker.stats
+    blocking_stats["tests"] += 1
+    blocking_stats["blocked"] += stats.blocked_requests
+    blocking_stats["allowed"] += stats.allowed_requests
+    blocking_stats["saved_bytes"] += stats.saved_bytes
+    request.node.user_properties.append(("blocked_requests", stats.blocked_requests))
+    request.node.user_properties.append(("saved_bytes", stats.saved_bytes))
+    if stats.blocked_requests:
+        logger.info(f"Resource blocking {blocker.summary()}")
+    
+    if session is not None:
+        session.detach(context)
+        replay_stats["tests"] += 1
+        replay_stats["served"] += session.served
+        replay_stats["missed"] += len(session.missed)
+        if session.missed:
+            logger.warning(f"Replay had no recording for {len(session.missed)} requests, first: {session.missed[0]}")
+
+@pytest.fixture(scope="session")
+def auth_state(browser: Browser, browser_context_args) -> str:
+    """Storage state file of the configured identity, signing in at most once per TTL"""
+    if not config.auth_email:
+        pytest.skip("No identity configured; set AUTH_EMAIL and AUTH_PASSWORD")
+    
+    def sign_in(context: BrowserContext) -> None:
+        SignInPage(context.new_page()).goto().sign_in(config.auth_email, config.auth_password)
+    
+    return auth_states.get(browser, browser_context_args, config.auth_email, current_target(), sign_in)
+
+@pytest.fixture(scope="function")
+def logged_in_context(browser: Browser, browser_context_args, auth_state: str) -> Generator[BrowserContext, None, None]:
+    """Fresh context for each test, signed in from the cached storage state"""
+    context = auth_states.new_context(browser, browser_context_args, auth_state)
     yield context
     context.close()
 
 @pytest.fixture(scope="function")
-def page(context: BrowserContext) -> Generator[Page, None, None]:
-    """Create page for each test"""
-    page = context.new_page()
-    logger.info(f"Created new page for test")
+def logged_in_page(logged_in_context: BrowserContext) -> Page:
+    """Page of a signed-in context"""
+    return logged_in_context.new_page()
+
+@pytest.fixture(scope="function")
+def page(pooled_context: PooledContext, context: BrowserContext, request) -> Generator[Page, None, None]:
+    """Warm page for each test, with failure diagnostics per config.trace_mode"""
+    page = pooled_context.page
+    logger.info(f"Using pooled page (context use #{pooled_context.uses})")
+    recorder = None
+    if config.trace_mode == "ring":
+        recorder = FlightRecorder(config.trace_buffer_size, config.trace_dom_snapshots).attach(page)
+    elif config.trace_mode == "on":
+        context.tracing.start(screenshots=True, snapshots=True)
     
     yield page
     
     # Capture info on failure
-    if hasattr(page, "_test_failed") and page._test_failed:
-        screenshot_path = os.path.join(
-            "reports", "screenshots", 
-            f"failure_{page._test_name}.png"
-        )
-        page.screenshot(path=screenshot_path)
+    failed = getattr(page, "_test_failed", False)
+    page._test_failed = False
+    if failed and config.screenshot_on_failure:
+        screenshot_path = screenshots.capture(page, f"failure_{page._test_name}")
         logger.error(f"Test failed, screenshot saved: {screenshot_path}")
+    if recorder is not None:
+        recorder.detach(page)
+        if failed:
+            failure_traces.append(recorder.flush(trace_path(request.node.nodeid, suffix=".ring.zip"), "call failed"))
+    elif config.trace_mode == "on":
+        path = trace_path(request.node.nodeid, suffix=".trace.zip") if failed else None
+        context.tracing.stop(path=path)
+        if path:
+            failure_traces.append(path)
+
+@pytest.fixture(scope="function")
+def visual_check(page: Page, browser_name: str, request):
+    """
+    Assert that the page, or one element of it, still looks like its baseline
     
-    page.close()
+    Call with a capture name, optionally a locator to capture instead of
+    the viewport and locators to mask. Without a baseline the check is
+    skipped; VISUAL=update records one.
+    """
+    def check(name: str, target=None, mask=None) -> Optional[VisualResult]:
+        if config.visual == "off":
+            return None
+        png = (target or page).screenshot(mask=mask or [], animations="disabled", caret="hide")
+        viewport = page.viewport_size or config.viewport
+        key = baseline_key(request.node.nodeid, name, f"{viewport['width']}x{viewport['height']}", browser_name)
+        result = visual_baselines.check(png, key)
+        if result.status == "missing":
+            pytest.skip(f"No visual baseline for '{name}'; record one with VISUAL=update")
+        assert result.passed, result.describe()
+        return result
+    return check
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """
+    Run one test, retrying transient failures
+    
+    Timeouts and navigation errors are retried up to config.retry_count
+    times with exponential backoff. Between attempts only the function
+    scope is torn down, so the retry gets a warm pooled context from the
+    same browser. Only the final attempt is reported.
+    """
+    # Attribute page-object steps and log records to the running test
+    profiler.current_test = perf.current_test = item.nodeid
+    set_current_test(item.nodeid)
+    retries = 0 if item.get_closest_marker("no_retry") else config.retry_count
+    recorder = CallRecorder() if item.config.getoption("impact_record") else None
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    
+    for attempt in range(retries + 1):
+        item._failure_class = None
+        can_retry = attempt < retries
+        if recorder is not None:
+            recorder.start()
+        reports = runtestprotocol(item, nextitem=item.parent if can_retry else nextitem, log=False)
+        if recorder is not None:
+            recorder.stop()
+        failure_class = item._failure_class
+        
+        if can_retry and failure_class in TRANSIENT:
+            retry_ledger.record_retry(item.nodeid, failure_class)
+            delay = backoff_delay(attempt, config.retry_backoff)
+            logger.warning(
+                f"Retrying {item.nodeid} after {failure_class} failure "
+                f"(attempt {attempt + 2}/{retries + 1}) in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            continue
+        
+        if can_retry:
+            # Finish the teardown that was held back for a possible retry
+            item.session._setupstate.teardown_exact(nextitem)
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        failed = any(report.failed for report in reports)
+        retry_ledger.record_result(item.nodeid, attempt + 1, failed, failure_class)
+        break
+    
+    calls = recorder.calls if recorder is not None else None
+    skipped = any(report.skipped for report in reports)
+    impact_results[item.nodeid] = {
+        "outcome": "failed" if failed else "skipped" if skipped else "passed",
+        "fingerprint": _impact_fingerprint(item.nodeid),
+        "calls": sorted(calls) if calls is not None else None,
+    }
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    profiler.current_test = "<no test>"
+    perf.current_test = ""
+    set_current_test("")
+    return True
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """Mark test failure status"""
+    """Mark test failure status and classify the first failure"""
     outcome = yield
     rep = outcome.get_result()
     
+    if rep.failed and call.excinfo is not None and getattr(item, "_failure_class", None) is None:
+        item._failure_class = classify_failure(call.excinfo.value)
+    
     if rep.when == "call" and rep.failed:
         if "page" in item.fixturenames:
             page = item.funcargs["page"]
             page._test_failed = True
-            page._test_name = item.name
\ No newline at end of file
+            page._test_name = item.name
+
+def pytest_terminal_summary(terminalreporter):
+    """Report context pool effectiveness at session end"""
+    pool = terminalreporter.config.stash.get(context_pool_key, None)
+    if pool is not None:
+        terminalreporter.write_sep("-", "context pool")
+        terminalreporter.write_line(pool.summary())
+    if auth_states.stats.contexts:
+        terminalreporter.write_sep("-", "signed-in sessions")
+        terminalreporter.write_line(auth_states.summary())
+    if profiler.stats:
+        terminalreporter.write_sep("-", "slowest page-object steps (self time)")
+        for name, stats in profiler.top_steps():
+            terminalreporter.write_line(
+                f"{stats.self_time:8.2f}s self {stats.total:8.2f}s total {stats.count:6d}x  {name}"
+            )
+        terminalreporter.write_line(f"collapsed stacks: {profiler.write_folded()}")
+    readiness = timing_report()
+    if readiness:
+        terminalreporter.write_sep("-", "readiness conditions")
+        for line in readiness:
+            terminalreporter.write_line(line)
+    flaky = retry_ledger.flaky_tests()
+    if flaky:
+        terminalreporter.write_sep("-", "retried tests")
+        for nodeid, entry in flaky.items():
+            outcome = "failed" if entry["failures"] else "passed on retry"
+            classes = ", ".join(f"{name}={count}" for name, count in entry["classes"].items())
+            terminalreporter.write_line(f"{nodeid}: {entry['retries']} retries ({classes}), {outcome}")
+    selector_lines = selectors.report_lines()
+    if selector_lines:
+        terminalreporter.write_sep("-", "fallback selector hit rates")
+        for line in selector_lines:
+            terminalreporter.write_line(line)
+    if failure_traces:
+        terminalreporter.write_sep("-", f"failure traces ({config.trace_mode})")
+        for path in failure_traces:
+            terminalreporter.write_line(path)
+    if visual_baselines.stats["checks"]:
+        terminalreporter.write_sep("-", "visual baselines")
+        terminalreporter.write_line(visual_baselines.summary())
+    if screenshots.stats["captured"]:
+        terminalreporter.write_sep("-", "screenshots")
+        terminalreporter.write_line(screenshots.summary())
+    if blocking_stats["blocked"]:
+        terminalreporter.write_sep("-", f"resource blocking ({config.block_profile})")
+        terminalreporter.write_line(
+            f"{blocking_stats['tests']} tests, blocked {blocking_stats['blocked']} of "
+            f"{blocking_stats['blocked'] + blocking_stats['allowed']} requests, "
+            f"~{blocking_stats['saved_bytes'] / 1024 / 1024:.1f} MB saved (estimated from observed sizes)"
+        )
+    if replay_stats["tests"]:
+        terminalreporter.write_sep("-", f"network replay ({config.replay})")
+        terminalreporter.write_line(
+            f"{replay_stats['tests']} tests, {replay_stats['served']} responses served, "
+            f"{replay_stats['missed']} without a recording"
+        )
+
+
+def _deselect(config, items, keep, reason: str) -> None:
+    deselected = [item for item in items if item.nodeid not in keep]
+    if deselected:
+        items[:] = [item for item in items if item.nodeid in keep]
+        config.hook.pytest_deselected(items=deselected)
+        logger.info(f"Deselected {len(deselected)} tests {reason}, {len(items)} left")
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Keep only the tests affected by recent changes, then only the tests
+    planned for this shard, after -k/-m filtering
+    """
+    base = config.getoption("impact_base")
+    if base:
+        selector = ImpactSelector.from_diff(base, cache_path=config.getoption("impact_cache"), graph=impact_graph)
+        keep = set(selector.select({item.nodeid: item.nodeid.split("::")[0] for item in items}))
+        _deselect(config, items, keep, f"unaffected by changes since {base}")
+    if config.getoption("impact_skip_green"):
+        cache = ImpactCache(config.getoption("impact_cache"))
+        keep = {
+            item.nodeid for item in items
+            if not cache.is_green(item.nodeid, _impact_fingerprint(item.nodeid))
+        }
+        _deselect(config, items, keep, "green with unchanged dependencies")
+    
+    count = config.getoption("shard_count")
+    if count <= 1:
+        return
+    
+    history = DurationHistory.load(config.getoption("shard_history"))
+    shard = plan_shards([item.nodeid for item in items], history, count)[config.getoption("shard_index")]
+    _deselect(config, items, set(shard.nodeids), f"outside shard {shard.index + 1}")
+    config.stash[shard_key] = shard
+    logger.info(f"Shard {shard.index + 1}/{count}: {len(items)} tests, predicted {shard.load:.1f}s")
+
+def pytest_runtest_logreport(report):
+    """Accumulate durations for the shard history"""
+    test_durations[report.nodeid] = test_durations.get(report.nodeid, 0.0) + report.duration
+    if report.skipped:
+        skipped_tests.add(report.nodeid)
+
+def _collect_perf_samples(durations) -> None:
+    """Add passing tests' durations and per-test step totals to the performance samples"""
+    for nodeid, duration in durations.items():
+        if impact_results.get(nodeid, {}).get("outcome") == "passed":
+            perf.record(TEST, nodeid, duration, test=nodeid)
+    steps = {}
+    for key, stats in profiler.stats.items():
+        steps[key[0], key[-1]] = steps.get((key[0], key[-1]), 0.0) + stats.total
+    for (nodeid, step), seconds in sorted(steps.items()):
+        perf.record(STEP, step, seconds, test=nodeid)
+
+def pytest_sessionfinish(session):
+    """Persist durations, the retry ledger, selector stats, impact results, timings and visual baselines, and flush queued screenshots and log records"""
+    screenshots.flush()
+    flush_logs()
+    durations = {
+        nodeid: duration for nodeid, duration in test_durations.items()
+        if nodeid not in skipped_tests
+    }
+    _collect_perf_samples(durations)
+    report_path = session.config.getoption("shard_report")
+    if report_path:
+        shard = session.config.stash.get(shard_key, None)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "index": shard.index if shard else 0,
+                "predicted": shard.load if shard else 0.0,
+                "tests": durations,
+                "retries": retry_ledger.session,
+                "selectors": selectors.session,
+                "impact": impact_results,
+                "perf": perf.samples,
+                "visual": visual_baselines.session,
+            }, f, indent=2)
+    else:
+        if durations:
+            history = DurationHistory.load(session.config.getoption("shard_history"))
+            history.update(durations)
+            history.save()
+        RetryLedger.merge_into(DEFAULT_LEDGER_PATH, retry_ledger.session)
+        selectors.save()
+        ImpactCache.merge_into(session.config.getoption("impact_cache"), impact_results)
+        VisualIndex.merge_into(visual_baselines.index_path, visual_baselines.session)
+        if perf.enabled and perf.samples:
+            with PerfDatabase(config.perf_db) as db:
+                db.add_run(perf.samples, run_id)
@@ -0,0 +1,40 @@
+import inspect
+import pytest
+from src.pages import base_page, home_page, search_results_page
+from src.pages.aio import base_page as aio_base_page, home_page as aio_home_page, search_results_page as aio_search_results_page
+
+PAIRS = [
+    (base_page.BasePage, aio_base_page.BasePage),
+    (home_page.HomePage, aio_home_page.HomePage),
+    (search_results_page.SearchResultsPage, aio_search_results_page.SearchResultsPage),
+]
+
+
+def public_methods(cls):
+    return {name: member for name, member in inspect.getmembers(cls, callable) if not name.startswith("_")}
+
+
+def parameters(method):
+    return list(inspect.signature(inspect.unwrap(method)).parameters)
+
+
+class TestAsyncPageParity:
+    """The async page objects offer the sync ones' methods, awaited"""
+    
+    @pytest.mark.parametrize("sync_class, async_class", PAIRS, ids=[pair[0].__name__ for pair in PAIRS])
+    def test_same_public_methods_and_parameters(self, sync_class, async_class):
+        sync_methods = public_methods(sync_class)
+        async_methods = public_methods(async_class)
+        
+        assert sorted(async_methods) == sorted(sync_methods)
+        for name, method in sync_methods.items():
+            assert parameters(async_methods[name]) == parameters(method), name
+    
+    def test_browser_calls_are_coroutines(self):
+        methods = public_methods(aio_search_results_page.SearchResultsPage)
+        
+        for name in ("navigate", "goto", "get_products", "save_snapshot", "collect_products"):
+            assert inspect.iscoroutinefunction(inspect.unwrap(methods[name])), name
+        assert inspect.isasyncgenfunction(methods["iter_products"])
+        # Shared with the sync page object, no browser involved
+        assert methods["results_url"] is search_results_page.SearchResultsPage.results_url
@@ -0,0 +1,167 @@
+import json
+import os
+from src.config.config import config
+from src.pages.home_page import HomePage
+from src.pages.signin_page import SignInPage
+from src.utils.auth_state import StorageStateCache
+from src.utils.perf_db import current_target
+
+TARGET = "standin"
+
+
+class FakeContext:
+    def __init__(self, storage_state=None):
+        self.storage = storage_state
+        self.cookies = []
+        self.closed = False
+    
+    def storage_state(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"cookies": self.cookies, "origins": []}, f)
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+    
+    def new_context(self, **kwargs):
+        context = FakeContext(kwargs.get("storage_state"))
+        self.contexts.append(context)
+        return context
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+        self.first = self
+    
+    def wait_for(self, state, timeout):
+        pass
+    
+    def is_visible(self):
+        return False
+    
+    def fill(self, text):
+        self.page.filled[self.selector] = text
+    
+    def scroll_into_view_if_needed(self):
+        pass
+    
+    def click(self):
+        self.page.url = "http://127.0.0.1:8000/"
+
+
+class FakeSignInTab:
+    def __init__(self):
+        self.url = "http://127.0.0.1:8000/ap/signin"
+        self.filled = {}
+        self.waits = []
+    
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+    
+    def wait_for_function(self, expression, arg=None, timeout=None):
+        self.waits.append(arg)
+
+
+def sign_in(context):
+    context.cookies.append({"name": "standin-user", "value": "standin", "domain": "127.0.0.1", "path": "/"})
+
+
+class TestStorageStateCache:
+    """Signing in once per TTL and reusing the snapshot"""
+    
+    def test_signs_in_once_within_ttl(self, tmp_path):
+        cache = StorageStateCache(str(tmp_path), ttl=3600)
+        browser = FakeBrowser()
+        
+        first = cache.get(browser, {}, "standin@example.com", TARGET, sign_in)
+        second = cache.get(browser, {}, "standin@example.com", TARGET, sign_in)
+        
+        assert first == second
+        assert cache.stats.sign_ins == 1 and cache.stats.reuses == 1
+        assert browser.contexts[0].closed
+        with open(first, encoding="utf-8") as f:
+            assert json.load(f)["cookies"][0]["name"] == "standin-user"
+        assert not [name for name in os.listdir(tmp_path) if ".tmp" in name]
+    
+    def test_expired_snapshot_signs_in_again(self, tmp_path):
+        cache = StorageStateCache(str(tmp_path), ttl=3600)
+        browser = FakeBrowser()
+        path = cache.get(browser, {}, "standin@example.com", TARGET, sign_in)
+        hour_ago = os.path.getmtime(path) - 3601
+        os.utime(path, (hour_ago, hour_ago))
+        
+        assert not cache.is_fresh(path)
+        cache.get(browser, {}, "standin@example.com", TARGET, sign_in)
+        assert cache.stats.sign_ins == 2
+    
+    def test_identities_and_sites_get_separate_snapshots(self, tmp_path):
+        cache = StorageStateCache(str(tmp_path))
+        paths = {
+            cache.path("standin@example.com", TARGET),
+            cache.path("other@example.com", TARGET),
+            cache.path("standin@example.com", "www.amazon.com"),
+        }
+        assert len(paths) == 3
+    
+    def test_snapshot_outlives_the_stand_in_port(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "standin", True)
+        cache = StorageStateCache(str(tmp_path))
+        browser = FakeBrowser()
+        for port in (8000, 8001):
+            monkeypatch.setattr(config, "base_url", f"http://127.0.0.1:{port}")
+            cache.get(browser, {}, "standin@example.com", current_target(), sign_in)
+        
+        assert cache.stats.sign_ins == 1 and cache.stats.reuses == 1
+    
+    def test_saving_prunes_expired_snapshots(self, tmp_path):
+        cache = StorageStateCache(str(tmp_path), ttl=3600)
+        browser = FakeBrowser()
+        stale = cache.get(browser, {}, "old@example.com", TARGET, sign_in)
+        leftover = tmp_path / "standin_0123456789.json.tmp4242"
+        leftover.write_text("{}")
+        hour_ago = os.path.getmtime(stale) - 3601
+        for path in (stale, leftover):
+            os.utime(path, (hour_ago, hour_ago))
+        
+        fresh = cache.get(browser, {}, "standin@example.com", TARGET, sign_in)
+        
+        assert os.listdir(tmp_path) == [os.path.basename(fresh)]
+    
+    def test_contexts_start_from_snapshot(self, tmp_path):
+        cache = StorageStateCache(str(tmp_path))
+        browser = FakeBrowser()
+        path = cache.get(browser, {}, "standin@example.com", TARGET, sign_in)
+        
+        context = cache.new_context(browser, {"viewport": None}, path)
+        assert context.storage == path
+        assert cache.stats.contexts == 1
+        
+        cache.invalidate("standin@example.com", TARGET)
+        assert cache.age(path) is None
+
+
+class TestSignInPage:
+    """Submitting the sign-in form"""
+    
+    def test_password_is_filled_but_never_logged(self, caplog):
+        tab = FakeSignInTab()
+        
+        with caplog.at_level("DEBUG"):
+            SignInPage(tab).sign_in("standin@example.com", "hunter2-secret")
+        
+        assert tab.filled[SignInPage.PASSWORD] == "hunter2-secret"
+        assert tab.waits == [SignInPage.ERROR]
+        assert "standin@example.com" in caplog.text
+        assert "hunter2-secret" not in caplog.text
+
+
+def test_signed_in_homepage(logged_in_page):
+    """Contexts built from the cached storage state start signed in"""
+    home = HomePage(logged_in_page).goto()
+    assert home.is_logged_in()
@@ -0,0 +1,166 @@
+from urllib.parse import urlsplit
+from src.utils.context_pool import CLEAR_STORAGE_JS, ContextPool
+
+
+class FakeFrame:
+    def __init__(self, url):
+        self.url = url
+        self.parent_frame = None
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+        self.url = "about:blank"
+        self.urls = []
+        self.routes = []
+        self.handlers = []
+        
+    def is_closed(self):
+        return self.closed
+        
+    def close(self):
+        self.closed = True
+        
+    def on(self, event, handler):
+        if event == "framenavigated":
+            self.handlers.append(handler)
+            
+    def route(self, pattern, handler):
+        self.routes.append(pattern)
+        
+    def unroute(self, pattern):
+        self.routes.remove(pattern)
+        
+    def evaluate(self, expression):
+        # Stands in for localStorage and IndexedDB, kept per origin
+        parts = urlsplit(self.url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if expression == CLEAR_STORAGE_JS:
+            self.context.storage.pop(origin, None)
+        else:
+            self.context.storage.setdefault(origin, []).append(expression)
+            
+    def goto(self, url):
+        self.url = url
+        self.urls.append(url)
+        for handler in self.handlers:
+            handler(FakeFrame(url))
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.cookies = []
+        self.storage = {}
+        self.handlers = []
+        self.closed = False
+        
+    def on(self, event, handler):
+        if event == "page":
+            self.handlers.append(handler)
+            
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        for handler in self.handlers:
+            handler(page)
+        return page
+        
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+        
+    def clear_cookies(self):
+        self.cookies = []
+        
+    def clear_permissions(self):
+        pass
+        
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        
+    def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+COOKIES = [{"name": "session-id", "value": "test-session", "domain": ".amazon.com", "path": "/"}]
+
+
+class TestContextPool:
+    """Warm context reuse and reset"""
+    
+    def test_warm_contexts_are_reused(self):
+        browser = FakeBrowser()
+        pool = ContextPool(browser, {}, cookies=COOKIES, size=2)
+        pool.warm()
+        
+        for _ in range(5):
+            pooled = pool.acquire()
+            pool.release(pooled)
+            
+        assert len(browser.contexts) == 2
+        assert pool.stats.hits == 5
+        assert pool.stats.misses == 0
+        
+    def test_release_reseeds_cookies_and_drops_extra_pages(self):
+        pool = ContextPool(FakeBrowser(), {}, cookies=COOKIES, size=1)
+        pool.warm()
+        pooled = pool.acquire()
+        pooled.context.add_cookies([{"name": "cart", "value": "1"}])
+        popup = pooled.context.new_page()
+        
+        pool.release(pooled)
+        
+        assert pooled.context.cookies == COOKIES
+        assert popup.closed
+        assert pooled.page.urls == ["about:blank"]
+        
+    def test_overflow_is_a_miss_and_gets_closed(self):
+        pool = ContextPool(FakeBrowser(), {}, size=1)
+        pool.warm()
+        first = pool.acquire()
+        second = pool.acquire()
+        
+        pool.release(first)
+        pool.release(second)
+        
+        assert pool.stats.misses == 1
+        assert pool.stats.discarded == 1
+        assert second.context.closed
+        
+    def test_closed_page_is_replaced_on_reset(self):
+        pool = ContextPool(FakeBrowser(), {}, size=1)
+        pool.warm()
+        pooled = pool.acquire()
+        original = pooled.page
+        original.close()
+        
+        pool.release(pooled)
+        
+        assert pooled.page is not original
+        assert not pooled.page.closed
+        
+    def test_reset_clears_storage_of_every_visited_origin(self):
+        pool = ContextPool(FakeBrowser(), {}, size=1)
+        pool.warm()
+        pooled = pool.acquire()
+        pooled.page.goto("https://www.amazon.com/s?k=laptop")
+        pooled.page.evaluate("localStorage.setItem('recent', 'laptop')")
+        popup = pooled.context.new_page()
+        popup.goto("https://auth.example.com/signin")
+        popup.evaluate("indexedDB.open('session')")
+        
+        pool.release(pooled)
+        
+        assert pooled.context.storage == {}
+        assert pooled.page.urls[-2:] == ["https://auth.example.com/__context_pool_reset__", "about:blank"]
+        assert pooled.page.routes == []
+        assert pooled.origins == set()
@@ -0,0 +1,89 @@
+import pytest
+from src.config.config import config
+from src.pages.search_results_page import CrawlProgress, SearchResultsPage
+from src.standin.server import StandInConfig, StandInServer
+
+
+@pytest.fixture(scope="module")
+def standin():
+    with StandInServer(StandInConfig(page_size=5, pages=3)) as server:
+        yield server
+
+
+class TestCrawlProgress:
+    """Counting shared by the sync and async iter_products"""
+    
+    def test_limit_stops_prefetch_and_iteration(self):
+        progress = CrawlProgress(limit=7)
+        page = [progress.number({'index': i + 1}) for i in range(5)]
+        
+        assert [p['index'] for p in page] == [1, 2, 3, 4, 5]
+        assert progress.remaining == 2
+        assert progress.wants_next("/s?page=2", 1)
+        assert not progress.wants_next("/s?page=2", 2)
+        assert not progress.finished("/s?page=2")
+        assert progress.finished(None)
+        
+    def test_unlimited_runs_until_the_last_page(self):
+        progress = CrawlProgress()
+        progress.number({})
+        
+        assert progress.remaining is None
+        assert progress.wants_next("/s?page=2", 100)
+        assert not progress.finished("/s?page=2")
+
+
+class TestIterProducts:
+    """Streaming products across result pages"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, page, standin, monkeypatch):
+        """Point the page object at the stand-in"""
+        monkeypatch.setattr(config, "base_url", standin.url)
+        self.page = page
+        self.search_results = SearchResultsPage(page)
+        
+    def test_streams_every_page_with_running_index(self):
+        products = list(self.search_results.iter_products("laptop"))
+        
+        assert [p['index'] for p in products] == list(range(1, 16))
+        assert all(p['title'] for p in products)
+        assert len(self.page.context.pages) == 1, "Prefetch tab should be closed"
+        
+    def test_stops_loading_when_consumer_stops(self, standin):
+        stream = self.search_results.iter_products("laptop")
+        first = next(stream)
+        served = standin.requests_served
+        stream.close()
+        
+        assert first['index'] == 1
+        assert standin.requests_served <= served + 1
+        assert len(self.page.context.pages) == 1
+        
+    def test_leaves_the_page_on_the_last_page_read(self):
+        stream = self.search_results.iter_products("laptop")
+        for _ in range(6):
+            next(stream)
+        stream.close()
+        
+        assert "page=2" in self.page.url
+        assert len(self.page.context.pages) == 1
+        
+        list(self.search_results.iter_products("laptop"))
+        assert "page=3" in self.page.url
+        assert self.search_results.has_results()
+        
+    def test_limit_without_prefetch_matches_prefetch(self):
+        with_prefetch = list(self.search_results.iter_products("monitor", limit=7))
+        without = list(self.search_results.iter_products("monitor", limit=7, prefetch=False))
+        
+        assert len(with_prefetch) == 7
+        assert with_prefetch == without
+        
+    def test_collects_into_product_table(self):
+        table = self.search_results.collect_products("tablet", limit=12)
+        
+        assert len(table) == 12
+        assert list(table.index) == list(range(1, 13))
+        assert set(table.query) == {"tablet"}
+        assert table.price_stats()['count'] + table.price_stats()['missing'] == 12
@@ -0,0 +1,61 @@
+from src.config.config import config
+from src.runner.fanout_runner import EngineResult, FanoutReport, diff_results, run_fanout
+from src.standin.server import StandInConfig, StandInServer
+
+
+def product(title, price=19.99, rating=4.5, is_prime=True):
+    return {"title": title, "price": price, "rating": rating, "is_prime": is_prime}
+
+
+class TestEngineDiff:
+    """Results of each engine against the reference engine"""
+    
+    def test_same_products_match_regardless_of_order_and_whitespace(self):
+        diffs = diff_results([
+            EngineResult("chromium", has_results=True, products=[product("Laptop A"), product("Laptop B")]),
+            EngineResult("firefox", has_results=True, products=[product("Laptop  B"), product("laptop a")]),
+        ])
+        
+        assert [(d.engine, d.reference, d.matches) for d in diffs] == [("firefox", "chromium", True)]
+    
+    def test_missing_extra_and_changed_products_are_reported(self):
+        diffs = diff_results([
+            EngineResult("chromium", has_results=True, products=[product("Laptop A"), product("Laptop B")]),
+            EngineResult("webkit", has_results=True, products=[product("Laptop A", price=None), product("Laptop C")]),
+        ])
+        
+        diff = diffs[0]
+        assert diff.missing == ["laptop b"]
+        assert diff.extra == ["laptop c"]
+        assert diff.changed == ["laptop a: price 19.99 -> None"]
+    
+    def test_failed_engines_are_left_out_and_reference_can_be_chosen(self):
+        results = [
+            EngineResult("chromium", error="TimeoutError: page.goto"),
+            EngineResult("firefox", has_results=True, products=[product("Laptop A")]),
+            EngineResult("webkit", has_results=False),
+        ]
+        
+        diffs = diff_results(results, reference="webkit")
+        assert [(d.engine, d.reference) for d in diffs] == [("firefox", "webkit")]
+        assert diffs[0].changed == ["has_results: False -> True"]
+        assert diffs[0].extra == ["laptop a"]
+        assert diff_results(results[:1]) == []
+    
+    def test_serial_estimate_sums_engine_times(self):
+        report = FanoutReport("laptop", [EngineResult("chromium", 2.0), EngineResult("firefox", 3.0)], wall=3.2)
+        
+        assert report.serial == 5.0
+        assert [r.engine for r in report.failures] == []
+
+
+def test_fanout_against_standin(monkeypatch):
+    """Each engine runs in its own process and extracts the same products"""
+    with StandInServer(StandInConfig(page_size=5)) as server:
+        monkeypatch.setattr(config, "base_url", server.url)
+        report = run_fanout("laptop", ["chromium", "chromium"], max_products=3)
+    
+    assert not report.failures, report.failures[0].error
+    assert [len(r.products) for r in report.results] == [3, 3]
+    assert "HomePage.goto" in report.results[0].steps
+    assert all(d.matches for d in diff_results(report.results))
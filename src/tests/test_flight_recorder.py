@@ -0,0 +1,106 @@
+import json
+import zipfile
+from types import SimpleNamespace
+from src.utils.flight_recorder import FlightRecorder, trace_path
+from src.utils.timing import profiler, timed
+
+
+class FakePage:
+    def __init__(self):
+        self.listeners = {}
+        self.url = "about:blank"
+        self.html = "<html></html>"
+        self.content_calls = 0
+        self.main_frame = SimpleNamespace(parent_frame=None, url="")
+    
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+    
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+    
+    def emit(self, event, payload):
+        for handler in self.listeners.get(event, []):
+            handler(payload)
+    
+    def goto(self, url):
+        self.url = self.main_frame.url = url
+        self.html = f"<html><body>{url}</body></html>"
+        self.emit("request", SimpleNamespace(method="GET", url=url))
+        self.emit("response", SimpleNamespace(status=200, url=url))
+        self.emit("framenavigated", self.main_frame)
+    
+    def content(self):
+        self.content_calls += 1
+        return self.html
+    
+    def is_closed(self):
+        return False
+
+
+class Steps:
+    @timed
+    def click(self):
+        pass
+
+
+class TestFlightRecorder:
+    """Rolling window of page activity, written only on demand"""
+    
+    def test_window_keeps_the_latest_events(self):
+        page = FakePage()
+        recorder = FlightRecorder(size=5).attach(page)
+        for number in range(4):
+            page.goto(f"http://127.0.0.1/{number}")
+        recorder.detach(page)
+        
+        assert len(recorder.events) == 5
+        assert recorder.dropped == 7
+        assert recorder.events[-1][1:] == ("navigation", "http://127.0.0.1/3")
+        assert not any(page.listeners.values())
+    
+    def test_actions_snapshot_each_document_once(self):
+        page = FakePage()
+        recorder = FlightRecorder(dom_snapshots=2).attach(page)
+        try:
+            for number in range(3):
+                page.goto(f"http://127.0.0.1/{number}")
+                Steps().click()
+                Steps().click()
+        finally:
+            recorder.detach(page)
+        
+        assert profiler.observer is None
+        assert page.content_calls == 3
+        assert [url for _, url, _ in recorder.snapshots] == ["http://127.0.0.1/1", "http://127.0.0.1/2"]
+        assert sum(1 for event in recorder.events if event[1] == "action") == 6
+    
+    def test_passing_tests_read_no_html_by_default(self):
+        page = FakePage()
+        recorder = FlightRecorder().attach(page)
+        for number in range(3):
+            page.goto(f"http://127.0.0.1/{number}")
+            Steps().click()
+        recorder.detach(page)
+        
+        assert page.content_calls == 0
+        assert len(recorder.snapshots) == 0
+    
+    def test_flush_writes_archive(self, tmp_path):
+        page = FakePage()
+        recorder = FlightRecorder().attach(page)
+        page.goto("http://127.0.0.1/s?k=laptop")
+        page.emit("console", SimpleNamespace(type="error", text="boom"))
+        recorder.detach(page)
+        
+        path = recorder.flush(trace_path("src/tests/test_x.py::test_y[chromium]", str(tmp_path)), "call failed")
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read("manifest.json"))
+            events = [json.loads(line) for line in archive.read("events.jsonl").decode().splitlines()]
+            html = archive.read(manifest["snapshots"][-1]["file"]).decode()
+        
+        assert manifest["reason"] == "call failed" and manifest["events"] == 4
+        assert events[-1]["kind"] == "console.error"
+        assert "s?k=laptop" in html
+        assert page.content_calls == 1 and len(manifest["snapshots"]) == 1
+        assert "test_x.py_test_y[chromium]" in path
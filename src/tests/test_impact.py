@@ -0,0 +1,257 @@
+import subprocess
+import textwrap
+from src.pages import search_results_page
+from src.pages.home_page import HomePage
+from src.pages.search_results_page import SearchResultsLogic
+from src.utils import impact
+from src.utils.impact import (
+    MODULE, CallRecorder, DependencyGraph, ImpactCache, ImpactSelector, _method_qualname, changed_lines, changed_symbols
+)
+from src.utils.query_matrix import QueryCase
+
+FILES = {
+    "src/__init__.py": "",
+    "src/config/config.py": """
+        class TestConfig:
+            timeout: int = 30
+            browser_type: str = "chromium"
+            query_matrix: str = "data/matrix.csv"
+        config = TestConfig()
+    """,
+    "src/pages/page.py": """
+        from src.config.config import config
+        
+        class Page:
+            SEARCH_BOX = "#search"
+            
+            def search(self):
+                return config.timeout
+            
+            def sort(self):
+                return "price"
+            
+            def matrix(self):
+                return config.query_matrix
+    """,
+    "src/tests/test_search.py": """
+        from src.pages.page import Page
+        
+        def test_search():
+            assert Page().search()
+    """,
+    "src/tests/test_other.py": """
+        def test_other():
+            assert True
+    """,
+    "src/tests/test_saved.py": """
+        FIXTURE = "fixtures/results.html"
+        
+        def test_saved():
+            assert FIXTURE
+    """,
+    "src/tests/conftest.py": "",
+    "src/tests/fixtures/results.html": "<html></html>",
+    "data/matrix.csv": "term\nlaptop\n",
+    "pytest.ini": "[pytest]\n",
+}
+
+# Config field -> data file, as conftest reads them from config
+DATA = {"query_matrix": "data/matrix.csv"}
+
+
+def write_project(root):
+    for path, content in FILES.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(textwrap.dedent(content).lstrip())
+
+
+def git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+def make_selector(root, changes, calls=None):
+    cache = ImpactCache(str(root / "impact.json"))
+    if calls is not None:
+        cache.tests["src/tests/test_search.py::test_search"] = {"calls": calls}
+    return ImpactSelector(DependencyGraph(str(root)), cache, changes)
+
+
+TESTS = {
+    "src/tests/test_search.py::test_search": "src/tests/test_search.py",
+    "src/tests/test_other.py::test_other": "src/tests/test_other.py",
+}
+
+
+class TestDependencyGraph:
+    """Import closure and config reads"""
+    
+    def test_closure_follows_project_imports(self, tmp_path):
+        write_project(tmp_path)
+        graph = DependencyGraph(str(tmp_path))
+        assert graph.closure("src/tests/test_search.py") == {
+            "src/tests/test_search.py", "src/pages/page.py", "src/config/config.py"
+        }
+        assert graph.closure("src/tests/test_other.py") == {"src/tests/test_other.py"}
+        fields = graph.config_fields("src/tests/test_search.py")
+        assert "timeout" in fields and "browser_type" not in fields
+    
+    def test_fingerprint_changes_with_dependencies(self, tmp_path):
+        write_project(tmp_path)
+        before = DependencyGraph(str(tmp_path)).fingerprint("src/tests/test_search.py")
+        (tmp_path / "src/pages/page.py").write_text("# edited\n")
+        assert DependencyGraph(str(tmp_path)).fingerprint("src/tests/test_search.py") != before
+    
+    def test_suite_files_and_data_files(self, tmp_path):
+        write_project(tmp_path)
+        graph = DependencyGraph(str(tmp_path), data=DATA)
+        assert graph.suite_files("src/tests/test_other.py") == {"src/tests/conftest.py", "pytest.ini"}
+        assert graph.data_files("src/tests/test_search.py") == {"data/matrix.csv"}
+        assert graph.data_files("src/tests/test_saved.py") == {"src/tests/fixtures/results.html"}
+        assert graph.data_files("src/tests/test_other.py") == set()
+
+
+class TestChangedSymbols:
+    """Mapping changed lines to the code that owns them"""
+    
+    def test_methods_fields_and_module(self, tmp_path):
+        write_project(tmp_path)
+        assert changed_symbols("src/pages/page.py", {7}, str(tmp_path)) == {"Page.search"}
+        assert changed_symbols("src/pages/page.py", {4}, str(tmp_path)) == {MODULE}
+        assert changed_symbols("src/config/config.py", {3}, str(tmp_path)) == {"config.browser_type"}
+        assert changed_symbols("src/pages/page.py", set(), str(tmp_path)) == {MODULE}
+    
+    def test_changed_lines_from_git(self, tmp_path):
+        write_project(tmp_path)
+        git(tmp_path, "init", "-q")
+        git(tmp_path, "add", ".")
+        git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "base")
+        page = tmp_path / "src/pages/page.py"
+        page.write_text(page.read_text().replace('"price"', '"rating"'))
+        (tmp_path / "src/pages/new.py").write_text("")
+        
+        assert changed_lines("HEAD", str(tmp_path)) == {"src/pages/page.py": {10}, "src/pages/new.py": set()}
+
+
+class TestImpactSelector:
+    """Which tests a change selects"""
+    
+    def test_module_change_selects_importers_only(self, tmp_path):
+        write_project(tmp_path)
+        selector = make_selector(tmp_path, {"src/pages/page.py": {MODULE}})
+        assert selector.select(TESTS) == ["src/tests/test_search.py::test_search"]
+    
+    def test_method_change_uses_recorded_calls(self, tmp_path):
+        write_project(tmp_path)
+        changes = {"src/pages/page.py": {"Page.sort"}}
+        assert make_selector(tmp_path, changes).select(TESTS) == ["src/tests/test_search.py::test_search"]
+        assert make_selector(tmp_path, changes, calls=["src/pages/page.py::Page.search"]).select(TESTS) == []
+        assert make_selector(tmp_path, changes, calls=["src/pages/page.py::Page.sort"]).select(TESTS)
+    
+    def test_config_field_selects_readers_only(self, tmp_path):
+        write_project(tmp_path)
+        assert make_selector(tmp_path, {"src/config/config.py": {"config.browser_type"}}).select(TESTS) == []
+        assert make_selector(tmp_path, {"src/config/config.py": {"config.timeout"}}).select(TESTS)
+    
+    def test_global_file_selects_everything(self, tmp_path):
+        write_project(tmp_path)
+        assert make_selector(tmp_path, {"src/tests/conftest.py": {MODULE}}).select(TESTS) == list(TESTS)
+    
+    def test_data_files_select_their_readers(self, tmp_path):
+        write_project(tmp_path)
+        tests = dict(TESTS, **{"src/tests/test_saved.py::test_saved": "src/tests/test_saved.py"})
+        
+        def select(path):
+            graph = DependencyGraph(str(tmp_path), data=DATA)
+            return ImpactSelector(graph, ImpactCache(str(tmp_path / "impact.json")), {path: {MODULE}}).select(tests)
+        
+        assert select("data/matrix.csv") == ["src/tests/test_search.py::test_search"]
+        assert select("src/tests/fixtures/results.html") == ["src/tests/test_saved.py::test_saved"]
+
+
+class TestImpactCache:
+    """Green tracking across runs"""
+    
+    def test_green_until_fingerprint_changes(self, tmp_path):
+        path = str(tmp_path / "impact.json")
+        ImpactCache.merge_into(path, {"t::a": {"outcome": "passed", "fingerprint": "f1", "calls": ["x::f"]}})
+        ImpactCache.merge_into(path, {"t::b": {"outcome": "failed", "fingerprint": "f1", "calls": None}})
+        ImpactCache.merge_into(path, {"t::a": {"outcome": "passed", "fingerprint": "f1", "calls": None}})
+        
+        cache = ImpactCache(path)
+        assert cache.is_green("t::a", "f1")
+        assert not cache.is_green("t::a", "f2")
+        assert not cache.is_green("t::b", "f1")
+        # A run without recording keeps the earlier calls
+        assert cache.calls("t::a") == {"x::f"}
+    
+    def test_suite_data_and_target_changes_end_green_runs(self, tmp_path):
+        write_project(tmp_path)
+        path = str(tmp_path / "impact.json")
+        tests = {"search": "src/tests/test_search.py", "saved": "src/tests/test_saved.py"}
+        
+        def fingerprint(name, target="standin|replay="):
+            return DependencyGraph(str(tmp_path), data=DATA).fingerprint(tests[name], target=target)
+        
+        def green():
+            cache = ImpactCache(path)
+            return {name for name in tests if cache.is_green(name, fingerprint(name))}
+        
+        ImpactCache.merge_into(path, {
+            name: {"outcome": "passed", "fingerprint": fingerprint(name), "calls": None} for name in tests
+        })
+        assert green() == {"search", "saved"}
+        assert not ImpactCache(path).is_green("search", fingerprint("search", target="www.amazon.com|replay="))
+        
+        (tmp_path / "data/matrix.csv").write_text("term\ndesk\n")
+        assert green() == {"saved"}
+        (tmp_path / "src/tests/fixtures/results.html").write_text("<html>edited</html>")
+        assert green() == set()
+        
+        ImpactCache.merge_into(path, {
+            name: {"outcome": "passed", "fingerprint": fingerprint(name), "calls": None} for name in tests
+        })
+        (tmp_path / "src/tests/conftest.py").write_text("# edited\n")
+        assert green() == set()
+
+
+class Shelf:
+    class Slot:
+        @staticmethod
+        def parse(text):
+            return text
+
+
+class TestCallRecorder:
+    """Project functions called by a test, named as changed_symbols names them"""
+    
+    def test_records_methods_under_their_defining_class(self):
+        recorder = CallRecorder()
+        recorder.start()
+        try:
+            HomePage(page=None)
+            QueryCase("laptop").id
+            SearchResultsLogic._snapshot_name("https://www.amazon.com/s?k=laptop")
+        finally:
+            calls = recorder.stop()
+        
+        assert "src/pages/base_page.py::BasePage.__init__" in calls
+        assert "src/utils/query_matrix.py::QueryCase.id" in calls
+        assert "src/pages/search_results_page.py::SearchResultsLogic._snapshot_name" in calls
+        assert not any("CallRecorder" in call for call in calls)
+    
+    def test_names_without_co_qualname(self):
+        # What CallRecorder falls back to on Python 3.10
+        home_page = HomePage(page=None)
+        
+        assert _method_qualname(HomePage.__init__.__code__, {"self": home_page}, {}) == "BasePage.__init__"
+        assert _method_qualname(HomePage.goto.__wrapped__.__code__, {"self": home_page}, {}) == "HomePage.goto"
+        assert _method_qualname(QueryCase.id.fget.__code__, {"self": QueryCase("x")}, {}) == "QueryCase.id"
+        assert _method_qualname(_method_qualname.__code__, {}, vars(impact)) == "_method_qualname"
+    
+    def test_names_static_methods_without_co_qualname(self):
+        static = SearchResultsLogic._snapshot_name.__code__
+        nested = Shelf.Slot.parse.__code__
+        
+        assert _method_qualname(static, {"url": "/s?k=x"}, vars(search_results_page)) == "SearchResultsLogic._snapshot_name"
+        assert _method_qualname(nested, {}, globals()) == "Shelf.Slot.parse"
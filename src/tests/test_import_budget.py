@@ -0,0 +1,85 @@
+import os
+import pytest
+from src.benchmarks.bench_import import BUDGETS, measure
+from src.config.config import TestConfig, config
+from src.utils.perf_db import PerfCollector
+from src.utils.auth_state import StorageStateCache
+from src.utils.screenshots import ScreenshotManager
+from src.utils.timing import StepProfiler
+from src.utils.visual import VisualChecker
+
+
+class TestImportPath:
+    """Importing the framework is cheap and has no side effects"""
+    
+    @pytest.mark.parametrize("module", sorted(BUDGETS))
+    def test_import_within_budget(self, module):
+        result = measure(module)
+        
+        assert not result["playwright"], f"{module} loads Playwright"
+        assert result["threads"] == 1, f"{module} starts threads"
+        assert result["files"] == [], f"{module} creates files"
+        assert result["settings"] == [] and not result["dotenv"], f"{module} reads config"
+        # Best of two, so one slow interpreter start does not fail the suite
+        seconds = min(result["seconds"], measure(module)["seconds"])
+        assert seconds < BUDGETS[module], f"{module} took {seconds * 1000:.0f} ms"
+    
+    def test_conftest_reads_no_config_at_import(self):
+        # Collection imports it; settings are read once fixtures run
+        result = measure("src.tests.conftest")
+        
+        assert result["settings"] == [] and not result["dotenv"]
+
+
+class TestLazyConfig:
+    """Settings are read on first use, validated, and cached"""
+    
+    def test_settings_resolve_on_first_read_and_stay_cached(self, monkeypatch):
+        monkeypatch.setenv("TIMEOUT", "1234")
+        config = TestConfig()
+        assert config.timeout == 1234
+        
+        monkeypatch.setenv("TIMEOUT", "5678")
+        assert config.timeout == 1234
+        config.reload()
+        assert config.timeout == 5678
+    
+    def test_assignment_overrides_until_reload(self, monkeypatch):
+        monkeypatch.setenv("BROWSER", "Firefox")
+        config = TestConfig()
+        config.browser_type = "webkit"
+        assert config.browser_type == "webkit"
+        config.reload()
+        assert config.browser_type == "firefox"
+    
+    def test_invalid_values_name_the_variable(self, monkeypatch):
+        monkeypatch.setenv("TRACE_MODE", "bogus")
+        with pytest.raises(ValueError, match="TRACE_MODE='bogus'"):
+            TestConfig().trace_mode
+        
+        monkeypatch.delenv("TRACE_MODE")
+        monkeypatch.setenv("HEADLESS", "maybe")
+        with pytest.raises(ValueError, match="HEADLESS"):
+            TestConfig().validate()
+    
+    def test_singletons_read_config_on_first_use(self, monkeypatch, tmp_path):
+        manager, collector, steps = ScreenshotManager(str(tmp_path)), PerfCollector(), StepProfiler()
+        monkeypatch.setattr(config, "screenshot_budget_mb", 1)
+        monkeypatch.setattr(config, "perf_db", "")
+        monkeypatch.setattr(config, "profile_steps", True)
+        
+        assert manager.budget_bytes == 1024 * 1024
+        assert not collector.enabled
+        assert steps.enabled
+        assert StepProfiler(enabled=False).enabled is False
+    
+    def test_conftest_singletons_read_config_on_first_use(self, monkeypatch):
+        auth_states, visual = StorageStateCache(), VisualChecker(threshold=0.5)
+        monkeypatch.setattr(config, "auth_state_ttl", 60)
+        monkeypatch.setattr(config, "visual", "update")
+        monkeypatch.setattr(config, "visual_baseline_dir", "baselines")
+        monkeypatch.setattr(config, "standin", True)
+        
+        assert auth_states.ttl == 60
+        assert visual.update and visual.threshold == 0.5
+        assert visual.baseline_dir == os.path.join("baselines", "standin")
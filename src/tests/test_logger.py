@@ -0,0 +1,55 @@
+import json
+import logging
+import queue
+from src.utils import logger as log_module
+from src.utils.logger import BoundedQueueHandler, JsonLinesFormatter, merge_worker_logs
+
+
+def make_record(name, level, msg):
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+class TestLoggingPipeline:
+    """Queue-based logging backend"""
+    
+    def test_debug_noise_is_dropped_and_summarized_under_load(self, monkeypatch):
+        monkeypatch.setattr(log_module, "NOISE_HIGH_WATER", 2)
+        handler = BoundedQueueHandler(queue.Queue())
+        
+        for i in range(5):
+            handler.handle(make_record("SearchResultsPage", logging.DEBUG, f"card {i}"))
+        handler.handle(make_record("HomePage", logging.INFO, "search"))
+        handler.emit_dropped_summary()
+        
+        queued = [handler.queue.get_nowait().getMessage() for _ in range(handler.queue.qsize())]
+        assert queued == [
+            "card 0", "card 1", "search",
+            "Dropped 3 debug records under load (SearchResultsPage=3)"
+        ]
+        
+    def test_records_are_json_lines_with_worker_and_test(self, monkeypatch):
+        monkeypatch.setattr(log_module, "current_test", "test_x")
+        handler = BoundedQueueHandler(queue.Queue())
+        handler.handle(make_record("HomePage", logging.INFO, "hello"))
+        
+        line = JsonLinesFormatter().format(handler.queue.get_nowait())
+        
+        data = json.loads(line)
+        assert data["msg"] == "hello"
+        assert data["test"] == "test_x"
+        assert data["worker"] == log_module.worker_id
+        
+    def test_worker_files_merge_in_time_order(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(log_module, "LOG_DIR", str(tmp_path))
+        monkeypatch.setattr(log_module, "run_id", "run1")
+        for worker, stamps in (("shard0", ["01", "03"]), ("shard1", ["02", "04"])):
+            with open(tmp_path / f"test_run_run1_{worker}.jsonl", "w") as f:
+                for stamp in stamps:
+                    f.write(json.dumps({"ts": f"2026-01-01T00:00:{stamp}", "worker": worker}) + "\n")
+                    
+        merged = merge_worker_logs()
+        
+        with open(merged) as f:
+            workers = [json.loads(line)["worker"] for line in f]
+        assert workers == ["shard0", "shard1", "shard0", "shard1"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["test_run_run1.jsonl"]
@@ -0,0 +1,83 @@
+from src.pages import readiness
+from src.utils.perf_db import NAVIGATION, TEST, PerfCollector, PerfDatabase
+
+
+def add_runs(db, timings, runs, test="src/tests/test_x.py::test_a"):
+    for _ in range(runs):
+        db.add_run([(NAVIGATION, "HomePage.domcontentloaded", test, seconds) for seconds in timings],
+                   "run", target="standin", browser="chromium", sha="abc123")
+
+
+class TestPerfCollector:
+    """Samples attributed to the running test"""
+    
+    def test_records_only_when_enabled(self):
+        collector = PerfCollector(enabled=True)
+        collector.current_test = "t::a"
+        collector.record(NAVIGATION, "HomePage.search_box_visible", 0.4)
+        collector.record(NAVIGATION, "HomePage.domcontentloaded", None)
+        collector.record(TEST, "t::b", 2.0, test="t::b")
+        
+        assert collector.samples == [
+            (NAVIGATION, "HomePage.search_box_visible", "t::a", 0.4),
+            (TEST, "t::b", "t::b", 2.0),
+        ]
+        disabled = PerfCollector(enabled=False)
+        disabled.record(TEST, "t::a", 1.0)
+        assert disabled.samples == []
+    
+    def test_readiness_waits_are_navigation_samples(self, monkeypatch):
+        collector = PerfCollector(enabled=True)
+        collector.current_test = "t::a"
+        monkeypatch.setattr(readiness, "perf", collector)
+        monkeypatch.setattr(readiness, "readiness_timings", {})
+        
+        readiness.record_timing("results settled", 0.25)
+        
+        assert readiness.readiness_timings == {"results settled": [0.25]}
+        assert collector.samples == [(NAVIGATION, "results settled", "t::a", 0.25)]
+
+
+class TestPerfDatabase:
+    """Storing runs and gating on p50/p95 regressions"""
+    
+    def test_stable_timings_pass(self, tmp_path):
+        with PerfDatabase(str(tmp_path / "perf.sqlite")) as db:
+            add_runs(db, [0.20, 0.22, 0.25], runs=5)
+            comparisons = db.compare()
+        
+        assert len(comparisons) == 1
+        assert comparisons[0].baseline_samples == 12
+        assert not comparisons[0].regressed
+    
+    def test_slower_run_regresses(self, tmp_path):
+        with PerfDatabase(str(tmp_path / "perf.sqlite")) as db:
+            add_runs(db, [0.20, 0.22, 0.25], runs=5)
+            add_runs(db, [0.35, 0.40, 0.45], runs=1)
+            comparison = db.compare(threshold=0.2, min_delta=0.05)[0]
+        
+        assert comparison.regressed
+        assert comparison.p50 == 0.40 and comparison.baseline_p50 == 0.22
+        assert round(comparison.p50_change, 2) == 0.82
+    
+    def test_small_or_unbacked_changes_do_not_fail(self, tmp_path):
+        with PerfDatabase(str(tmp_path / "perf.sqlite")) as db:
+            add_runs(db, [0.010], runs=5)
+            add_runs(db, [0.030], runs=1)
+            # Tripled, but by 20 ms
+            assert not db.compare(min_delta=0.05)[0].regressed
+            add_runs(db, [0.5], runs=1, test="src/tests/test_x.py::test_new")
+        
+        with PerfDatabase(str(tmp_path / "perf.sqlite")) as db:
+            assert [row[6] for row in db.runs()][:2] == [1, 1]
+            assert not db.compare(window=1, min_samples=3)[0].regressed
+    
+    def test_baseline_only_uses_same_target(self, tmp_path):
+        with PerfDatabase(str(tmp_path / "perf.sqlite")) as db:
+            add_runs(db, [0.2], runs=5)
+            db.add_run([(NAVIGATION, "HomePage.domcontentloaded", "t", 1.5)], "run",
+                       target="www.amazon.com", browser="chromium", sha="abc123")
+            comparison = db.compare()[0]
+        
+        assert comparison.baseline_samples == 0
+        assert not comparison.regressed
@@ -0,0 +1,65 @@
+import csv
+import math
+import pytest
+from src.utils.product_store import Product, ProductTable
+
+PRODUCTS = [
+    {'index': 1, 'title': 'Acer Aspire 5', 'price': 549.99, 'rating': 4.5, 'is_prime': True, 'is_sponsored': True},
+    {'index': 2, 'title': 'Dell Inspiron 14', 'price': None, 'rating': 4.2, 'is_prime': False, 'is_sponsored': False},
+    {'index': 3, 'title': 'HP Pavilion 15', 'price': 899.0, 'rating': None, 'is_prime': True, 'is_sponsored': False},
+    {'index': 4, 'title': 'Acer Aspire 5', 'price': 1299.0, 'rating': 3.9, 'is_prime': False, 'is_sponsored': False},
+]
+
+
+@pytest.fixture
+def table():
+    table = ProductTable.from_products(PRODUCTS, query="laptop")
+    table.append(Product(1, "LG gram 16", 1499.0, 4.8, True, True, query="ultrabook"))
+    return table
+
+
+class TestProductTable:
+    """Column-oriented storage of product results"""
+    
+    def test_rows_round_trip_with_missing_values(self, table):
+        assert len(table) == 5
+        assert table[1] == Product(2, 'Dell Inspiron 14', None, 4.2, False, False, 'laptop')
+        assert [p.to_dict() for p in table][:4] == [dict(p, query='laptop') for p in PRODUCTS]
+        assert math.isnan(table.price[1])
+    
+    def test_repeated_titles_are_stored_once(self, table):
+        assert table.title[0] is table.title[3]
+        assert table.query[0] is table.query[2]
+    
+    def test_price_stats(self, table):
+        stats = table.price_stats()
+        assert stats == {
+            'count': 4, 'missing': 1, 'min': 549.99, 'max': 1499.0,
+            'mean': pytest.approx((549.99 + 899.0 + 1299.0 + 1499.0) / 4), 'median': 1099.0,
+        }
+        assert table.price_stats(query="ultrabook")['count'] == 1
+        assert table.price_stats(query="nothing") == {'count': 0, 'missing': 0}
+    
+    def test_rating_histogram_and_shares(self, table):
+        assert table.rating_histogram() == {3.5: 1, 4.0: 1, 4.5: 2}
+        assert table.rating_histogram(bucket=1.0, query="laptop") == {3.0: 1, 4.0: 2}
+        assert table.sponsored_share() == pytest.approx(0.4)
+        assert table.sponsored_share(query="laptop") == pytest.approx(0.25)
+        assert table.prime_share() == pytest.approx(0.6)
+    
+    def test_csv_export(self, table, tmp_path):
+        path = table.to_csv(str(tmp_path / "products.csv"))
+        
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert list(rows[0]) == list(ProductTable.COLUMNS)
+        assert rows[1]['price'] == '' and rows[1]['rating'] == '4.2'
+        assert rows[4]['query'] == 'ultrabook' and rows[4]['is_sponsored'] == '1'
+    
+    def test_parquet_export(self, table, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = table.to_parquet(str(tmp_path / "products.parquet"))
+        
+        columns = pq.read_table(path).to_pydict()
+        assert columns['price'][1] is None
+        assert columns['title'] == table.title
@@ -0,0 +1,43 @@
+import pytest
+from src.utils.query_matrix import QueryCase, batch_cases, load_matrix
+
+
+class TestQueryMatrix:
+    """Loading and batching search cases"""
+    
+    def test_csv_rows_with_defaults(self, tmp_path):
+        path = tmp_path / "matrix.csv"
+        path.write_text("term,sort,page\nlaptop,,\nlaptop,price-asc-rank,2\n,,\nlaptop,,1\n")
+        
+        assert load_matrix(str(path)) == [QueryCase("laptop"), QueryCase("laptop", "price-asc-rank", 2)]
+        
+    def test_yaml_cross_product(self, tmp_path):
+        pytest.importorskip("yaml")
+        path = tmp_path / "matrix.yaml"
+        path.write_text("terms: [laptop, usb c hub]\nsorts: [null, review-rank]\npages: [1, 2]\n")
+        
+        cases = load_matrix(str(path))
+        assert len(cases) == 8
+        assert cases[0] == QueryCase("laptop", None, 1)
+        assert cases[-1].id == "usb_c_hub-review-rank-p2"
+        
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            load_matrix(str(tmp_path / "matrix.json"))
+            
+    def test_batches_keep_terms_together(self):
+        cases = [
+            QueryCase("monitor", None, 2), QueryCase("laptop"), QueryCase("monitor"),
+            QueryCase("laptop", "price-asc-rank"), QueryCase("monitor"),
+        ]
+        batches = batch_cases(cases, 3)
+        
+        assert batches == [
+            [QueryCase("monitor"), QueryCase("monitor", None, 2), QueryCase("laptop")],
+            [QueryCase("laptop", "price-asc-rank")],
+        ]
+        
+    def test_shipped_matrix_loads(self):
+        cases = load_matrix("src/tests/fixtures/query_matrix.csv")
+        assert len(cases) == 12
+        assert sum(len(batch) for batch in batch_cases(cases, 5)) == 12
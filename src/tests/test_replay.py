@@ -0,0 +1,100 @@
+import os
+import pytest
+from src.utils.replay import (
+    FALLBACK, RECORD, STRICT, HarArchive, ReplaySession, archive_path
+)
+
+
+class FakeRequest:
+    def __init__(self, url, method="GET"):
+        self.url = url
+        self.method = method
+        self.post_data_buffer = None
+
+
+class FakeRoute:
+    def __init__(self, url):
+        self.request = FakeRequest(url)
+        self.outcome = None
+        
+    def fulfill(self, **kwargs):
+        self.outcome = ("fulfill", kwargs)
+        
+    def abort(self):
+        self.outcome = ("abort", None)
+        
+    def fallback(self):
+        self.outcome = ("fallback", None)
+
+
+def recorded_archive(path):
+    archive = HarArchive()
+    archive.add("GET", "https://www.amazon.com/", {}, None, 200, "OK",
+                [{"name": "Content-Type", "value": "text/html"},
+                 {"name": "Content-Encoding", "value": "gzip"}], b"<html>home</html>")
+    archive.add("GET", "https://www.amazon.com/s?k=laptop&ref=1", {}, None, 200, "OK",
+                [{"name": "Content-Type", "value": "text/html"}], b"<html>results</html>")
+    archive.save(path)
+    return archive
+
+
+class TestReplay:
+    """HAR archives and route-level replay"""
+    
+    def test_archive_name_is_shared_across_browsers(self, tmp_path):
+        chromium = archive_path(str(tmp_path), "src/tests/test_smoke.py::test_search_box_exists[chromium]")
+        webkit = archive_path(str(tmp_path), "src/tests/test_smoke.py::test_search_box_exists[webkit]")
+        
+        assert chromium == webkit
+        assert chromium == os.path.join(str(tmp_path), "src_tests_test_smoke.py_test_search_box_exists.har")
+        
+    def test_match_normalizes_and_falls_back_on_query(self, tmp_path):
+        path = str(tmp_path / "a.har")
+        recorded_archive(path)
+        archive = HarArchive.load(path)
+        
+        assert archive.match("GET", "https://www.amazon.com", None) is not None
+        assert archive.match("GET", "https://www.amazon.com/s?k=laptop&ref=2", None) is not None
+        assert archive.match("GET", "https://www.amazon.com/gp/cart", None) is None
+        assert archive.has_document("https://www.amazon.com#top")
+        
+    def test_strict_replay_serves_and_aborts(self, tmp_path):
+        path = str(tmp_path / "a.har")
+        recorded_archive(path)
+        session = ReplaySession(STRICT, path)
+        
+        hit = FakeRoute("https://www.amazon.com/")
+        miss = FakeRoute("https://fls-na.amazon.com/beacon")
+        session._replay(hit)
+        session._replay(miss)
+        
+        kind, kwargs = hit.outcome
+        assert kind == "fulfill"
+        assert kwargs["body"] == b"<html>home</html>"
+        assert "content-encoding" not in kwargs["headers"]
+        assert miss.outcome[0] == "abort"
+        assert session.served == 1
+        assert session.missed == ["https://fls-na.amazon.com/beacon"]
+        
+    def test_fallback_replay_passes_misses_on(self, tmp_path):
+        path = str(tmp_path / "a.har")
+        recorded_archive(path)
+        session = ReplaySession(FALLBACK, path)
+        
+        miss = FakeRoute("https://fls-na.amazon.com/beacon")
+        session._replay(miss)
+        
+        assert miss.outcome[0] == "fallback"
+        
+    def test_strict_without_recording_blocks_everything(self, tmp_path):
+        session = ReplaySession(STRICT, str(tmp_path / "missing.har"))
+        route = FakeRoute("https://www.amazon.com/")
+        session._replay(route)
+        
+        assert route.outcome[0] == "abort"
+        assert not session.has_document("https://www.amazon.com/")
+            
+    def test_unknown_mode_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            ReplaySession("sometimes", str(tmp_path / "a.har"))
+        assert ReplaySession(RECORD, str(tmp_path / "a.har")).archive.entries == []
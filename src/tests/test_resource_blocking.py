@@ -0,0 +1,65 @@
+import pytest
+from src.utils.resource_blocking import (
+    FULL, MINIMAL, NO_MEDIA, ResourceBlocker, estimated_size, get_profile
+)
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+        
+    def abort(self, error_code=None):
+        self.outcome = "abort"
+        
+    def fallback(self):
+        self.outcome = "fallback"
+
+
+class TestResourceBlocking:
+    """Blocking profiles and their savings tally"""
+    
+    def test_full_profile_blocks_nothing(self):
+        blocker = ResourceBlocker(get_profile(FULL))
+        
+        assert not blocker.profile.blocks_anything
+        assert not blocker.should_block("https://m.media-amazon.com/images/I/a.jpg", "image")
+        
+    def test_no_media_blocks_by_type_only(self):
+        blocker = ResourceBlocker(get_profile(NO_MEDIA))
+        
+        assert blocker.should_block("https://m.media-amazon.com/images/I/a.jpg", "image")
+        assert blocker.should_block("https://m.media-amazon.com/fonts/ember.woff2", "font")
+        assert not blocker.should_block("https://m.media-amazon.com/js/app.js", "script")
+        assert not blocker.should_block("https://fls-na.amazon.com/1/batch", "xhr")
+        
+    def test_minimal_blocks_ad_and_analytics_subdomains(self):
+        blocker = ResourceBlocker(get_profile(MINIMAL))
+        
+        assert blocker.should_block("https://aax-us-east.amazon-adsystem.com/e/dtb", "script")
+        assert blocker.should_block("https://fls-na.amazon.com/1/batch", "xhr")
+        assert not blocker.should_block("https://www.amazon.com/s?k=laptop", "document")
+        
+    def test_handler_counts_requests_and_bytes(self):
+        blocker = ResourceBlocker(get_profile(NO_MEDIA))
+        image = FakeRoute("https://m.media-amazon.com/images/I/a.jpg", "image")
+        document = FakeRoute("https://www.amazon.com/", "document")
+        
+        blocker._handle(image)
+        blocker._handle(document)
+        
+        assert (image.outcome, document.outcome) == ("abort", "fallback")
+        assert blocker.stats.blocked_requests == 1
+        assert blocker.stats.allowed_requests == 1
+        assert blocker.stats.saved_bytes == estimated_size("image")
+        assert blocker.stats.by_type == {"image": 1}
+        
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            get_profile("everything")
@@ -0,0 +1,46 @@
+import json
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from src.utils.retry import (
+    ASSERTION, NAVIGATION, OTHER, SELECTOR_MISSING, TIMEOUT, TRANSIENT,
+    RetryLedger, backoff_delay, classify_failure
+)
+
+
+class TestRetryPolicy:
+    """Failure classification, backoff and the flakiness ledger"""
+    
+    @pytest.mark.parametrize("exception, expected", [
+        (PlaywrightTimeoutError("Timeout 30000ms exceeded. waiting for locator('#nav-search')"), TIMEOUT),
+        (PlaywrightError("net::ERR_CONNECTION_RESET at https://www.amazon.com/"), NAVIGATION),
+        (PlaywrightError("strict mode violation: locator('h2') resolved to 3 elements"), SELECTOR_MISSING),
+        (AssertionError("Should have at least one result"), ASSERTION),
+        (ValueError("boom"), OTHER),
+    ])
+    def test_classify_failure(self, exception, expected):
+        assert classify_failure(exception) == expected
+        
+    def test_only_timeouts_and_navigation_are_transient(self):
+        assert TRANSIENT == {TIMEOUT, NAVIGATION}
+        
+    def test_backoff_doubles_and_is_capped(self):
+        assert [backoff_delay(attempt, 1.0) for attempt in range(3)] == [1.0, 2.0, 4.0]
+        assert backoff_delay(10, 1.0) == 30.0
+        
+    def test_ledger_merges_sessions(self, tmp_path):
+        path = str(tmp_path / "flakiness.json")
+        for _ in range(2):
+            ledger = RetryLedger()
+            ledger.record_retry("test_a", TIMEOUT)
+            ledger.record_result("test_a", attempts=2, failed=False, failure_class=None)
+            ledger.record_result("test_b", attempts=1, failed=True, failure_class=ASSERTION)
+            RetryLedger.merge_into(path, ledger.session)
+            
+        with open(path) as f:
+            tests = json.load(f)["tests"]
+        assert tests["test_a"]["retries"] == 2
+        assert tests["test_a"]["flaky_passes"] == 2
+        assert tests["test_a"]["flakiness"] == 1.0
+        assert tests["test_b"]["classes"] == {ASSERTION: 2}
+        assert list(ledger.flaky_tests()) == ["test_a"]
@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.config.config import config
+from src.runner.scenario_runner import QueryResult, ScenarioReport, percentile, query_variants, run_scenarios
+from src.standin.server import StandInConfig, StandInServer
+
+
+class TestLatencyReport:
+    """Percentiles and failure accounting of a scenario run"""
+    
+    def test_nearest_rank_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([3.0], 90) == 3.0
+        assert percentile([], 50) == 0.0
+    
+    def test_failed_queries_are_left_out_of_latencies(self):
+        report = ScenarioReport([
+            QueryResult("a", 1.0, 10, True),
+            QueryResult("b", 2.0, 10, True),
+            QueryResult("c", 60.0, error="Timeout 30000ms exceeded"),
+        ])
+        
+        summary = report.latency_percentiles()
+        assert summary["p50"] == 1.0
+        assert summary["max"] == 2.0
+        assert [r.query for r in report.failures] == ["c"]
+    
+    def test_query_variants_start_with_the_plain_term(self):
+        variants = query_variants("monitor")
+        
+        assert variants[0] == "monitor"
+        assert len(set(variants)) == len(variants)
+        assert all(v.startswith("monitor") for v in variants)
+
+
+def test_concurrent_scenarios_against_standin(monkeypatch):
+    """Queries run concurrently in one browser and keep their input order"""
+    with StandInServer(StandInConfig(page_size=5, latency_ms=50)) as server:
+        monkeypatch.setattr(config, "base_url", server.url)
+        queries = ["laptop", "monitor", "zzz nothing", "keyboard"]
+        # pytest-playwright's sync API may own this thread's event loop
+        with ThreadPoolExecutor(1) as pool:
+            report = pool.submit(asyncio.run, run_scenarios(queries, concurrency=2, max_products=3)).result()
+    
+    assert [r.query for r in report.results] == queries
+    assert not report.failures
+    assert [r.products for r in report.results] == [3, 3, 0, 3]
+    assert report.results[2].has_results is False
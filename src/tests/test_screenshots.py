@@ -0,0 +1,93 @@
+import os
+import threading
+from src.utils import screenshots
+from src.utils.screenshots import ScreenshotManager
+
+
+class FakePage:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        
+    def screenshot(self, full_page=False):
+        return self.frames.pop(0)
+
+
+class TestScreenshotManager:
+    """Background writes, deduplication and disk budget"""
+    
+    def test_identical_frames_are_stored_once(self, tmp_path):
+        manager = ScreenshotManager(str(tmp_path))
+        page = FakePage([b"frame-a", b"frame-a", b"frame-b"])
+        
+        first = manager.capture(page, "click_failure_#nav-search")
+        second = manager.capture(page, "click_failure_#nav-search")
+        third = manager.capture(page, "fill_failure")
+        manager.flush()
+        
+        assert first == second != third
+        assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(first), os.path.basename(third)])
+        assert manager.stats["deduplicated"] == 1
+        
+    def test_names_never_collide(self, tmp_path):
+        manager = ScreenshotManager(str(tmp_path))
+        paths = {manager.save(f"frame-{i}".encode(), "same_name") for i in range(20)}
+        manager.flush()
+        
+        assert len(paths) == 20
+        assert len(os.listdir(tmp_path)) == 20
+        
+    def test_least_recently_used_files_are_evicted(self, tmp_path):
+        manager = ScreenshotManager(str(tmp_path), budget_bytes=25)
+        old = manager.save(b"x" * 10, "old")
+        kept = manager.save(b"y" * 10, "kept")
+        manager.save(b"y" * 10, "kept-again")  # dedup hit refreshes 'kept'
+        newest = manager.save(b"z" * 10, "newest")
+        manager.flush()
+        
+        assert not os.path.exists(old)
+        assert os.path.exists(kept) and os.path.exists(newest)
+        assert manager.stats["evicted"] == 1
+        
+    def test_files_from_earlier_runs_count_against_budget(self, tmp_path):
+        earlier = ScreenshotManager(str(tmp_path))
+        previous = earlier.save(b"a" * 10, "earlier")
+        earlier.flush()
+        
+        manager = ScreenshotManager(str(tmp_path), budget_bytes=15)
+        assert manager.save(b"a" * 10, "again") == previous
+        manager.save(b"b" * 10, "new")
+        manager.flush()
+        
+        assert not os.path.exists(previous)
+        
+    def test_evicted_files_are_removed_on_the_writer_thread(self, tmp_path, monkeypatch):
+        manager = ScreenshotManager(str(tmp_path), budget_bytes=15)
+        first = manager.save(b"a" * 10, "first")
+        manager.flush()
+        removed = []
+        remove = os.remove
+        
+        def recording_remove(path):
+            removed.append((path, threading.current_thread().name))
+            remove(path)
+        monkeypatch.setattr(screenshots.os, "remove", recording_remove)
+        manager.save(b"b" * 10, "second")
+        manager.flush()
+        
+        assert removed and removed[0][0] == first
+        assert all(name.startswith("screenshot-writer") for _, name in removed)
+        
+    def test_file_evicted_during_its_write_is_deleted(self, tmp_path, monkeypatch):
+        manager = ScreenshotManager(str(tmp_path))
+        replace = os.replace
+        
+        def replace_then_evict(source, target):
+            replace(source, target)
+            with manager._lock:
+                manager._total_bytes -= manager._files.pop(target)
+        monkeypatch.setattr(screenshots.os, "replace", replace_then_evict)
+        manager.save(b"a" * 10, "raced")
+        manager.flush()
+        
+        assert os.listdir(tmp_path) == []
+        assert manager.stats["written"] == 0
@@ -0,0 +1,55 @@
+import os
+import pytest
+from src.pages.search_results_page import SearchResultsPage
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "search_results_laptop.html")
+
+
+class TestPriceAndRatingParsing:
+    """Parsing helpers shared by bulk and per-element extraction"""
+    
+    @pytest.mark.parametrize("text, expected", [
+        ("1,299.", 1299.0),
+        ("$849.99", 849.99),
+        ("  42 ", 42.0),
+        (".", None),
+        ("", None),
+        (None, None),
+    ])
+    def test_parse_price(self, text, expected):
+        assert SearchResultsPage._parse_price(text) == expected
+        
+    @pytest.mark.parametrize("label, expected", [
+        ("4.5 out of 5 stars", 4.5),
+        ("4 out of 5 stars, rating details", 4.0),
+        ("no rating here", None),
+        (None, None),
+    ])
+    def test_parse_rating(self, label, expected):
+        assert SearchResultsPage._parse_rating(label) == expected
+
+
+class TestBulkExtraction:
+    """Bulk extraction against a saved results page"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, page):
+        """Load the saved results page"""
+        with open(FIXTURE, encoding="utf-8") as f:
+            page.set_content(f.read())
+        self.search_results = SearchResultsPage(page)
+        
+    def test_bulk_matches_per_element(self):
+        """Bulk mode returns exactly what the per-element path returns"""
+        bulk = self.search_results.get_products(max_count=48)
+        per_element = self.search_results.get_products(max_count=48, bulk=False)
+        
+        assert len(bulk) == 48
+        assert bulk == per_element
+        
+    def test_results_ready_without_fixed_sleep(self):
+        """Readiness resolves on a settled page well inside the old fixed sleeps"""
+        waited = self.search_results.wait_for_results(stable_ms=100)
+        
+        assert waited < 2
+        assert self.search_results.has_results()
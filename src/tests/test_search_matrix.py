@@ -0,0 +1,31 @@
+"""
+Data-driven search matrix
+Each batch of query cases runs on one page, opening every results page
+by URL; the homepage search form is covered by test_search_refactored
+"""
+
+import pytest
+from src.config.config import config
+from src.pages.search_results_page import SearchResultsPage
+from src.utils.logger import logger
+from src.utils.query_matrix import batch_cases, load_matrix
+
+BATCHES = batch_cases(load_matrix(config.query_matrix), config.matrix_batch_size)
+
+
+@pytest.mark.parametrize("batch", BATCHES, ids=[f"{n:02d}-{batch[0].id}" for n, batch in enumerate(BATCHES, 1)])
+def test_query_batch(page, batch):
+    """Every case in the batch has results with titled products"""
+    results_page = SearchResultsPage(page)
+    failures = []
+    for case in batch:
+        results_page.goto(case.term, case.page, case.sort)
+        if not results_page.has_results():
+            failures.append(f"{case.id}: no results")
+            continue
+        products = results_page.get_products(max_count=10)
+        if not any(product['title'] for product in products):
+            failures.append(f"{case.id}: no product titles among {len(products)} cards")
+        logger.info(f"{case.id}: {len(products)} products")
+        
+    assert not failures, f"{len(failures)} of {len(batch)} cases failed:\n" + "\n".join(failures)
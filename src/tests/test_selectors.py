@@ -0,0 +1,74 @@
+import json
+from src.pages.home_page import HomePage
+from src.pages.search_results_page import SearchResultsPage
+from src.pages.selectors import HomeSelectors, SelectorRegistry, SearchResultsSelectors, parse_results_count
+
+CHAIN = ("h2 span", "h2 a span", "h2", ".s-size-medium")
+
+
+def make_registry(tmp_path):
+    registry = SelectorRegistry(str(tmp_path / "selector_stats.json"))
+    registry.register("search_results", "title", CHAIN)
+    return registry
+
+
+class TestSelectorRegistry:
+    """Fallback ordering, hit rates and persistence"""
+    
+    def test_declared_order_without_history(self, tmp_path):
+        assert make_registry(tmp_path).candidates("search_results", "title") == list(CHAIN)
+    
+    def test_winning_fallback_moves_first(self, tmp_path):
+        registry = make_registry(tmp_path)
+        ordered = registry.candidates("search_results", "title")
+        for _ in range(3):
+            registry.record_index("search_results", "title", ordered, 2)
+        
+        assert registry.candidates("search_results", "title")[:1] == ["h2"]
+        assert registry.candidates("search_results", "title")[-2:] == ["h2 span", "h2 a span"]
+        rates = registry.hit_rates()["search_results.title"]
+        assert rates == {"h2 span": 0.0, "h2 a span": 0.0, "h2": 1.0}
+    
+    def test_failing_winner_sinks(self, tmp_path):
+        registry = make_registry(tmp_path)
+        registry.record("search_results", "title", ["h2"], "h2")
+        for _ in range(3):
+            registry.record("search_results", "title", ["h2", ".s-size-medium"], ".s-size-medium")
+        
+        assert registry.candidates("search_results", "title")[0] == ".s-size-medium"
+    
+    def test_counts_persist_across_runs(self, tmp_path):
+        first = make_registry(tmp_path)
+        first.record_index("search_results", "title", list(CHAIN), 1)
+        first.save()
+        first.save()
+        
+        second = make_registry(tmp_path)
+        assert second.candidates("search_results", "title")[0] == "h2 a span"
+        with open(second.path, encoding="utf-8") as f:
+            chain = json.load(f)["chains"]["search_results.title"]
+        assert chain["h2 a span"] == {"tried": 2, "hits": 2}
+    
+    def test_report_flags_dead_fallbacks(self, tmp_path):
+        registry = make_registry(tmp_path)
+        registry.record_index("search_results", "title", list(CHAIN), 1)
+        
+        lines = registry.report_lines()
+        assert len(lines) == 2
+        assert "h2 a span" in lines[0] and "100.0%" in lines[0]
+        assert lines[1].endswith("h2 span  (never matched)")
+
+
+class TestSharedDefinitions:
+    """Page objects read selectors from the registry instead of rebuilding them"""
+    
+    def test_page_objects_use_class_level_selectors(self):
+        assert HomePage.SEARCH_BOX is HomeSelectors.SEARCH_BOX
+        assert SearchResultsPage.PRODUCT_CARDS is SearchResultsSelectors.PRODUCT_CARDS
+        assert "SEARCH_BOX" not in HomePage(page=None).__dict__
+    
+    def test_results_count_pattern(self):
+        assert parse_results_count("1-48 of over 10,000 results for \"laptop\"") == 10000
+        assert parse_results_count("1-16 of 243 results") == 243
+        assert parse_results_count("No results") == 0
+        assert parse_results_count(None) == 0
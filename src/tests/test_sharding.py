@@ -0,0 +1,46 @@
+from src.utils.sharding import DurationHistory, imbalance, plan_shards
+
+
+class TestShardPlanning:
+    """Longest-processing-time-first shard planning"""
+    
+    def make_history(self, tmp_path, durations):
+        history = DurationHistory(str(tmp_path / "durations.json"))
+        history.update(durations)
+        return history
+        
+    def test_lpt_balances_loads(self, tmp_path):
+        history = self.make_history(tmp_path, {"a": 5, "b": 4, "c": 3, "d": 3, "e": 1})
+        
+        shards = plan_shards(["a", "b", "c", "d", "e"], history, 2)
+        
+        assert sorted(shard.load for shard in shards) == [8, 8]
+        assert sorted(sum((s.nodeids for s in shards), [])) == ["a", "b", "c", "d", "e"]
+        
+    def test_plan_is_deterministic(self, tmp_path):
+        history = self.make_history(tmp_path, {"a": 1, "b": 1, "c": 1})
+        
+        first = plan_shards(["c", "a", "b"], history, 2)
+        second = plan_shards(["b", "c", "a"], history, 2)
+        
+        assert [s.nodeids for s in first] == [s.nodeids for s in second]
+        
+    def test_unknown_tests_use_median_estimate(self, tmp_path):
+        history = self.make_history(tmp_path, {"a": 2, "b": 4, "c": 10})
+        
+        assert history.estimate("new") == 4
+        
+    def test_history_round_trip_with_smoothing(self, tmp_path):
+        history = self.make_history(tmp_path, {"a": 10})
+        history.record("a", 20)
+        history.save()
+        
+        loaded = DurationHistory.load(history.path)
+        
+        assert loaded.durations["a"] == 13.0
+        assert loaded.runs["a"] == 2
+        
+    def test_imbalance(self):
+        assert imbalance([10, 10]) == 1.0
+        assert imbalance([15, 5]) == 1.5
+        assert imbalance([]) == 1.0
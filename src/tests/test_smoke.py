@@ -3,16 +3,22 @@ Day 1: Basic smoke test to verify our setup works
 This test will:
 1. Open Amazon.com
 2. Verify the page loaded
-3. Take a screenshot as proof
+3. Compare a screenshot with its visual baseline
 """
 
 import pytest
 from playwright.sync_api import Page
+from src.config.config import config
 
-def test_amazon_homepage_loads(page: Page):
+# Navbar parts that differ per session: delivery location, greeting,
+# cart count and the promo links and slot
+NAV_DYNAMIC = ("#nav-global-location-popover-link, #glow-ingress-block, #nav-link-accountList, "
+               "#nav-cart-count, #nav-xshop, #nav-swmslot")
+
+def test_amazon_homepage_loads(page: Page, visual_check):
     """Test that Amazon homepage loads successfully"""
     # Navigate to Amazon
-    page.goto("https://www.amazon.com", wait_until="domcontentloaded")
+    page.goto(config.base_url, wait_until="domcontentloaded")
     
     # Wait for search box - we know this works from test 2
     page.wait_for_selector('#twotabsearchtextbox', timeout=30000)
@@ -20,14 +26,14 @@ def test_amazon_homepage_loads(page: Page):
     # Verify we're on Amazon
     assert "amazon" in page.title().lower(), f"Expected 'amazon' in title, got: {page.title()}"
     
-    # Take screenshot for evidence
-    page.screenshot(path="reports/screenshots/amazon_homepage.png")
+    # Compare with the baseline; the deals below the header change daily
+    visual_check("homepage", mask=[page.locator("#pageContent"), page.locator(NAV_DYNAMIC)])
     print("✅ Amazon homepage loaded successfully!")
 
 def test_search_box_exists(page: Page):
     """Test that search box is present and functional"""
     # Navigate to Amazon
-    page.goto("https://www.amazon.com", wait_until="domcontentloaded")
+    page.goto(config.base_url, wait_until="domcontentloaded")
     
     # Check search box exists
     search_box = page.locator('#twotabsearchtextbox')
@@ -39,9 +45,9 @@ def test_search_box_exists(page: Page):
     
     print("✅ Search box is functional!")
 
-def test_amazon_navigation_menu(page: Page):
+def test_amazon_navigation_menu(page: Page, visual_check):
     """Test that main navigation menu is present"""
-    page.goto("https://www.amazon.com", wait_until="domcontentloaded")
+    page.goto(config.base_url, wait_until="domcontentloaded")
     
     # Wait for page to load - use search box as indicator
     page.wait_for_selector('#twotabsearchtextbox', timeout=30000)
@@ -50,6 +56,6 @@ def test_amazon_navigation_menu(page: Page):
     cart = page.locator('#nav-cart, [aria-label*="cart"], [data-csa-c-content-id="nav_cart"]').first
     assert cart.is_visible(), "Cart should be visible"
     
-    # Take screenshot of navigation
-    page.screenshot(path="reports/screenshots/navigation_menu.png")
+    # Compare the navigation bar with its baseline
+    visual_check("navigation_menu", target=page.locator("#navbar"), mask=[page.locator(NAV_DYNAMIC)])
     print("✅ Navigation menu is present!")
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+import pytest
+from src.pages.search_results_page import SearchResultsPage
+from src.pages.snapshot import SnapshotResultsPage, parse_html, parse_snapshots, save_snapshot
+from src.standin import markup
+from src.standin.catalog import Catalog
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "search_results_laptop.html")
+
+
+class TestSelectorEngine:
+    """CSS selectors evaluated against the offline DOM"""
+    
+    HTML = """<div id="a" class="card big"><h2><a href="/x"><span>One</span></a></h2>
+    <p hidden><span class="price">1</span></p><span aria-label="4.5 out of 5 stars" data-k=v></span></div>
+    <div class="card"><h2><span>Two</span></h2><br><i role="img" aria-label="Amazon Prime"></i>
+    <i class="icon" style="display:inline-block;width:20px;height:0"></i><b><img src="/i.png"></b></div>"""
+    
+    @pytest.fixture
+    def document(self):
+        return parse_html(self.HTML)
+    
+    def test_descendant_child_and_compound(self, document):
+        assert [n.text_content() for n in document.select("h2 span")] == ["One", "Two"]
+        assert [n.text_content() for n in document.select("h2 > span")] == ["Two"]
+        assert len(document.select("div.card.big")) == 1
+        assert document.select_one("#a a").get_attribute("href") == "/x"
+    
+    def test_attribute_operators_and_lists(self, document):
+        assert document.select_one('[aria-label*="out of 5 stars"]').get_attribute("data-k") == "v"
+        assert len(document.select('[aria-label="Amazon Prime"], [aria-label^="4.5"]')) == 2
+        assert document.select('[role="button"]') == []
+    
+    def test_scoped_lookup_and_rendering(self, document):
+        second = document.select("div.card")[1]
+        assert second.select_one("span").text_content() == "Two"
+        assert not document.select_one(".price").is_rendered()
+        # Empty elements are zero-sized, as in the browser without stylesheets
+        assert not second.select_one("i").is_rendered()
+        assert second.select_one("i.icon").is_rendered()
+        assert second.select_one("b").is_rendered()
+        assert not document.select_one("br").is_rendered()
+
+
+class TestSnapshotResultsPage:
+    """Offline extraction against stand-in pages with known contents"""
+    
+    def test_products_match_catalog(self):
+        results = Catalog(page_size=20).search("laptop", page=2)
+        page = SnapshotResultsPage(markup.search_results(results))
+        
+        products = page.get_products(max_count=100)
+        assert len(products) == 20
+        for product, item in zip(products, results.items):
+            assert product['title'] == item.title
+            assert product['price'] == (float(int(item.price)) if item.price is not None else None)
+            assert product['rating'] == item.rating
+            assert product['is_prime'] == item.is_prime
+            assert product['is_sponsored'] == item.is_sponsored
+        assert page.get_results_count() == 10000
+        assert page.next_page_url() == "/s?k=laptop&page=3"
+    
+    def test_no_results_page(self):
+        page = SnapshotResultsPage(markup.search_results(Catalog().search("zzz nothing")))
+        
+        assert not page.has_results()
+        assert page.get_products() == []
+        assert page.next_page_url() is None
+    
+    def test_process_pool_keeps_order_and_reports_errors(self, tmp_path):
+        catalog = Catalog(page_size=8)
+        paths = [
+            save_snapshot(markup.search_results(catalog.search(query)), query, str(tmp_path))
+            for query in ("laptop", "monitor", "keyboard")
+        ]
+        paths.append(str(tmp_path / "missing.html"))
+        
+        results = parse_snapshots(paths, workers=2)
+        
+        assert [r.path for r in results] == paths
+        assert [len(r.products) for r in results[:3]] == [8, 8, 8]
+        assert results[1].products[0]['title'] == catalog.search("monitor").items[0].title
+        assert results[3].error.startswith("FileNotFoundError")
+    
+    def test_offline_matches_live_extraction(self, page):
+        """Same selectors give the same products offline as in the browser"""
+        with open(FIXTURE, encoding="utf-8") as f:
+            html = f.read()
+        page.set_content(html)
+        
+        live = SearchResultsPage(page).get_products(max_count=48)
+        offline = SnapshotResultsPage(html).get_products(max_count=48)
+        
+        assert offline == live
@@ -0,0 +1,81 @@
+import urllib.error
+import urllib.parse
+import urllib.request
+import pytest
+from src.standin.catalog import Catalog
+from src.standin.server import StandInConfig, StandInServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StandInServer(StandInConfig(page_size=5, pages=2)) as running:
+        yield running
+
+
+def fetch(url):
+    with urllib.request.urlopen(url) as response:
+        return response.status, response.read().decode("utf-8")
+
+
+class TestStandIn:
+    """Local stand-in server and its synthetic catalog"""
+    
+    def test_homepage_has_page_object_selectors(self, server):
+        status, html = fetch(server.url + "/")
+        
+        assert status == 200
+        for selector_id in ("twotabsearchtextbox", "nav-search-submit-button", "nav-cart-count", "nav-link-accountList"):
+            assert f'id="{selector_id}"' in html
+        assert "amazon" in html.lower()
+    
+    def test_results_page_and_pagination(self, server):
+        _, first = fetch(server.url + "/s?k=laptop")
+        _, last = fetch(server.url + "/s?k=laptop&page=2")
+        
+        assert first.count('data-component-type="s-search-result"') == 5
+        assert "1-5 of over 10,000 results" in first
+        assert 'href="/s?k=laptop&amp;page=2">Next' in first
+        assert "s-pagination-disabled" in last
+    
+    def test_malformed_page_shows_the_first(self, server):
+        status, html = fetch(server.url + "/s?k=laptop&page=two")
+        
+        assert status == 200
+        assert html == fetch(server.url + "/s?k=laptop")[1]
+    
+    def test_no_results_query(self, server):
+        _, html = fetch(server.url + "/s?k=zzzqqq")
+        
+        assert "s-no-results-message" in html
+        assert "s-search-result" not in html
+    
+    def test_product_detail_and_404(self, server):
+        item = Catalog(page_size=5, pages=2).search("laptop").items[0]
+        _, html = fetch(server.url + f"/dp/{item.asin}")
+        
+        assert 'id="productTitle"' in html
+        with pytest.raises(urllib.error.HTTPError):
+            fetch(server.url + "/dp/unknown")
+    
+    def test_sign_in_sets_user_cookie(self, server):
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor())
+        form = urllib.parse.urlencode({"email": server.settings.email, "password": server.settings.password})
+        with opener.open(server.url + "/ap/signin", data=form.encode()) as response:
+            html = response.read().decode("utf-8")
+        
+        assert "Hello, standin" in html
+        assert server.sign_ins == 1
+    
+    def test_sign_in_rejects_wrong_password(self, server):
+        form = urllib.parse.urlencode({"email": server.settings.email, "password": "wrong"})
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(server.url + "/ap/signin", data=form.encode())
+        assert error.value.code == 401
+        assert "auth-error-message-box" in error.value.read().decode("utf-8")
+    
+    def test_catalog_is_deterministic_and_sortable(self):
+        catalog = Catalog(page_size=10)
+        
+        assert catalog.search("laptop").items == catalog.search("laptop").items
+        prices = [i.price for i in catalog.search("laptop", sort="price-asc-rank").items if i.price is not None]
+        assert prices == sorted(prices)
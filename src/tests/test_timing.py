@@ -0,0 +1,76 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+import pytest
+from src.utils.timing import StepProfiler, profiler, timed
+
+
+class FakePage:
+    @timed
+    def search(self):
+        self.fill("#box")
+        time.sleep(0.01)
+        
+    @timed(selector=True)
+    def fill(self, selector):
+        time.sleep(0.02)
+
+
+class FakeAsyncPage:
+    @timed
+    async def search(self):
+        await self.fill("#box")
+        
+    @timed(selector=True)
+    async def fill(self, selector):
+        await asyncio.sleep(0.02)
+
+
+class TestStepProfiler:
+    """Nested step timing and collapsed-stack output"""
+    
+    @pytest.fixture(autouse=True)
+    def enabled_profiler(self):
+        previous = profiler.enabled, profiler.current_test, dict(profiler.stats)
+        profiler.enabled = True
+        profiler.current_test = "test_case"
+        profiler.reset()
+        yield profiler
+        profiler.enabled, profiler.current_test = previous[0], previous[1]
+        profiler.reset()
+        profiler.stats.update(previous[2])
+        
+    def test_nested_steps_split_self_time(self):
+        FakePage().search()
+        
+        outer = profiler.stats[("test_case", "FakePage.search")]
+        inner = profiler.stats[("test_case", "FakePage.search", "FakePage.fill(#box)")]
+        assert outer.count == inner.count == 1
+        assert outer.total >= inner.total + 0.01
+        assert outer.self_time == pytest.approx(outer.total - inner.total)
+        
+    def test_folded_lines_and_top_steps(self):
+        FakePage().search()
+        FakePage().search()
+        
+        lines = profiler.folded_lines()
+        assert any(line.startswith("test_case;FakePage.search;FakePage.fill(#box) ") for line in lines)
+        assert profiler.top_steps(1)[0][0] == "FakePage.fill(#box)"
+        
+    def test_coroutines_are_timed_per_task(self):
+        async def run_concurrently():
+            await asyncio.gather(FakeAsyncPage().search(), FakeAsyncPage().search())
+        # pytest-playwright's sync API may own this thread's event loop
+        with ThreadPoolExecutor(1) as pool:
+            pool.submit(asyncio.run, run_concurrently()).result()
+        
+        outer = profiler.stats[("test_case", "FakeAsyncPage.search")]
+        inner = profiler.stats[("test_case", "FakeAsyncPage.search", "FakeAsyncPage.fill(#box)")]
+        assert outer.count == inner.count == 2
+        assert inner.total >= 0.04
+        
+    def test_disabled_profiler_records_nothing(self):
+        quiet = StepProfiler(enabled=False)
+        with quiet.step("anything"):
+            pass
+        assert quiet.stats == {}
@@ -0,0 +1,153 @@
+import os
+import random
+import struct
+import zlib
+from src.utils.visual import (
+    Image, VisualChecker, VisualIndex, baseline_key, decode_png, encode_png, hamming, signature
+)
+
+
+def page_image(width=256, height=160, stripe=None):
+    """White page with gray text-like bars and an optional red stripe"""
+    rows = []
+    for y in range(height):
+        row = bytearray(b"\xff\xff\xff" * width)
+        if y % 16 < 6:
+            for x in range(8 + (y // 16) % 3 * 4, width - 20, 10):
+                row[x * 3:(x + 6) * 3] = b"\x40\x40\x40" * 6
+        if stripe and stripe[0] <= y < stripe[1]:
+            row[10 * 3:40 * 3] = b"\xff\x00\x00" * 30
+        rows.append(bytes(row))
+    return Image(width, height, 3, rows)
+
+
+def filtered_png(image, filter_types):
+    """PNG whose rows use the given filter types, cycling"""
+    c = image.channels
+    raw = bytearray()
+    prev = bytes(len(image.rows[0]))
+    for y, row in enumerate(image.rows):
+        kind = filter_types[y % len(filter_types)]
+        out = bytearray()
+        for i, value in enumerate(row):
+            a = row[i - c] if i >= c else 0
+            b = prev[i]
+            up_left = prev[i - c] if i >= c else 0
+            p = a + b - up_left
+            paeth = min((abs(p - a), 0, a), (abs(p - b), 1, b), (abs(p - up_left), 2, up_left))[2]
+            predictor = [0, a, b, (a + b) // 2, paeth][kind]
+            out.append((value - predictor) & 255)
+        raw += bytes([kind]) + out
+        prev = row
+    
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+    header = struct.pack(">IIBBBBB", image.width, image.height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(bytes(raw))) + chunk(b"IEND", b"")
+
+
+def record(checker, png, key):
+    """Write a baseline the way VISUAL=update does"""
+    checker.update = True
+    checker.check(png, key)
+    checker.update = False
+
+
+class TestPngAndSignatures:
+    """Decoding captures and reducing them to tile signatures"""
+    
+    def test_decodes_every_filter_type(self):
+        rng = random.Random(7)
+        image = Image(7, 10, 3, [bytes(rng.randrange(256) for _ in range(21)) for _ in range(10)])
+        
+        assert decode_png(filtered_png(image, [0, 1, 2, 3, 4])).rows == image.rows
+        assert decode_png(encode_png(image)).rows == image.rows
+    
+    def test_only_changed_tiles_get_new_digests(self):
+        before = signature(page_image(), tile_size=64)
+        after = signature(page_image(stripe=(70, 80)), tile_size=64)
+        
+        assert len(before.tiles) == 4 * 3
+        changed = [i for i, (a, b) in enumerate(zip(before.tiles, after.tiles)) if a.digest != b.digest]
+        assert changed == [4]
+        assert before.tile_box(4) == (0, 64, 64, 128)
+        assert hamming(before.tiles[4].phash, after.tiles[4].phash) > 0
+    
+    def test_baseline_key_leaves_the_browser_out_of_the_test(self):
+        key = baseline_key("src/tests/test_smoke.py::test_nav[firefox]", "nav", "1920x1080", "firefox")
+        batch = baseline_key("src/tests/test_m.py::test_q[webkit-02-monitor]", "p1", "1920x1080", "webkit")
+        
+        assert key == "src/tests/test_smoke.py::test_nav::nav|1920x1080|firefox"
+        assert batch == "src/tests/test_m.py::test_q[02-monitor]::p1|1920x1080|webkit"
+
+
+class TestVisualChecker:
+    """Comparing captures with baselines, cheapest evidence first"""
+    
+    def test_missing_baselines_are_not_written_outside_update_mode(self, tmp_path):
+        checker = VisualChecker(str(tmp_path / "baselines"), str(tmp_path / "out"), tile_size=64, update=False)
+        png = encode_png(page_image())
+        
+        result = checker.check(png, "t::home|256x160|chromium")
+        assert result.status == "missing" and result.passed
+        assert not os.path.exists(tmp_path / "baselines")
+        
+        record(checker, png, "t::home|256x160|chromium")
+        assert checker.check(png, "t::home|256x160|chromium").status == "identical"
+        assert checker.stats["tiles_diffed"] == 0
+    
+    def test_changed_tiles_are_diffed_and_failures_written(self, tmp_path):
+        checker = VisualChecker(str(tmp_path / "baselines"), str(tmp_path / "out"), tile_size=64)
+        record(checker, encode_png(page_image()), "k")
+        
+        result = checker.check(encode_png(page_image(stripe=(70, 80))), "k")
+        
+        assert result.status == "mismatch" and not result.passed
+        assert result.changed_tiles == [4]
+        assert result.diff_pixels == 30 * 10
+        assert checker.stats["tiles_diffed"] == 1
+        assert os.path.exists(result.current_path) and os.path.exists(result.diff_path)
+        marked = decode_png(open(result.diff_path, "rb").read())
+        assert marked.rows[75][20 * 3:21 * 3] == b"\xff\x00\x00"
+    
+    def test_differences_within_tolerance_or_threshold_pass(self, tmp_path):
+        checker = VisualChecker(str(tmp_path), tile_size=64, threshold=0.01)
+        image = page_image()
+        record(checker, encode_png(image), "k")
+        shifted = Image(image.width, image.height, 3, [bytes(max(0, v - 5) for v in row) for row in image.rows])
+        small = page_image(stripe=(70, 72))
+        
+        assert checker.check(encode_png(shifted), "k").status == "match"
+        result = checker.check(encode_png(small), "k")
+        assert result.status == "match" and result.diff_pixels == 60
+    
+    def test_resized_captures_fail(self, tmp_path):
+        checker = VisualChecker(str(tmp_path), str(tmp_path / "out"))
+        record(checker, encode_png(page_image()), "k")
+        
+        result = checker.check(encode_png(page_image(height=200)), "k")
+        assert result.status == "resized" and not result.passed
+    
+    def test_index_persists_and_hashes_stand_in_for_missing_pngs(self, tmp_path):
+        baselines = str(tmp_path / "baselines")
+        checker = VisualChecker(baselines, tile_size=64)
+        record(checker, encode_png(page_image()), "k")
+        VisualIndex.merge_into(checker.index_path, checker.session)
+        for name in os.listdir(baselines):
+            if name.endswith(".png"):
+                os.remove(os.path.join(baselines, name))
+        
+        reloaded = VisualChecker(baselines, str(tmp_path / "out"), tile_size=64)
+        assert reloaded.check(encode_png(page_image()), "k").status == "identical"
+        result = reloaded.check(encode_png(page_image(stripe=(64, 128))), "k")
+        assert result.status == "mismatch"
+        assert result.diff_pixels == 64 * 64 and result.diff_path is None
+    
+    def test_update_mode_rewrites_baselines(self, tmp_path):
+        checker = VisualChecker(str(tmp_path))
+        record(checker, encode_png(page_image()), "k")
+        VisualIndex.merge_into(checker.index_path, checker.session)
+        
+        updater = VisualChecker(str(tmp_path), update=True)
+        assert updater.check(encode_png(page_image(stripe=(0, 5))), "k").status == "updated"
+        assert list(updater.session) == ["k"]
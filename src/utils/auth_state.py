@@ -0,0 +1,137 @@
+# src/utils/auth_state.py
+"""
+Signed-in storage state cache
+Signs in once, saves the context's cookies and localStorage with
+storage_state, and creates later contexts from that snapshot until it
+is older than the TTL
+"""
+
+import hashlib
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from playwright.sync_api import Browser, BrowserContext
+
+from src.config.config import config_default
+from src.utils.logger import logger
+
+
+@dataclass
+class AuthStats:
+    """Counters reported at session end"""
+    sign_ins: int = 0
+    reuses: int = 0
+    contexts: int = 0
+    sign_in_seconds: float = 0.0
+
+
+class StorageStateCache:
+    """
+    Storage state snapshots per identity, one JSON file each
+    
+    An identity is an email on a target, so the stand-in and amazon.com
+    never share a snapshot. The target is a stable name such as
+    current_target()'s "standin", not a URL, since the stand-in's port
+    changes every run. Files are replaced atomically, so workers sharing
+    the directory read either the old snapshot or the new one.
+    
+    Usage:
+        cache = StorageStateCache(ttl=3600)
+        state = cache.get(browser, context_args, email, current_target(), sign_in)
+        context = browser.new_context(**context_args, storage_state=state)
+    """
+    
+    # Where snapshots live and how long they are used, read on first use unless given
+    directory = config_default('auth_state_dir')
+    ttl = config_default('auth_state_ttl')
+    
+    def __init__(self, directory: Optional[str] = None, ttl: Optional[float] = None):
+        if directory is not None:
+            self.directory = directory
+        if ttl is not None:
+            self.ttl = ttl
+        self.stats = AuthStats()
+    
+    def path(self, email: str, target: str) -> str:
+        """Snapshot file of an identity"""
+        digest = hashlib.sha1(f"{email}\n{target}".encode()).hexdigest()[:10]
+        name = re.sub(r"[^A-Za-z0-9]+", "_", f"{email.split('@')[0]}_{target}").strip("_")
+        return os.path.join(self.directory, f"{name}_{digest}.json")
+    
+    def age(self, path: str) -> Optional[float]:
+        """Seconds since a snapshot was saved, or None when there is none"""
+        try:
+            return time.time() - os.path.getmtime(path)
+        except OSError:
+            return None
+    
+    def is_fresh(self, path: str) -> bool:
+        age = self.age(path)
+        return age is not None and age < self.ttl
+    
+    def get(self, browser: Browser, context_args: Dict, email: str, target: str,
+            sign_in: Callable[[BrowserContext], None]) -> str:
+        """
+        Path of a fresh snapshot for the identity, signing in first if needed
+        
+        Args:
+            context_args: Arguments for the context the sign-in runs in
+            target: Stable name of the site, e.g. from current_target()
+            sign_in: Signs in within the given context; raises on failure
+        """
+        path = self.path(email, target)
+        if self.is_fresh(path):
+            self.stats.reuses += 1
+            return path
+        
+        start = time.perf_counter()
+        context = browser.new_context(**context_args)
+        try:
+            sign_in(context)
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.tmp{os.getpid()}"
+            context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            context.close()
+        self.prune()
+        elapsed = time.perf_counter() - start
+        self.stats.sign_ins += 1
+        self.stats.sign_in_seconds += elapsed
+        logger.info(f"Signed in as {email} in {elapsed:.1f}s, storage state saved to {path}")
+        return path
+    
+    def new_context(self, browser: Browser, context_args: Dict, state_path: str) -> BrowserContext:
+        """A context starting from a snapshot's cookies and localStorage"""
+        self.stats.contexts += 1
+        return browser.new_context(**context_args, storage_state=state_path)
+    
+    def invalidate(self, email: str, target: str) -> None:
+        """Drop an identity's snapshot, e.g. after the site signed it out"""
+        try:
+            os.remove(self.path(email, target))
+        except OSError:
+            pass
+    
+    def prune(self) -> int:
+        """Delete snapshots, and temp files of crashed workers, older than the TTL"""
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if ".json" in name and not self.is_fresh(path):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+    
+    def summary(self) -> str:
+        return (
+            f"storage state: {self.stats.sign_ins} sign-ins "
+            f"({self.stats.sign_in_seconds:.1f}s), {self.stats.reuses} reused snapshots, "
+            f"{self.stats.contexts} signed-in contexts"
+        )
@@ -0,0 +1,203 @@
+# src/utils/context_pool.py
+"""
+Warm browser context pool
+Keeps pre-created contexts per worker and resets them between tests
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Browser, BrowserContext, Page
+
+from src.utils.logger import logger
+
+CLEAR_STORAGE_JS = """
+async () => {
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+    try {
+        const databases = await indexedDB.databases();
+        await Promise.all(databases.map(db => new Promise(resolve => {
+            const request = indexedDB.deleteDatabase(db.name);
+            request.onsuccess = request.onerror = request.onblocked = () => resolve();
+        })));
+    } catch (e) {}
+}
+"""
+
+# Served in place of a real page to reach an origin's storage during reset
+RESET_PATH = "/__context_pool_reset__"
+
+
+def _origin(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+@dataclass
+class PooledContext:
+    """A pooled context together with its warm page"""
+    context: BrowserContext
+    page: Page
+    uses: int = 0
+    # Origins its pages navigated to since the last reset
+    origins: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class PoolStats:
+    """Counters reported at session end"""
+    hits: int = 0
+    misses: int = 0
+    resets: int = 0
+    discarded: int = 0
+    create_seconds: float = 0.0
+    reset_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def avg_reset_ms(self) -> float:
+        return self.reset_seconds * 1000 / self.resets if self.resets else 0.0
+
+    @property
+    def avg_create_ms(self) -> float:
+        created = self.misses
+        return self.create_seconds * 1000 / created if created else 0.0
+
+
+class ContextPool:
+    """
+    Pool of warm browser contexts for a single worker
+    
+    Contexts are handed out with their page open and seed cookies in place.
+    On release the cookies and permissions are cleared, local, session and
+    IndexedDB storage is cleared for every origin the context's pages
+    visited, and the cookies are re-seeded, so the next test starts from
+    the same state as a freshly created context.
+    """
+    
+    def __init__(self, browser: Browser, context_args: Dict, cookies: Optional[List[Dict]] = None, size: int = 2):
+        self.browser = browser
+        self.context_args = context_args
+        self.cookies = cookies or []
+        self.size = size
+        self.stats = PoolStats()
+        self._idle: List[PooledContext] = []
+        
+    def warm(self) -> None:
+        """Pre-create contexts up to the pool size"""
+        while len(self._idle) < self.size:
+            self._idle.append(self._create())
+        logger.info(f"Context pool warmed with {len(self._idle)} contexts")
+        
+    def acquire(self) -> PooledContext:
+        """Hand out an idle context, creating one if the pool is empty"""
+        if self._idle:
+            self.stats.hits += 1
+            pooled = self._idle.pop()
+        else:
+            self.stats.misses += 1
+            start = time.perf_counter()
+            pooled = self._create()
+            self.stats.create_seconds += time.perf_counter() - start
+        pooled.uses += 1
+        return pooled
+        
+    def release(self, pooled: PooledContext) -> None:
+        """Reset a context and return it to the pool, or close it if it cannot be reused"""
+        if len(self._idle) >= self.size:
+            self._discard(pooled)
+            return
+            
+        start = time.perf_counter()
+        try:
+            self._reset(pooled)
+        except Exception as e:
+            logger.warning(f"Context reset failed, discarding context: {e}")
+            self._discard(pooled)
+            return
+        finally:
+            self.stats.resets += 1
+            self.stats.reset_seconds += time.perf_counter() - start
+        self._idle.append(pooled)
+        
+    def close(self) -> None:
+        """Close every idle context"""
+        while self._idle:
+            self._idle.pop().context.close()
+            
+    def summary(self) -> str:
+        """One-line report of pool effectiveness"""
+        return (
+            f"context pool: {self.stats.hits} hits, {self.stats.misses} misses "
+            f"({self.stats.hit_rate:.0%} hit rate), {self.stats.resets} resets "
+            f"avg {self.stats.avg_reset_ms:.1f} ms, cold create avg {self.stats.avg_create_ms:.1f} ms, "
+            f"{self.stats.discarded} discarded"
+        )
+        
+    def _create(self) -> PooledContext:
+        context = self.browser.new_context(**self.context_args)
+        if self.cookies:
+            context.add_cookies(self.cookies)
+        origins: Set[str] = set()
+        context.on("page", lambda page: page.on("framenavigated", lambda frame: self._visited(frame, origins)))
+        return PooledContext(context=context, page=context.new_page(), origins=origins)
+        
+    @staticmethod
+    def _visited(frame, origins: Set[str]) -> None:
+        # Storage of cross-site iframes is partitioned under the top-level site
+        if frame.parent_frame is None:
+            origin = _origin(frame.url)
+            if origin:
+                origins.add(origin)
+                
+    def _reset(self, pooled: PooledContext) -> None:
+        context = pooled.context
+        
+        # Keep only the warm page; popups and extra tabs go away
+        for extra in context.pages:
+            if extra is not pooled.page:
+                extra.close()
+        if pooled.page.is_closed():
+            pooled.page = context.new_page()
+        self._clear_storage(pooled)
+        pooled.page.goto("about:blank")
+        pooled.origins.clear()
+        
+        context.clear_cookies()
+        context.clear_permissions()
+        if self.cookies:
+            context.add_cookies(self.cookies)
+            
+    def _clear_storage(self, pooled: PooledContext) -> None:
+        """Clear storage on the page's current origin in place, then visit each other origin to clear it"""
+        page = pooled.page
+        current = _origin(page.url)
+        if current in pooled.origins:
+            page.evaluate(CLEAR_STORAGE_JS)
+        others = sorted(pooled.origins - {current})
+        if not others:
+            return
+        pattern = f"**{RESET_PATH}"
+        page.route(pattern, lambda route: route.fulfill(status=200, content_type="text/html", body="<html></html>"))
+        try:
+            for origin in others:
+                page.goto(origin + RESET_PATH)
+                page.evaluate(CLEAR_STORAGE_JS)
+        finally:
+            page.unroute(pattern)
+            
+    def _discard(self, pooled: PooledContext) -> None:
+        self.stats.discarded += 1
+        try:
+            pooled.context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close discarded context: {e}")
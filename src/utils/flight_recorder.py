@@ -0,0 +1,161 @@
+# src/utils/flight_recorder.py
+"""
+Failure-only diagnostics
+Keeps a rolling in-memory window of the last page-object actions,
+network events and DOM snapshots of a page, and writes it to a trace
+archive only when the test fails
+"""
+
+import json
+import os
+import re
+import time
+import zipfile
+from collections import deque
+from datetime import datetime
+from typing import Deque, Optional, Tuple
+
+from playwright.sync_api import Page
+
+from src.utils.logger import logger
+from src.utils.timing import profiler
+
+TRACE_DIR = os.path.join("reports", "traces")
+
+
+def trace_path(nodeid: str, directory: str = TRACE_DIR, suffix: str = ".zip") -> str:
+    """Archive file for one failed attempt of a test"""
+    name = re.sub(r"[^\w.\[\]-]+", "_", nodeid).strip("_")[:120]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return os.path.join(directory, f"{name}_{timestamp}{suffix}")
+
+
+class FlightRecorder:
+    """
+    Ring buffer of one page's recent activity
+    
+    Events are (perf_counter time, kind, text) tuples; appending one
+    is the whole cost of a passing test. The page's final HTML is read
+    only when the window is flushed, from the page still held at
+    teardown. Earlier documents are kept only with dom_snapshots > 0:
+    then each is snapshotted once, when the first page-object action on
+    it starts, which costs a content() round-trip in passing tests too.
+    
+    Usage:
+        recorder = FlightRecorder(size=300).attach(page)
+        ...
+        recorder.detach(page)
+        if failed:
+            recorder.flush(trace_path(nodeid))
+    """
+    
+    def __init__(self, size: int = 300, dom_snapshots: int = 0):
+        self.events: Deque[Tuple[float, str, str]] = deque(maxlen=size)
+        self.snapshots: Deque[Tuple[float, str, str]] = deque(maxlen=dom_snapshots)
+        self.recorded = 0
+        self._page: Optional[Page] = None
+        self._start = time.perf_counter()
+        self._navigated = False
+        self._handlers = (
+            ("request", self._on_request),
+            ("response", self._on_response),
+            ("requestfailed", self._on_request_failed),
+            ("framenavigated", self._on_navigated),
+            ("console", self._on_console),
+            ("pageerror", self._on_page_error),
+        )
+    
+    @property
+    def dropped(self) -> int:
+        """Events that fell out of the window"""
+        return self.recorded - len(self.events)
+    
+    def attach(self, page: Page) -> 'FlightRecorder':
+        self._page = page
+        for event, handler in self._handlers:
+            page.on(event, handler)
+        profiler.observer = self.action
+        return self
+    
+    def detach(self, page: Page) -> None:
+        for event, handler in self._handlers:
+            page.remove_listener(event, handler)
+        if profiler.observer == self.action:
+            profiler.observer = None
+    
+    def record(self, kind: str, text: str) -> None:
+        self.recorded += 1
+        self.events.append((time.perf_counter(), kind, text))
+    
+    def action(self, step: str) -> None:
+        """Record a page-object action, snapshotting the document it acts on if it is new"""
+        if self._navigated and self.snapshots.maxlen:
+            self.snapshot()
+        self.record("action", step)
+    
+    def snapshot(self) -> None:
+        """Keep the page's current HTML among the last dom_snapshots documents"""
+        snapshot = self._capture()
+        if snapshot is not None:
+            self._navigated = False
+            self.snapshots.append(snapshot)
+    
+    def _capture(self) -> Optional[Tuple[float, str, str]]:
+        """The page's current HTML; None while a navigation tears the document down"""
+        try:
+            return time.perf_counter(), self._page.url, self._page.content()
+        except Exception:
+            return None
+    
+    def flush(self, path: str, reason: str = "") -> str:
+        """
+        Write the window to a zip archive
+        
+        The archive holds manifest.json, events.jsonl and one HTML file per
+        DOM snapshot, the last taken at flush time.
+        """
+        kept = list(self.snapshots)
+        if self._page is not None and not self._page.is_closed():
+            final = self._capture()
+            if final is not None:
+                kept.append(final)
+        
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        snapshots = []
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("events.jsonl", "".join(
+                json.dumps({"t": round(t - self._start, 4), "kind": kind, "text": text}) + "\n"
+                for t, kind, text in self.events
+            ))
+            for number, (t, url, html) in enumerate(kept, 1):
+                name = f"dom/{number:02d}.html"
+                archive.writestr(name, html)
+                snapshots.append({"t": round(t - self._start, 4), "url": url, "file": name})
+            archive.writestr("manifest.json", json.dumps({
+                "reason": reason,
+                "events": len(self.events),
+                "dropped": self.dropped,
+                "snapshots": snapshots,
+            }, indent=2))
+        logger.info(f"Flight recorder wrote {len(self.events)} events, {len(snapshots)} DOM snapshots to {path}")
+        return path
+    
+    def _on_request(self, request) -> None:
+        self.record("request", f"{request.method} {request.url}")
+    
+    def _on_response(self, response) -> None:
+        self.record("response", f"{response.status} {response.url}")
+    
+    def _on_request_failed(self, request) -> None:
+        self.record("requestfailed", f"{request.method} {request.url} {request.failure}")
+    
+    def _on_navigated(self, frame) -> None:
+        if frame.parent_frame is None:
+            self._navigated = True
+            self.record("navigation", frame.url)
+    
+    def _on_console(self, message) -> None:
+        self.record(f"console.{message.type}", message.text)
+    
+    def _on_page_error(self, error) -> None:
+        self.record("pageerror", str(error))
@@ -0,0 +1,483 @@
+# src/utils/impact.py
+"""
+Change-impact test selection
+Maps each test to the modules it imports, the page-object methods it
+calls and the config fields its code reads, so a git diff selects only
+the tests it can affect, and tests unchanged since their last green run
+can be skipped
+
+Usage:
+    python -m src.utils.impact [--base origin/main]
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import posixpath
+import re
+import subprocess
+import sys
+from typing import Dict, Iterable, List, Optional, Set
+
+DEFAULT_CACHE_PATH = os.path.join("reports", "impact.json")
+
+# Symbol for a change outside any function or config field
+MODULE = "<module>"
+
+# Fields and properties of this class are matched against config.<name> reads
+CONFIG_CLASS = "TestConfig"
+
+# Changes to these affect every test
+GLOBAL_FILES = ("conftest.py", "pytest.ini", "requirements.txt", "setup.cfg", "pyproject.toml")
+
+# Config fields naming data files or directories that tests read
+DATA_SETTINGS = ("query_matrix", "replay_dir")
+
+# Directory next to a test file holding the data files it names
+FIXTURES_DIR = "fixtures"
+
+_HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+_CONFIG_FIELD = re.compile(r"\bconfig\.([a-z_][a-z0-9_]*)")
+
+
+def _normalize(path: str, root: str) -> str:
+    return os.path.relpath(os.path.abspath(path), root).replace(os.sep, "/")
+
+
+class DependencyGraph:
+    """Static import graph of the project's own modules"""
+    
+    def __init__(self, root: str = ".", package: str = "src", data: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            root: Project root
+            package: Top-level package whose modules are followed
+            data: Config field -> data file or directory it names; read
+                from config on first use when omitted
+        """
+        self.root = os.path.abspath(root)
+        self.package = package
+        self._data = data
+        self._imports: Dict[str, Set[str]] = {}
+        self._closures: Dict[str, Set[str]] = {}
+        self._fields: Dict[str, Set[str]] = {}
+        self._data_files: Dict[str, Set[str]] = {}
+    
+    @property
+    def data(self) -> Dict[str, str]:
+        if self._data is None:
+            from src.config.config import config
+            self._data = {name: getattr(config, name) for name in DATA_SETTINGS}
+        return self._data
+    
+    def module_file(self, module: str) -> Optional[str]:
+        """Project-relative file of a dotted module name, or None outside the package"""
+        if module != self.package and not module.startswith(self.package + "."):
+            return None
+        base = os.path.join(self.root, *module.split("."))
+        for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+            if os.path.exists(candidate):
+                return _normalize(candidate, self.root)
+        return None
+    
+    def imports(self, path: str) -> Set[str]:
+        """Project files imported directly by a file"""
+        if path in self._imports:
+            return self._imports[path]
+        found: Set[str] = set()
+        tree = self._parse(path)
+        if tree is not None:
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    names = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                    # "from pkg import mod" may name a submodule
+                    names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+                else:
+                    continue
+                for name in names:
+                    target = self.module_file(name)
+                    if target and target != path:
+                        found.add(target)
+        self._imports[path] = found
+        return found
+    
+    def closure(self, path: str) -> Set[str]:
+        """The file plus every project file it imports, transitively"""
+        if path in self._closures:
+            return self._closures[path]
+        seen = {path}
+        pending = [path]
+        while pending:
+            for target in self.imports(pending.pop()):
+                if target not in seen:
+                    seen.add(target)
+                    pending.append(target)
+        self._closures[path] = seen
+        return seen
+    
+    def config_fields(self, path: str) -> Set[str]:
+        """config.<field> names read anywhere in the file's import closure"""
+        if path not in self._fields:
+            fields: Set[str] = set()
+            for target in self.closure(path):
+                fields.update(_CONFIG_FIELD.findall(self._read(target)))
+            self._fields[path] = fields
+        return self._fields[path]
+    
+    def suite_files(self, path: str) -> Set[str]:
+        """Suite-wide files a test file runs under: conftest.py files above it and the root's GLOBAL_FILES"""
+        found = {name for name in GLOBAL_FILES if os.path.isfile(os.path.join(self.root, name))}
+        directory = posixpath.dirname(path)
+        while directory:
+            conftest = posixpath.join(directory, "conftest.py")
+            if os.path.isfile(os.path.join(self.root, conftest)):
+                found.add(conftest)
+            directory = posixpath.dirname(directory)
+        return found
+    
+    def data_files(self, path: str) -> Set[str]:
+        """
+        Data files a test file reads: files in the fixtures directory next
+        to it that its source names, and the files behind data settings
+        read anywhere in its import closure
+        """
+        if path in self._data_files:
+            return self._data_files[path]
+        source = self._read(path)
+        found = {
+            target for target in self._files(posixpath.join(posixpath.dirname(path), FIXTURES_DIR))
+            if posixpath.basename(target) in source
+        }
+        fields = self.config_fields(path)
+        for field, location in self.data.items():
+            if field in fields and location:
+                found.update(self._files(_normalize(os.path.join(self.root, location), self.root)))
+        self._data_files[path] = found
+        return found
+    
+    def fingerprint(self, path: str, extra: Iterable[str] = (), target: str = "") -> str:
+        """
+        Hash of everything a test file depends on
+        
+        Args:
+            path: Test file
+            extra: Further project files to include
+            target: What the test runs against, e.g. the stand-in or a
+                replay mode; a green result elsewhere says nothing here
+        """
+        digest = hashlib.sha1(target.encode())
+        files = self.closure(path) | self.suite_files(path) | self.data_files(path) | set(extra)
+        for name in sorted(files):
+            digest.update(name.encode())
+            try:
+                with open(os.path.join(self.root, name), "rb") as f:
+                    digest.update(f.read())
+            except OSError:
+                pass
+        return digest.hexdigest()[:16]
+    
+    def _files(self, path: str) -> Set[str]:
+        """A project file, or every file below a project directory"""
+        full = os.path.join(self.root, path)
+        if os.path.isfile(full):
+            return {path}
+        found = set()
+        for directory, _, names in os.walk(full):
+            found.update(_normalize(os.path.join(directory, name), self.root) for name in names)
+        return found
+    
+    def _read(self, path: str) -> str:
+        try:
+            with open(os.path.join(self.root, path), encoding="utf-8") as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return ""
+    
+    def _parse(self, path: str) -> Optional[ast.AST]:
+        try:
+            return ast.parse(self._read(path))
+        except SyntaxError:
+            return None
+
+
+def changed_lines(base: str, root: str = ".") -> Dict[str, Set[int]]:
+    """
+    Lines changed in the working tree since a git revision
+    
+    Returns:
+        Project-relative path to new-side line numbers; deleted and
+        untracked files map to an empty set, meaning the whole file
+    """
+    diff = subprocess.run(
+        ["git", "diff", "-U0", "--no-color", "--no-renames", base, "--"],
+        cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+    changes: Dict[str, Set[int]] = {}
+    current: Optional[str] = None
+    previous: Optional[str] = None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            previous = line[6:] if line.startswith("--- a/") else None
+        elif line.startswith("+++ "):
+            current = line[6:] if line.startswith("+++ b/") else previous
+            if current is not None:
+                changes.setdefault(current, set())
+        elif current is not None:
+            match = _HUNK.match(line)
+            if match:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                # A pure deletion is attributed to the line it happened before
+                changes[current].update(range(start, start + max(count, 1)))
+    
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard"],
+        cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+    for path in untracked.splitlines():
+        changes[path] = set()
+    return changes
+
+
+def changed_symbols(path: str, lines: Set[int], root: str = ".") -> Set[str]:
+    """
+    Qualified names of the functions that own the changed lines
+    
+    Changed config fields come back as 'config.<field>'. Lines outside
+    any function or config field, or a whole-file change, give MODULE.
+    """
+    try:
+        with open(os.path.join(root, path), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return {MODULE}
+    if not lines:
+        return {MODULE}
+    
+    spans: List = []
+    
+    def visit(node, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                name = f"{prefix}{child.name}"
+                if isinstance(child, ast.ClassDef):
+                    visit(child, name + ".")
+                else:
+                    spans.append((start, child.end_lineno, name))
+            elif prefix == f"{CONFIG_CLASS}." and isinstance(child, (ast.Assign, ast.AnnAssign)):
+                targets = child.targets if isinstance(child, ast.Assign) else [child.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        spans.append((child.lineno, child.end_lineno, f"config.{target.id}"))
+    
+    visit(tree, "")
+    symbols = set()
+    for line in lines:
+        owners = [span for span in spans if span[0] <= line <= span[1]]
+        # Innermost owner wins
+        symbols.add(max(owners, key=lambda span: span[0])[2] if owners else MODULE)
+    return symbols
+
+
+def _qualname(code, local_vars: Dict, global_vars: Dict) -> str:
+    """Qualified name of the function running a code object"""
+    return getattr(code, "co_qualname", None) or _method_qualname(code, local_vars, global_vars)
+
+
+def _method_qualname(code, local_vars: Dict, global_vars: Dict) -> str:
+    """
+    Qualified name without co_qualname, which Python 3.10 lacks
+    
+    Methods are named after the class in the MRO of self or cls that
+    defines them. Static methods, which have neither, are looked up in
+    the classes of their module; anything else keeps its plain name.
+    """
+    owner = local_vars.get("self", local_vars.get("cls"))
+    if owner is not None:
+        for klass in (owner if isinstance(owner, type) else type(owner)).__mro__:
+            if _defines(klass, code):
+                return f"{klass.__qualname__}.{code.co_name}"
+    if _defines_function(global_vars.get(code.co_name), code):
+        return code.co_name
+    module = global_vars.get("__name__")
+    classes = [value for value in global_vars.values() if isinstance(value, type) and value.__module__ == module]
+    seen = set()
+    while classes:
+        klass = classes.pop()
+        if klass in seen:
+            continue
+        seen.add(klass)
+        if _defines(klass, code):
+            return f"{klass.__qualname__}.{code.co_name}"
+        # Nested classes
+        classes.extend(value for value in vars(klass).values() if isinstance(value, type) and value.__module__ == module)
+    return code.co_name
+
+
+def _defines(klass: type, code) -> bool:
+    """Whether a class body defines the function running a code object"""
+    attr = klass.__dict__.get(code.co_name)
+    return _defines_function(getattr(attr, "fget", None) or getattr(attr, "__func__", attr), code)
+
+
+def _defines_function(func, code) -> bool:
+    """Whether func, or a function it wraps, runs a code object"""
+    while getattr(func, "__code__", None) is not code and hasattr(func, "__wrapped__"):
+        func = func.__wrapped__
+    return getattr(func, "__code__", None) is code
+
+
+class CallRecorder:
+    """Records which project functions a test calls, via sys.setprofile"""
+    
+    def __init__(self, root: str = ".", package: str = "src"):
+        self.prefix = os.path.join(os.path.abspath(root), package) + os.sep
+        self.tests_dir = os.path.join(self.prefix, "tests") + os.sep
+        self.root = os.path.abspath(root)
+        self.calls: Set[str] = set()
+        self._files: Dict[str, Optional[str]] = {}
+        # Qualified names by code object; finding one can mean scanning a module
+        self._names: Dict[object, str] = {}
+    
+    def _profile(self, frame, event, arg) -> None:
+        if event != "call":
+            return
+        filename = frame.f_code.co_filename
+        path = self._files.get(filename, False)
+        if path is False:
+            inside = filename.startswith(self.prefix) and not filename.startswith(self.tests_dir)
+            path = self._files[filename] = _normalize(filename, self.root) if inside else None
+        if path is None:
+            return
+        qualname = self._names.get(frame.f_code)
+        if qualname is None:
+            qualname = self._names[frame.f_code] = _qualname(frame.f_code, frame.f_locals, frame.f_globals)
+        # The recorder's own frames are not the test's
+        if not qualname.startswith("CallRecorder."):
+            self.calls.add(f"{path}::{qualname}")
+    
+    def start(self) -> None:
+        """Start or resume recording; calls accumulate until the recorder is discarded"""
+        sys.setprofile(self._profile)
+    
+    def stop(self) -> Set[str]:
+        sys.setprofile(None)
+        return self.calls
+
+
+class ImpactCache:
+    """Per-test outcome, dependency fingerprint and recorded calls, kept across runs"""
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self.tests: Dict[str, Dict] = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.tests = json.load(f).get("tests", {})
+        except (OSError, ValueError):
+            pass
+    
+    def is_green(self, nodeid: str, fingerprint: str) -> bool:
+        entry = self.tests.get(nodeid)
+        return bool(entry) and entry.get("outcome") == "passed" and entry.get("fingerprint") == fingerprint
+    
+    def calls(self, nodeid: str) -> Optional[Set[str]]:
+        entry = self.tests.get(nodeid)
+        return set(entry["calls"]) if entry and entry.get("calls") is not None else None
+    
+    @classmethod
+    def merge_into(cls, path: str, delta: Dict[str, Dict]) -> None:
+        """Update entries with a session's results, keeping recorded calls a session did not re-record"""
+        if not delta:
+            return
+        cache = cls(path)
+        for nodeid, entry in delta.items():
+            merged = dict(cache.tests.get(nodeid, {}))
+            merged.update({key: value for key, value in entry.items() if value is not None})
+            cache.tests[nodeid] = merged
+        
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "tests": dict(sorted(cache.tests.items()))}, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+class ImpactSelector:
+    """
+    Decides which tests a set of changes can affect
+    
+    A test is affected when its own file or a suite-wide file changed,
+    or a file in its import closure changed in a way that reaches it:
+    module-level code always does; a function only if the test was
+    recorded calling it (or has no recording yet); a config field only
+    if code in the closure reads it.
+    """
+    
+    def __init__(self, graph: DependencyGraph, cache: ImpactCache, changes: Dict[str, Set[str]]):
+        self.graph = graph
+        self.cache = cache
+        # path -> changed symbols
+        self.changes = changes
+    
+    @classmethod
+    def from_diff(cls, base: str, root: str = ".", cache_path: str = DEFAULT_CACHE_PATH,
+                  graph: Optional[DependencyGraph] = None) -> 'ImpactSelector':
+        changes = {
+            path: changed_symbols(path, lines, root) if path.endswith(".py") else {MODULE}
+            for path, lines in changed_lines(base, root).items()
+        }
+        return cls(graph or DependencyGraph(root), ImpactCache(cache_path), changes)
+    
+    def is_affected(self, nodeid: str, test_path: str) -> bool:
+        closure = self.graph.closure(test_path)
+        recorded = self.cache.calls(nodeid)
+        for path, symbols in self.changes.items():
+            if path == test_path or os.path.basename(path) in GLOBAL_FILES:
+                return True
+            if path not in closure:
+                # Data files such as saved pages, named in the test, or the query matrix
+                if not path.endswith(".py") and (
+                    path in self.graph.data_files(test_path) or os.path.basename(path) in self.graph._read(test_path)
+                ):
+                    return True
+                continue
+            for symbol in symbols:
+                if symbol == MODULE:
+                    return True
+                owner, _, attribute = symbol.rpartition(".")
+                if owner in ("config", CONFIG_CLASS):
+                    if attribute in self.graph.config_fields(test_path):
+                        return True
+                    continue
+                if recorded is None or f"{path}::{symbol}" in recorded:
+                    return True
+        return False
+    
+    def select(self, tests: Dict[str, str]) -> List[str]:
+        """Node IDs affected by the changes, from a node ID -> test file mapping"""
+        return [nodeid for nodeid, path in tests.items() if self.is_affected(nodeid, path)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base", default="HEAD", help="Git revision to diff the working tree against")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Impact cache written by pytest --impact-record")
+    args = parser.parse_args()
+    
+    selector = ImpactSelector.from_diff(args.base, cache_path=args.cache)
+    for path, symbols in sorted(selector.changes.items()):
+        print(f"changed {path}: {', '.join(sorted(symbols))}")
+    known = {nodeid: nodeid.split("::")[0] for nodeid in selector.cache.tests}
+    affected = selector.select(known)
+    print(f"\n{len(affected)} of {len(known)} known tests affected")
+    for nodeid in affected:
+        print(f"  {nodeid}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
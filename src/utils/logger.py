@@ -1,55 +1,222 @@
 # src/utils/logger.py
 """
 Logger configuration for the test framework
-Provides consistent logging across all components
+Provides consistent logging across all components through a single
+background writer per process
 """
 
+import atexit
+import glob
+import heapq
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+from collections import Counter
 from datetime import datetime
-import os
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+LOG_DIR = os.path.join("reports", "logs")
+
+# Records waiting for the writer thread; DEBUG records are dropped and
+# counted once the queue is this full, everything else waits for room
+QUEUE_SIZE = 10000
+NOISE_HIGH_WATER = 8000
+
+# Shared by every worker of one run so their files can be merged
+run_id = os.getenv("LOG_RUN_ID") or datetime.now().strftime('%Y%m%d_%H%M%S')
+worker_id = os.getenv("LOG_WORKER") or os.getenv("PYTEST_XDIST_WORKER") or "main"
+
+# Test currently running in this process, stamped on every record
+current_test = ""
+
+_lock = threading.Lock()
+_handler: Optional['BoundedQueueHandler'] = None
+_listener: Optional[QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="microseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "worker": getattr(record, "worker", worker_id),
+            "test": getattr(record, "test", ""),
+            "func": record.funcName,
+            "line": record.lineno,
+            "msg": record.getMessage(),
+        })
+
+
+class LazyFileHandler(logging.FileHandler):
+    """File handler that creates its directory and file on the first write"""
+
+    def __init__(self, filename: str):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler that sheds DEBUG noise instead of blocking the test"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped: Counter = Counter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.worker = worker_id
+        record.test = current_test
+        return super().prepare(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno <= logging.DEBUG and self.queue.qsize() >= NOISE_HIGH_WATER:
+            self.dropped[record.name] += 1
+            return
+        self.queue.put(record)
+
+    def emit_dropped_summary(self) -> None:
+        """Replace the dropped records with one warning naming their loggers"""
+        if not self.dropped:
+            return
+        counts = ", ".join(f"{name}={count}" for name, count in self.dropped.most_common())
+        total = sum(self.dropped.values())
+        self.dropped.clear()
+        record = logging.LogRecord(
+            "AmazonTest", logging.WARNING, __file__, 0,
+            f"Dropped {total} debug records under load ({counts})", None, None
+        )
+        self.handle(record)
+
+
+class DeferredHandler(logging.Handler):
+    """Starts the background writer when the first record gets through, not at import"""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        return _install().handle(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        _install().emit(record)
+
+
+_deferred = DeferredHandler()
+
+
+def worker_log_path(worker: str = None) -> str:
+    """JSON lines file written by one worker of the current run"""
+    return os.path.join(LOG_DIR, f"test_run_{run_id}_{worker or worker_id}.jsonl")
+
+
+def _install() -> BoundedQueueHandler:
+    """Start the background writer once per process"""
+    global _handler, _listener
+    with _lock:
+        if _handler is not None:
+            return _handler
+
+        # Console handler
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%H:%M:%S'
+        ))
+
+        # File handler, one JSON lines file per worker
+        file_handler = LazyFileHandler(worker_log_path())
+        file_handler.setFormatter(JsonLinesFormatter())
+
+        log_queue = queue.Queue(maxsize=QUEUE_SIZE)
+        _handler = BoundedQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_shutdown)
+        return _handler
+
 
 def setup_logger(name: str = "AmazonTest") -> logging.Logger:
     """
-    Set up logger with console and file handlers
-    
+    Get a logger that writes through the shared background writer
+
+    The writer thread starts, and the log file is created, only once
+    something is actually logged.
+
     Args:
         name: Logger name
-        
+
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(name)
-    
-    # Only add handlers if they don't exist
-    if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_format = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%H:%M:%S'
-        )
-        console_handler.setFormatter(console_format)
-        logger.addHandler(console_handler)
-        
-        # File handler
-        log_dir = os.path.join("reports", "logs")
-        os.makedirs(log_dir, exist_ok=True)
-        
-        log_file = os.path.join(
-            log_dir, 
-            f"test_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        )
-        file_handler = logging.FileHandler(log_file)
-        file_format = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-        )
-        file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
-    
+
+    # Only add the shared handler once
+    if _deferred not in logger.handlers:
+        logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+        logger.addHandler(_deferred)
+
     return logger
 
+
+def set_current_test(nodeid: str) -> None:
+    """Stamp subsequent records with the running test"""
+    global current_test
+    current_test = nodeid
+
+
+def flush_logs() -> None:
+    """Write out everything queued so far"""
+    with _lock:
+        if _handler is None:
+            return
+        _handler.emit_dropped_summary()
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener.start()
+
+
+def _shutdown() -> None:
+    with _lock:
+        if _handler is None:
+            return
+        _handler.emit_dropped_summary()
+        _listener.stop()
+
+
+def merge_worker_logs(remove_parts: bool = True) -> Optional[str]:
+    """
+    Merge the per-worker files of this run into one time-ordered file
+
+    Returns:
+        Path of the merged file, or None when no worker wrote anything
+    """
+    parts = sorted(glob.glob(os.path.join(LOG_DIR, f"test_run_{run_id}_*.jsonl")))
+    if not parts:
+        return None
+
+    merged_path = os.path.join(LOG_DIR, f"test_run_{run_id}.jsonl")
+    files = [open(part, encoding="utf-8") for part in parts]
+    try:
+        # Each worker has a single writer, so every file is already in time order
+        streams: List = [((json.loads(line)["ts"], line) for line in f if line.strip()) for f in files]
+        with open(merged_path, "w", encoding="utf-8") as out:
+            for _, line in heapq.merge(*streams):
+                out.write(line if line.endswith("\n") else line + "\n")
+    finally:
+        for f in files:
+            f.close()
+
+    if remove_parts:
+        for part in parts:
+            os.remove(part)
+    return merged_path
+
 # Create a default logger instance
-logger = setup_logger()
\ No newline at end of file
+logger = setup_logger()
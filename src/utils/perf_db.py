@@ -0,0 +1,256 @@
+# src/utils/perf_db.py
+"""
+Historical performance database
+Collects per-test, per-step and per-navigation timings during a run,
+stores them in SQLite, and compares the latest run's p50/p95 with a
+rolling baseline of earlier runs
+
+Usage:
+    python -m src.utils.perf_db [--window 10] [--threshold 0.2] [--min-delta-ms 50] [--list]
+"""
+
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.config.config import config, config_default
+
+DEFAULT_DB_PATH = os.path.join("reports", "perf.sqlite")
+
+# Sample kinds
+TEST = "test"
+STEP = "step"
+NAVIGATION = "navigation"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    started REAL NOT NULL,
+    git_sha TEXT,
+    target TEXT NOT NULL,
+    browser TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run INTEGER NOT NULL REFERENCES runs(id),
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    test TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_by_name ON samples (kind, name, run);
+"""
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class PerfCollector:
+    """
+    Timing samples of the current process, attributed to the running test
+    
+    When disabled, record() costs one attribute check.
+    """
+    
+    # Whether config.perf_db names a database unless given, read on first use
+    enabled = config_default('perf_db', bool)
+    
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is not None:
+            self.enabled = enabled
+        self.current_test = ""
+        # (kind, name, test, seconds)
+        self.samples: List[Tuple[str, str, str, float]] = []
+    
+    def record(self, kind: str, name: str, seconds: Optional[float], test: Optional[str] = None) -> None:
+        if self.enabled and seconds is not None:
+            self.samples.append((kind, name, self.current_test if test is None else test, seconds))
+    
+    def reset(self) -> None:
+        self.samples.clear()
+
+
+perf = PerfCollector()
+
+
+@dataclass
+class Comparison:
+    """Latest run against the baseline for one timing"""
+    kind: str
+    name: str
+    samples: int
+    baseline_samples: int
+    p50: float
+    p95: float
+    baseline_p50: float
+    baseline_p95: float
+    regressed: bool = False
+    
+    @property
+    def p50_change(self) -> float:
+        return self.p50 / self.baseline_p50 - 1 if self.baseline_p50 else 0.0
+    
+    @property
+    def p95_change(self) -> float:
+        return self.p95 / self.baseline_p95 - 1 if self.baseline_p95 else 0.0
+
+
+def current_target() -> str:
+    """What the timings were measured against; stand-in ports change every run"""
+    if config.standin:
+        return "standin"
+    return config.base_url.split("://", 1)[-1].split("/", 1)[0]
+
+
+def git_sha() -> Optional[str]:
+    import subprocess
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class PerfDatabase:
+    """Runs and their timing samples in one SQLite file"""
+    
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        import sqlite3
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Shard workers may finish together; wait for the write lock
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.executescript(SCHEMA)
+    
+    def __enter__(self) -> 'PerfDatabase':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        self.connection.close()
+    
+    def add_run(self, samples: Sequence[Sequence], run_id: str, target: Optional[str] = None,
+                browser: Optional[str] = None, sha: Optional[str] = None) -> Optional[int]:
+        """Store one run's samples in a single transaction; returns the run's row ID"""
+        if not samples:
+            return None
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (run_id, started, git_sha, target, browser) VALUES (?, ?, ?, ?, ?)",
+                (run_id, time.time(), sha or git_sha(), target or current_target(), browser or config.browser_type),
+            )
+            run = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO samples (run, kind, name, test, seconds) VALUES (?, ?, ?, ?, ?)",
+                [(run, kind, name, test, seconds) for kind, name, test, seconds in samples],
+            )
+        return run
+    
+    def runs(self, limit: int = 20) -> List[Tuple]:
+        """(id, run_id, started, git_sha, target, browser, samples), newest first"""
+        return self.connection.execute(
+            "SELECT r.id, r.run_id, r.started, r.git_sha, r.target, r.browser, COUNT(s.run) "
+            "FROM runs r LEFT JOIN samples s ON s.run = r.id GROUP BY r.id ORDER BY r.id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    
+    def samples(self, runs: Sequence[int]) -> Dict[Tuple[str, str], List[float]]:
+        """Seconds per (kind, name) over the given runs"""
+        found: Dict[Tuple[str, str], List[float]] = {}
+        if not runs:
+            return found
+        placeholders = ",".join("?" * len(runs))
+        for kind, name, seconds in self.connection.execute(
+            f"SELECT kind, name, seconds FROM samples WHERE run IN ({placeholders})", tuple(runs)
+        ):
+            found.setdefault((kind, name), []).append(seconds)
+        return found
+    
+    def compare(self, run: Optional[int] = None, window: int = 10, threshold: float = 0.2,
+                min_delta: float = 0.05, min_samples: int = 3) -> List[Comparison]:
+        """
+        Compare a run (default the latest) with the runs before it
+        
+        The baseline is the previous window runs against the same target
+        and browser. A timing regresses when its p50 or p95 grew by more
+        than threshold and by more than min_delta seconds; timings with
+        fewer than min_samples baseline samples are reported but never
+        fail.
+        """
+        row = self.connection.execute(
+            "SELECT id, target, browser FROM runs WHERE id = COALESCE(?, (SELECT MAX(id) FROM runs))", (run,)
+        ).fetchone()
+        if row is None:
+            return []
+        run, target, browser = row
+        baseline_runs = [rid for (rid,) in self.connection.execute(
+            "SELECT id FROM runs WHERE id < ? AND target = ? AND browser = ? ORDER BY id DESC LIMIT ?",
+            (run, target, browser, window),
+        )]
+        current = self.samples([run])
+        baseline = self.samples(baseline_runs)
+        
+        comparisons = []
+        for (kind, name), values in sorted(current.items()):
+            history = baseline.get((kind, name), [])
+            comparison = Comparison(
+                kind, name, len(values), len(history),
+                percentile(values, 50), percentile(values, 95),
+                percentile(history, 50), percentile(history, 95),
+            )
+            if len(history) >= min_samples:
+                comparison.regressed = any(
+                    now - before > min_delta and now > before * (1 + threshold)
+                    for now, before in ((comparison.p50, comparison.baseline_p50),
+                                        (comparison.p95, comparison.baseline_p95))
+                )
+            comparisons.append(comparison)
+        return comparisons
+
+
+def main() -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=config.perf_db or DEFAULT_DB_PATH, help="SQLite file written by the suite")
+    parser.add_argument("--run", type=int, default=None, help="Run row ID to check; default the latest")
+    parser.add_argument("--window", type=int, default=10, help="Earlier runs in the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative growth of p50/p95")
+    parser.add_argument("--min-delta-ms", type=float, default=50, help="Ignore growth below this many ms")
+    parser.add_argument("--min-samples", type=int, default=3, help="Baseline samples needed to gate a timing")
+    parser.add_argument("--list", action="store_true", help="List recent runs and exit")
+    args = parser.parse_args()
+    
+    with PerfDatabase(args.db) as db:
+        if args.list:
+            for rid, run_id, started, sha, target, browser, count in db.runs():
+                stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(started))
+                print(f"{rid:5d}  {stamp}  {run_id}  {sha or '-':<9} {target:<24} {browser:<9} {count} samples")
+            return 0
+        comparisons = db.compare(args.run, args.window, args.threshold, args.min_delta_ms / 1000, args.min_samples)
+    
+    if not comparisons:
+        print(f"No runs in {args.db}")
+        return 0
+    print(f"{'kind':<10} {'name':<60} {'p50 ms':>9} {'base':>9} {'p95 ms':>9} {'base':>9}  n/base")
+    for c in comparisons:
+        flag = "  REGRESSED" if c.regressed else ""
+        print(f"{c.kind:<10} {c.name[-60:]:<60} {c.p50 * 1000:>9.1f} {c.baseline_p50 * 1000:>9.1f} "
+              f"{c.p95 * 1000:>9.1f} {c.baseline_p95 * 1000:>9.1f}  {c.samples}/{c.baseline_samples}{flag}")
+    regressed = [c for c in comparisons if c.regressed]
+    print(f"\n{len(regressed)} of {len(comparisons)} timings regressed past {args.threshold:.0%}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
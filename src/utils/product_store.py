@@ -0,0 +1,202 @@
+# src/utils/product_store.py
+"""
+Typed product records and a column-oriented result store
+Keeps crawled search results in compact arrays instead of one dict per
+product, so aggregates over thousands of results stay cheap
+"""
+
+import csv
+import math
+import statistics
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+# Stored in the float columns for a missing price or rating
+MISSING = float("nan")
+
+
+@dataclass(frozen=True, slots=True)
+class Product:
+    """One search result, as returned by SearchResultsPage.get_products"""
+    index: int
+    title: str
+    price: Optional[float]
+    rating: Optional[float]
+    is_prime: bool
+    is_sponsored: bool
+    query: str = ""
+    
+    @classmethod
+    def from_dict(cls, product: Dict, query: str = "") -> 'Product':
+        return cls(
+            product['index'], product['title'], product['price'], product['rating'],
+            product['is_prime'], product['is_sponsored'], product.get('query', query)
+        )
+    
+    def to_dict(self) -> Dict:
+        return {
+            'index': self.index,
+            'title': self.title,
+            'price': self.price,
+            'rating': self.rating,
+            'is_prime': self.is_prime,
+            'is_sponsored': self.is_sponsored,
+            'query': self.query,
+        }
+
+
+class ProductTable:
+    """
+    Product results stored column by column
+    
+    Numeric columns are typed arrays with NaN for missing values; titles
+    and queries are interned, so repeated strings are stored once.
+    Rows can be appended from product dicts or Product records, e.g.
+    straight from SearchResultsPage.iter_products.
+    """
+    
+    COLUMNS = ('query', 'index', 'title', 'price', 'rating', 'is_prime', 'is_sponsored')
+    
+    def __init__(self):
+        self.query: List[str] = []
+        self.index = array('l')
+        self.title: List[str] = []
+        self.price = array('d')
+        self.rating = array('d')
+        self.is_prime = array('B')
+        self.is_sponsored = array('B')
+    
+    @classmethod
+    def from_products(cls, products: Iterable[Union[Product, Dict]], query: str = "") -> 'ProductTable':
+        table = cls()
+        table.extend(products, query)
+        return table
+    
+    def append(self, product: Union[Product, Dict], query: str = "") -> None:
+        """Add one row from a Product or a get_products dict"""
+        if isinstance(product, dict):
+            product = Product.from_dict(product, query)
+        self.query.append(sys.intern(product.query or query))
+        self.index.append(product.index)
+        self.title.append(sys.intern(product.title))
+        self.price.append(MISSING if product.price is None else product.price)
+        self.rating.append(MISSING if product.rating is None else product.rating)
+        self.is_prime.append(product.is_prime)
+        self.is_sponsored.append(product.is_sponsored)
+    
+    def extend(self, products: Iterable[Union[Product, Dict]], query: str = "") -> None:
+        for product in products:
+            self.append(product, query)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def __getitem__(self, row: int) -> Product:
+        return Product(
+            self.index[row], self.title[row], _optional(self.price[row]), _optional(self.rating[row]),
+            bool(self.is_prime[row]), bool(self.is_sponsored[row]), self.query[row]
+        )
+    
+    def __iter__(self) -> Iterator[Product]:
+        for row in range(len(self)):
+            yield self[row]
+    
+    def rows(self, query: str) -> List[int]:
+        """Row numbers of one query's results"""
+        return [row for row, value in enumerate(self.query) if value == query]
+    
+    def price_stats(self, query: Optional[str] = None) -> Dict[str, float]:
+        """Count, missing count, min, max, mean and median of the known prices"""
+        prices = self._values(self.price, query)
+        total = len(self) if query is None else len(self.rows(query))
+        if not prices:
+            return {'count': 0, 'missing': total}
+        return {
+            'count': len(prices),
+            'missing': total - len(prices),
+            'min': min(prices),
+            'max': max(prices),
+            'mean': statistics.fmean(prices),
+            'median': statistics.median(prices),
+        }
+    
+    def rating_histogram(self, bucket: float = 0.5, query: Optional[str] = None) -> Dict[float, int]:
+        """Known ratings counted per bucket, keyed by the bucket's lower edge"""
+        # Ratings take few distinct values, so bucket the distinct ones only
+        counts: Dict[float, int] = {}
+        for rating, count in Counter(self._values(self.rating, query)).items():
+            edge = round(math.floor(rating / bucket + 1e-9) * bucket, 2)
+            counts[edge] = counts.get(edge, 0) + count
+        return dict(sorted(counts.items()))
+    
+    def sponsored_share(self, query: Optional[str] = None) -> float:
+        """Fraction of results marked Sponsored"""
+        return self._share(self.is_sponsored, query)
+    
+    def prime_share(self, query: Optional[str] = None) -> float:
+        """Fraction of results with a Prime badge"""
+        return self._share(self.is_prime, query)
+    
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, counting each distinct string once"""
+        size = sum(column.itemsize * len(column) for column in
+                   (self.index, self.price, self.rating, self.is_prime, self.is_sponsored))
+        size += sys.getsizeof(self.query) + sys.getsizeof(self.title)
+        size += sum(sys.getsizeof(text) for text in {id(t): t for t in self.title + self.query}.values())
+        return size
+    
+    def to_dicts(self) -> List[Dict]:
+        return [product.to_dict() for product in self]
+    
+    def to_csv(self, path: str) -> str:
+        """Write the table as CSV with a header row; missing values are empty"""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.COLUMNS)
+            for product in self:
+                writer.writerow([
+                    product.query, product.index, product.title,
+                    "" if product.price is None else product.price,
+                    "" if product.rating is None else product.rating,
+                    int(product.is_prime), int(product.is_sponsored),
+                ])
+        return path
+    
+    def to_parquet(self, path: str) -> str:
+        """Write the table as Parquet; needs the optional pyarrow package"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from e
+        
+        table = pa.table({
+            'query': pa.array(self.query, pa.string()).dictionary_encode(),
+            'index': pa.array(self.index.tolist(), pa.int64()),
+            'title': pa.array(self.title, pa.string()),
+            'price': pa.array(self.price.tolist(), pa.float64(), from_pandas=True),
+            'rating': pa.array(self.rating.tolist(), pa.float64(), from_pandas=True),
+            'is_prime': pa.array([bool(v) for v in self.is_prime], pa.bool_()),
+            'is_sponsored': pa.array([bool(v) for v in self.is_sponsored], pa.bool_()),
+        })
+        pq.write_table(table, path)
+        return path
+    
+    def _values(self, column: array, query: Optional[str]) -> List[float]:
+        """Non-missing values of a float column, optionally for one query"""
+        if query is None:
+            return [value for value in column if value == value]
+        return [column[row] for row in self.rows(query) if column[row] == column[row]]
+    
+    def _share(self, column: array, query: Optional[str]) -> float:
+        if query is None:
+            return sum(column) / len(column) if len(column) else 0.0
+        rows = self.rows(query)
+        return sum(column[row] for row in rows) / len(rows) if rows else 0.0
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if value != value else value
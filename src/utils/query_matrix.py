@@ -0,0 +1,83 @@
+# src/utils/query_matrix.py
+"""
+Data-driven search query matrix
+Loads search cases (term x sort option x page) from CSV or YAML and
+batches them so consecutive cases run on one page, each opened by URL
+"""
+
+import csv
+import itertools
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+
+@dataclass(frozen=True)
+class QueryCase:
+    """One results page to check"""
+    term: str
+    sort: Optional[str] = None
+    page: int = 1
+    
+    @property
+    def id(self) -> str:
+        return "-".join(filter(None, [self.term.replace(" ", "_"), self.sort, f"p{self.page}"]))
+
+
+def _case(row: Dict) -> QueryCase:
+    term = str(row.get("term") or "").strip()
+    if not term:
+        raise ValueError(f"Query matrix row without a term: {row}")
+    sort = str(row.get("sort") or "").strip() or None
+    return QueryCase(term, sort, int(row.get("page") or 1))
+
+
+def load_matrix(path: str) -> List[QueryCase]:
+    """
+    Cases from a CSV or YAML file, duplicates dropped, file order kept
+    
+    CSV files have a header with term and optionally sort and page
+    columns. YAML files hold either a list of such rows or 'terms',
+    'sorts' and 'pages' lists that are crossed. YAML needs the optional
+    PyYAML package.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [row for row in csv.DictReader(f) if any((value or "").strip() for value in row.values())]
+        cases = [_case(row) for row in rows]
+    elif extension in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("YAML query matrices need PyYAML: pip install pyyaml") from e
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or []
+        if isinstance(data, dict):
+            cases = [
+                QueryCase(str(term), sort or None, int(page))
+                for term, sort, page in itertools.product(
+                    data.get("terms", []), data.get("sorts") or [None], data.get("pages") or [1]
+                )
+            ]
+        else:
+            cases = [_case(row) for row in data]
+    else:
+        raise ValueError(f"Unsupported query matrix format: {path}")
+    return list(dict.fromkeys(cases))
+
+
+def batch_cases(cases: Iterable[QueryCase], size: int) -> List[List[QueryCase]]:
+    """
+    Split cases into batches that each run on one page
+    
+    Cases of a term stay together, ordered by sort option and page, so
+    a batch walks a term's pages in order; terms keep their file order.
+    """
+    cases = list(dict.fromkeys(cases))
+    order: Dict[str, int] = {}
+    for case in cases:
+        order.setdefault(case.term, len(order))
+    ordered = sorted(cases, key=lambda case: (order[case.term], case.sort or "", case.page))
+    size = max(1, size)
+    return [ordered[start:start + size] for start in range(0, len(ordered), size)]
@@ -0,0 +1,251 @@
+# src/utils/replay.py
+"""
+Network record/replay for hermetic runs
+Records every response of a test into a HAR archive and serves it back
+through route interception, so replayed tests never touch the network
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext, Route
+
+from src.utils.logger import logger
+
+RECORD = "record"
+STRICT = "strict"
+FALLBACK = "fallback"
+MODES = (RECORD, STRICT, FALLBACK)
+
+# Body is stored decoded, so these no longer describe it
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+_BROWSER_ID = re.compile(r"(?<=[\[-])(chromium|firefox|webkit)(?=[\]-])")
+
+
+class ReplayMissError(Exception):
+    """Raised when strict replay has no recording for a navigation"""
+
+
+def archive_path(archive_dir: str, nodeid: str) -> str:
+    """
+    Archive file for a test
+    
+    The browser parameter is dropped from the node ID so every engine
+    replays the same recording.
+    """
+    name = _BROWSER_ID.sub("", nodeid).replace("[]", "").replace("[-", "[").replace("-]", "]")
+    name = re.sub(r"[^\w.\[\]-]+", "_", name).strip("_")
+    return os.path.join(archive_dir, f"{name}.har")
+
+
+def normalize_url(url: str) -> str:
+    """Drop the fragment and give bare hosts a trailing slash, as the browser does"""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path or "/", parts.query, ""))
+
+
+def _request_key(method: str, url: str, post_data: Optional[bytes]) -> Tuple[str, str, str]:
+    digest = hashlib.sha1(post_data).hexdigest() if post_data else ""
+    return method.upper(), normalize_url(url), digest
+
+
+def _without_query(url: str) -> str:
+    parts = urlsplit(normalize_url(url))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+class HarArchive:
+    """Recorded request/response pairs in HAR 1.2 format"""
+    
+    def __init__(self, entries: Optional[List[Dict]] = None):
+        self.entries: List[Dict] = entries or []
+        self._exact: Dict[Tuple[str, str, str], List[Dict]] = {}
+        self._loose: Dict[Tuple[str, str], List[Dict]] = {}
+        self._served: Dict[int, int] = {}
+        for entry in self.entries:
+            self._index(entry)
+    
+    @classmethod
+    def load(cls, path: str) -> 'HarArchive':
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["log"]["entries"])
+    
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        har = {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "amazon-test-intelligence", "version": "1.0"},
+                "entries": self.entries,
+            }
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(har, f)
+    
+    def add(self, method: str, url: str, request_headers: Dict[str, str], post_data: Optional[bytes],
+            status: int, status_text: str, headers: List[Dict[str, str]], body: bytes) -> None:
+        """Append one exchange"""
+        mime_type = next((h["value"] for h in headers if h["name"].lower() == "content-type"), "")
+        entry = {
+            "startedDateTime": datetime.now(timezone.utc).isoformat(),
+            "time": 0,
+            "request": {
+                "method": method,
+                "url": url,
+                "httpVersion": "HTTP/1.1",
+                "cookies": [],
+                "headers": [{"name": k, "value": v} for k, v in request_headers.items()],
+                "queryString": [],
+                "headersSize": -1,
+                "bodySize": len(post_data) if post_data else 0,
+            },
+            "response": {
+                "status": status,
+                "statusText": status_text,
+                "httpVersion": "HTTP/1.1",
+                "cookies": [],
+                "headers": headers,
+                "content": {
+                    "size": len(body),
+                    "mimeType": mime_type,
+                    "text": base64.b64encode(body).decode("ascii"),
+                    "encoding": "base64",
+                },
+                "redirectURL": next((h["value"] for h in headers if h["name"].lower() == "location"), ""),
+                "headersSize": -1,
+                "bodySize": len(body),
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": 0, "receive": 0},
+        }
+        if post_data:
+            entry["request"]["postData"] = {
+                "mimeType": request_headers.get("content-type", ""),
+                "text": post_data.decode("utf-8", errors="replace"),
+            }
+        self.entries.append(entry)
+        self._index(entry)
+    
+    def match(self, method: str, url: str, post_data: Optional[bytes]) -> Optional[Dict]:
+        """
+        Find the recorded response for a request
+        
+        Repeated requests are answered in recorded order, then the last one
+        repeats. Requests that differ only in query string (cache busters)
+        fall back to the first recording of the same path.
+        """
+        candidates = self._exact.get(_request_key(method, url, post_data))
+        if not candidates:
+            candidates = self._loose.get((method.upper(), _without_query(url)))
+        if not candidates:
+            return None
+        key = id(candidates)
+        served = self._served.get(key, 0)
+        self._served[key] = served + 1
+        return candidates[min(served, len(candidates) - 1)]
+    
+    def has_document(self, url: str) -> bool:
+        """Whether a GET for this URL was recorded"""
+        return _request_key("GET", url, None) in self._exact
+    
+    def _index(self, entry: Dict) -> None:
+        request = entry["request"]
+        post_data = request.get("postData", {}).get("text")
+        key = _request_key(request["method"], request["url"], post_data.encode("utf-8") if post_data else None)
+        self._exact.setdefault(key, []).append(entry)
+        self._loose.setdefault((key[0], _without_query(request["url"])), []).append(entry)
+
+
+class ReplaySession:
+    """
+    Record or replay the traffic of one test on one context
+    
+    Attach before the test and detach after it; in record mode the
+    archive is written on detach.
+    """
+    
+    def __init__(self, mode: str, path: str):
+        if mode not in MODES:
+            raise ValueError(f"Unknown replay mode '{mode}', expected one of {MODES}")
+        self.mode = mode
+        self.path = path
+        self.served = 0
+        self.missed: List[str] = []
+        # Without a recording, strict replay still blocks the network; tests
+        # that never navigate (set_content fixtures) keep working
+        if mode != RECORD and os.path.exists(path):
+            self.archive = HarArchive.load(path)
+        else:
+            self.archive = HarArchive()
+    
+    @property
+    def strict(self) -> bool:
+        return self.mode == STRICT
+    
+    def attach(self, context: 'BrowserContext') -> None:
+        handler = self._record if self.mode == RECORD else self._replay
+        self._handler = handler
+        context.route("**/*", handler)
+        context._replay_session = self
+    
+    def detach(self, context: 'BrowserContext') -> None:
+        context.unroute("**/*", self._handler)
+        context._replay_session = None
+        if self.mode == RECORD and self.archive.entries:
+            self.archive.save(self.path)
+            logger.info(f"Recorded {len(self.archive.entries)} responses to {self.path}")
+    
+    def has_document(self, url: str) -> bool:
+        return self.archive.has_document(url)
+    
+    def _record(self, route: 'Route') -> None:
+        request = route.request
+        try:
+            response = route.fetch(max_redirects=0)
+        except Exception as e:
+            logger.warning(f"Recording failed for {request.url}: {e}")
+            route.abort()
+            return
+        body = response.body()
+        self.archive.add(
+            request.method, request.url, request.headers, request.post_data_buffer,
+            response.status, response.status_text, response.headers_array, body
+        )
+        route.fulfill(response=response, body=body)
+    
+    def _replay(self, route: 'Route') -> None:
+        request = route.request
+        entry = self.archive.match(request.method, request.url, request.post_data_buffer)
+        if entry is None:
+            self.missed.append(request.url)
+            if self.strict:
+                route.abort()
+            else:
+                route.fallback()
+            return
+        
+        self.served += 1
+        response = entry["response"]
+        content = response["content"]
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        route.fulfill(status=response["status"], headers=_fulfill_headers(response["headers"]), body=body)
+
+
+def _fulfill_headers(headers: List[Dict[str, str]]) -> Dict[str, str]:
+    merged: Dict[str, str] = {}
+    for header in headers:
+        name = header["name"].lower()
+        if name in _DROPPED_HEADERS:
+            continue
+        # Playwright accepts repeated headers such as set-cookie joined by newlines
+        merged[name] = f"{merged[name]}\n{header['value']}" if name in merged else header["value"]
+    return merged
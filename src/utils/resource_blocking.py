@@ -0,0 +1,159 @@
+# src/utils/resource_blocking.py
+"""
+Resource blocking profiles
+Aborts requests that selector-based assertions never need (media, fonts,
+ads, analytics) and keeps a tally of what was saved
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Tuple
+from urllib.parse import urlsplit
+
+from playwright.sync_api import BrowserContext, Response, Route
+
+FULL = "full"
+NO_MEDIA = "no-media"
+MINIMAL = "minimal"
+
+# Typical transfer sizes used until the session has seen real responses
+DEFAULT_SIZES = {
+    "image": 25_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 30_000,
+    "stylesheet": 20_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+FALLBACK_SIZE = 2_000
+
+AD_AND_ANALYTICS_DOMAINS = frozenset({
+    "amazon-adsystem.com",
+    "fls-na.amazon.com",
+    "unagi.amazon.com",
+    "unagi-na.amazon.com",
+    "doubleclick.net",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "facebook.net",
+    "scorecardresearch.com",
+})
+
+
+@dataclass(frozen=True)
+class BlockingProfile:
+    """Resource types and domains a profile refuses to load"""
+    name: str
+    resource_types: FrozenSet[str] = frozenset()
+    domains: FrozenSet[str] = frozenset()
+    
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.resource_types or self.domains)
+
+
+PROFILES = {
+    FULL: BlockingProfile(FULL),
+    NO_MEDIA: BlockingProfile(NO_MEDIA, resource_types=frozenset({"image", "media", "font"})),
+    MINIMAL: BlockingProfile(
+        MINIMAL,
+        resource_types=frozenset({"image", "media", "font", "texttrack", "manifest"}),
+        domains=AD_AND_ANALYTICS_DOMAINS
+    ),
+}
+
+
+def get_profile(name: str) -> BlockingProfile:
+    """Look up a profile by name"""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown blocking profile '{name}', expected one of {sorted(PROFILES)}")
+
+
+# Sizes learned from allowed responses, shared by every blocker in the process
+_observed_sizes: Dict[str, Tuple[int, int]] = {}
+
+
+def estimated_size(resource_type: str) -> int:
+    """Average observed size for a resource type, or a typical default"""
+    total, count = _observed_sizes.get(resource_type, (0, 0))
+    if count:
+        return total // count
+    return DEFAULT_SIZES.get(resource_type, FALLBACK_SIZE)
+
+
+@dataclass
+class BlockingStats:
+    """What one test did not have to download"""
+    blocked_requests: int = 0
+    allowed_requests: int = 0
+    saved_bytes: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+
+
+class ResourceBlocker:
+    """
+    Route handler applying a blocking profile to one context
+    
+    Decisions are cached per (host, resource type), so each pattern is
+    matched against the rules only once per process.
+    """
+    
+    _decisions: Dict[Tuple[str, str, str], bool] = {}
+    
+    def __init__(self, profile: BlockingProfile):
+        self.profile = profile
+        self.stats = BlockingStats()
+        
+    def attach(self, context: BrowserContext) -> None:
+        # Response events arrive anyway, so learning sizes costs no round-trips;
+        # only profiles that block something pay for interception
+        context.on("response", self._observe)
+        if self.profile.blocks_anything:
+            context.route("**/*", self._handle)
+        
+    def detach(self, context: BrowserContext) -> None:
+        context.remove_listener("response", self._observe)
+        if self.profile.blocks_anything:
+            context.unroute("**/*", self._handle)
+        
+    def should_block(self, url: str, resource_type: str) -> bool:
+        host = urlsplit(url).hostname or ""
+        key = (self.profile.name, host, resource_type)
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = resource_type in self.profile.resource_types or self._blocked_domain(host)
+            self._decisions[key] = decision
+        return decision
+        
+    def summary(self) -> str:
+        return (
+            f"{self.profile.name}: blocked {self.stats.blocked_requests} of "
+            f"{self.stats.blocked_requests + self.stats.allowed_requests} requests, "
+            f"~{self.stats.saved_bytes / 1024:.0f} KB saved"
+        )
+        
+    def _blocked_domain(self, host: str) -> bool:
+        parts = host.split(".")
+        return any(".".join(parts[i:]) in self.profile.domains for i in range(len(parts)))
+        
+    def _handle(self, route: Route) -> None:
+        request = route.request
+        resource_type = request.resource_type
+        if self.should_block(request.url, resource_type):
+            self.stats.blocked_requests += 1
+            self.stats.saved_bytes += estimated_size(resource_type)
+            self.stats.by_type[resource_type] = self.stats.by_type.get(resource_type, 0) + 1
+            route.abort("blockedbyclient")
+        else:
+            self.stats.allowed_requests += 1
+            route.fallback()
+            
+    def _observe(self, response: Response) -> None:
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            resource_type = response.request.resource_type
+            total, count = _observed_sizes.get(resource_type, (0, 0))
+            _observed_sizes[resource_type] = (total + int(length), count + 1)
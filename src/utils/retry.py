@@ -0,0 +1,112 @@
+# src/utils/retry.py
+"""
+Retry policy and flakiness ledger
+Classifies test failures, decides which are worth retrying and keeps a
+per-test record of retries and flaky passes across runs
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+DEFAULT_LEDGER_PATH = os.path.join("reports", "flakiness.json")
+
+TIMEOUT = "timeout"
+SELECTOR_MISSING = "selector_missing"
+NAVIGATION = "navigation"
+ASSERTION = "assertion"
+OTHER = "other"
+
+# Failure classes that tend to pass on a second attempt
+TRANSIENT = frozenset({TIMEOUT, NAVIGATION})
+
+# Longest pause between attempts, in seconds
+MAX_BACKOFF = 30.0
+
+_NAVIGATION_MARKERS = (
+    "net::ERR_", "NS_ERROR_", "Navigation failed", "navigation interrupted",
+    "Target page, context or browser has been closed", "Page crashed",
+)
+_SELECTOR_MARKERS = (
+    "strict mode violation", "resolved to 0 elements", "not attached to the DOM",
+    "Element is not visible", "No node found",
+)
+
+
+def classify_failure(exception: BaseException) -> str:
+    """Sort an exception into one of the failure classes"""
+    if isinstance(exception, AssertionError):
+        return ASSERTION
+    if isinstance(exception, PlaywrightTimeoutError):
+        return TIMEOUT
+    if isinstance(exception, PlaywrightError):
+        message = str(exception)
+        if any(marker in message for marker in _NAVIGATION_MARKERS):
+            return NAVIGATION
+        if any(marker in message for marker in _SELECTOR_MARKERS):
+            return SELECTOR_MISSING
+    return OTHER
+
+
+def backoff_delay(attempt: int, base: float) -> float:
+    """Exponential pause before retry number attempt + 1"""
+    return min(base * (2 ** attempt), MAX_BACKOFF)
+
+
+class RetryLedger:
+    """Per-test retry counts, kept for this session and merged into a JSON file"""
+    
+    def __init__(self):
+        self.session: Dict[str, Dict] = {}
+        
+    def record_retry(self, nodeid: str, failure_class: str) -> None:
+        entry = self._entry(self.session, nodeid)
+        entry["retries"] += 1
+        entry["classes"][failure_class] = entry["classes"].get(failure_class, 0) + 1
+        
+    def record_result(self, nodeid: str, attempts: int, failed: bool, failure_class: Optional[str]) -> None:
+        entry = self._entry(self.session, nodeid)
+        entry["runs"] += 1
+        if failed:
+            entry["failures"] += 1
+            if failure_class:
+                entry["classes"][failure_class] = entry["classes"].get(failure_class, 0) + 1
+        elif attempts > 1:
+            entry["flaky_passes"] += 1
+            
+    def flaky_tests(self) -> Dict[str, Dict]:
+        """Tests in this session that needed a retry"""
+        return {nodeid: entry for nodeid, entry in self.session.items() if entry["retries"]}
+        
+    @classmethod
+    def merge_into(cls, path: str, delta: Dict[str, Dict]) -> None:
+        """Add a session's counts to the ledger file"""
+        if not delta:
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                tests = json.load(f).get("tests", {})
+        except (OSError, ValueError):
+            tests = {}
+        for nodeid, counts in delta.items():
+            entry = cls._entry(tests, nodeid)
+            for key in ("runs", "failures", "retries", "flaky_passes"):
+                entry[key] += counts[key]
+            for failure_class, count in counts["classes"].items():
+                entry["classes"][failure_class] = entry["classes"].get(failure_class, 0) + count
+            entry["flakiness"] = round(entry["flaky_passes"] / entry["runs"], 4) if entry["runs"] else 0.0
+                
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "tests": dict(sorted(tests.items()))}, f, indent=2)
+        os.replace(tmp_path, path)
+        
+    @staticmethod
+    def _entry(tests: Dict[str, Dict], nodeid: str) -> Dict:
+        return tests.setdefault(nodeid, {
+            "runs": 0, "failures": 0, "retries": 0, "flaky_passes": 0, "classes": {}
+        })
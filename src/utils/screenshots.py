@@ -0,0 +1,165 @@
+# src/utils/screenshots.py
+"""
+Screenshot manager
+Captures screenshot buffers on the test thread and leaves writing,
+deduplication and disk-budget eviction to a background writer
+"""
+
+import glob
+import hashlib
+import itertools
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
+
+from src.config.config import config_default
+from src.utils.logger import logger, worker_id
+
+SCREENSHOT_DIR = os.path.join("reports", "screenshots")
+
+# Managed files end in the first 16 hex digits of their content hash
+_MANAGED_NAME = re.compile(r"_([0-9a-f]{16})\.png$")
+
+
+class ScreenshotManager:
+    """
+    Deduplicating, budgeted screenshot store
+    
+    Names carry a microsecond timestamp, the worker ID, a sequence number
+    and the content hash, so parallel workers never overwrite each other.
+    Identical frames are stored once. When the directory exceeds its
+    budget, the least recently used screenshots are deleted.
+    """
+    
+    # config.screenshot_budget_mb unless given, read on first use
+    budget_bytes = config_default('screenshot_budget_mb', lambda mb: mb * 1024 * 1024)
+    
+    def __init__(self, directory: str = SCREENSHOT_DIR, budget_bytes: Optional[int] = None):
+        self.directory = directory
+        if budget_bytes is not None:
+            self.budget_bytes = budget_bytes
+        self.stats = {"captured": 0, "deduplicated": 0, "written": 0, "evicted": 0}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-writer")
+        self._lock = threading.Lock()
+        self._files: 'OrderedDict[str, int]' = OrderedDict()
+        self._by_hash: Dict[str, str] = {}
+        self._total_bytes = 0
+        self._sequence = itertools.count()
+        self._pending: List[Future] = []
+        self._scanned = False
+    
+    def capture(self, page: 'Page', name: str, full_page: bool = False) -> str:
+        """
+        Take a screenshot; only the capture itself runs on the test thread
+        
+        Returns:
+            Path the screenshot is (or will shortly be) stored at
+        """
+        return self.save(page.screenshot(full_page=full_page), name)
+    
+    def save(self, buffer: bytes, name: str) -> str:
+        """Store an already captured PNG buffer"""
+        digest = hashlib.sha1(buffer).hexdigest()[:16]
+        with self._lock:
+            self._scan_existing()
+            self.stats["captured"] += 1
+            
+            existing = self._by_hash.get(digest)
+            if existing is not None:
+                self.stats["deduplicated"] += 1
+                self._files.move_to_end(existing)
+                return existing
+            
+            safe_name = re.sub(r"[^\w.-]+", "_", name).strip("_")[:80]
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            filename = f"{safe_name}_{timestamp}_{worker_id}_{next(self._sequence)}_{digest}.png"
+            path = os.path.join(self.directory, filename)
+            
+            self._by_hash[digest] = path
+            self._files[path] = len(buffer)
+            self._total_bytes += len(buffer)
+            self._pending.append(self._executor.submit(self._write, path, buffer))
+            self._evict_over_budget()
+        return path
+    
+    def flush(self) -> None:
+        """Wait until every queued screenshot is on disk"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning(f"Screenshot write failed: {e}")
+    
+    def summary(self) -> str:
+        return (
+            f"{self.stats['captured']} captured, {self.stats['deduplicated']} deduplicated, "
+            f"{self.stats['written']} written, {self.stats['evicted']} evicted, "
+            f"{self._total_bytes / 1024 / 1024:.1f} MB on disk"
+        )
+    
+    def _write(self, path: str, buffer: bytes) -> None:
+        with self._lock:
+            if path not in self._files:
+                # Evicted before it was ever written
+                return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(buffer)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            raise
+        with self._lock:
+            if path in self._files:
+                self.stats["written"] += 1
+                return
+        # Evicted while it was being written
+        self._remove(path)
+    
+    def _evict_over_budget(self) -> None:
+        """Drop the least recently used files from the accounting; called with the lock held"""
+        # Always keep the newest screenshot, even if it alone is over budget
+        while self._total_bytes > self.budget_bytes and len(self._files) > 1:
+            path, size = self._files.popitem(last=False)
+            self._total_bytes -= size
+            self._by_hash.pop(_MANAGED_NAME.search(path).group(1), None)
+            self.stats["evicted"] += 1
+            # Queued behind any pending write of the same file
+            self._pending.append(self._executor.submit(self._remove, path))
+    
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    def _scan_existing(self) -> None:
+        """Adopt screenshots left by earlier runs, oldest first, so the budget covers them"""
+        if self._scanned:
+            return
+        self._scanned = True
+        existing = []
+        for path in glob.glob(os.path.join(self.directory, "*.png")):
+            match = _MANAGED_NAME.search(path)
+            if match:
+                stat = os.stat(path)
+                existing.append((stat.st_mtime, path, stat.st_size, match.group(1)))
+        for _, path, size, digest in sorted(existing):
+            self._files[path] = size
+            self._by_hash[digest] = path
+            self._total_bytes += size
+
+
+screenshots = ScreenshotManager()
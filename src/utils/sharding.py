@@ -0,0 +1,127 @@
+# src/utils/sharding.py
+"""
+Duration-balanced test sharding
+Keeps a local history of test durations and splits tests across shards
+using longest-processing-time-first bin packing
+"""
+
+import heapq
+import json
+import os
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Dict, Iterable, List
+
+DEFAULT_HISTORY_PATH = os.path.join("reports", "test_durations.json")
+
+# Estimate for tests that have never run and an empty history
+DEFAULT_DURATION = 5.0
+
+# Weight of the newest run in the moving average
+SMOOTHING = 0.3
+
+
+class DurationHistory:
+    """Per-test durations from past runs, stored as JSON"""
+    
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        self.path = path
+        self.durations: Dict[str, float] = {}
+        self.runs: Dict[str, int] = {}
+        
+    @classmethod
+    def load(cls, path: str = DEFAULT_HISTORY_PATH) -> 'DurationHistory':
+        """Load history from disk; a missing or unreadable file gives an empty history"""
+        history = cls(path)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return history
+        for nodeid, entry in data.get("tests", {}).items():
+            history.durations[nodeid] = float(entry["duration"])
+            history.runs[nodeid] = int(entry.get("runs", 1))
+        return history
+        
+    def save(self) -> None:
+        """Write history atomically so an interrupted run never truncates it"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "version": 1,
+            "tests": {
+                nodeid: {"duration": round(duration, 4), "runs": self.runs.get(nodeid, 1)}
+                for nodeid, duration in sorted(self.durations.items())
+            },
+        }
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+        
+    def record(self, nodeid: str, duration: float) -> None:
+        """Fold a new measurement into the moving average"""
+        previous = self.durations.get(nodeid)
+        if previous is None:
+            self.durations[nodeid] = duration
+        else:
+            self.durations[nodeid] = SMOOTHING * duration + (1 - SMOOTHING) * previous
+        self.runs[nodeid] = self.runs.get(nodeid, 0) + 1
+        
+    def update(self, durations: Dict[str, float]) -> None:
+        """Record a batch of measurements"""
+        for nodeid, duration in durations.items():
+            self.record(nodeid, duration)
+            
+    def estimate(self, nodeid: str) -> float:
+        """Expected duration, falling back to the median of known tests"""
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        if self.durations:
+            return median(self.durations.values())
+        return DEFAULT_DURATION
+
+
+@dataclass
+class Shard:
+    """Tests assigned to one worker and their expected total duration"""
+    index: int
+    nodeids: List[str] = field(default_factory=list)
+    load: float = 0.0
+
+
+def plan_shards(nodeids: Iterable[str], history: DurationHistory, count: int) -> List[Shard]:
+    """
+    Split tests across shards with longest-processing-time-first packing
+    
+    Args:
+        nodeids: Collected test node IDs
+        history: Past durations used as estimates
+        count: Number of shards
+        
+    Returns:
+        One Shard per index; the same inputs always give the same plan
+    """
+    count = max(count, 1)
+    shards = [Shard(index=i) for i in range(count)]
+    
+    # Longest first, node ID as tie-break so every worker computes the same plan
+    estimates = sorted(
+        ((history.estimate(nodeid), nodeid) for nodeid in set(nodeids)),
+        key=lambda item: (-item[0], item[1])
+    )
+    heap = [(0.0, i) for i in range(count)]
+    for duration, nodeid in estimates:
+        load, index = heapq.heappop(heap)
+        shards[index].nodeids.append(nodeid)
+        shards[index].load = load + duration
+        heapq.heappush(heap, (shards[index].load, index))
+    return shards
+
+
+def imbalance(loads: List[float]) -> float:
+    """Ratio of the slowest shard to the mean shard load (1.0 is perfect)"""
+    if not loads or sum(loads) == 0:
+        return 1.0
+    return max(loads) / (sum(loads) / len(loads))
@@ -0,0 +1,148 @@
+# src/utils/timing.py
+"""
+Per-step timing for page objects
+Times page-object actions and selector waits, attributes them to the
+running test and aggregates them into flame-style collapsed stacks
+"""
+
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.config.config import config_default
+
+
+@dataclass
+class StepStats:
+    """Aggregate for one stack of steps"""
+    count: int = 0
+    total: float = 0.0
+    self_time: float = 0.0
+
+
+class StepProfiler:
+    """
+    Collects nested step timings keyed by (test, step, sub-step, ...)
+    
+    When disabled, steps cost one attribute check and no clock reads.
+    """
+    
+    # config.profile_steps unless given, read on first use
+    enabled = config_default('profile_steps')
+    
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is not None:
+            self.enabled = enabled
+        self.current_test = "<no test>"
+        self.stats: Dict[Tuple[str, ...], StepStats] = {}
+        # Called with the step name as each page-object action starts,
+        # e.g. by the flight recorder; independent of enabled
+        self.observer: Optional[Callable[[str], None]] = None
+        # Each frame is [name, seconds spent in child steps]
+        self._stack: ContextVar[Tuple[list, ...]] = ContextVar("step_stack", default=())
+    
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time a block as a step nested under the currently running one"""
+        if not self.enabled:
+            yield
+            return
+        
+        parent = self._stack.get()
+        frame = [name.replace(";", ","), 0.0]
+        token = self._stack.set(parent + (frame,))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.reset(token)
+            if parent:
+                parent[-1][1] += elapsed
+            key = (self.current_test,) + tuple(f[0] for f in parent) + (frame[0],)
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = StepStats()
+            stats.count += 1
+            stats.total += elapsed
+            stats.self_time += elapsed - frame[1]
+    
+    def reset(self) -> None:
+        self.stats.clear()
+    
+    def top_steps(self, limit: int = 15) -> List[Tuple[str, StepStats]]:
+        """Steps across all tests, ordered by the time spent in them directly"""
+        merged: Dict[str, StepStats] = {}
+        for key, stats in self.stats.items():
+            step = merged.setdefault(key[-1], StepStats())
+            step.count += stats.count
+            step.total += stats.total
+            step.self_time += stats.self_time
+        return sorted(merged.items(), key=lambda item: item[1].self_time, reverse=True)[:limit]
+    
+    def folded_lines(self) -> List[str]:
+        """Collapsed stacks ('test;step;sub-step microseconds') for flame graph tools"""
+        return [
+            f"{';'.join(key)} {int(stats.self_time * 1_000_000)}"
+            for key, stats in sorted(self.stats.items())
+        ]
+    
+    def write_folded(self, directory: str = os.path.join("reports", "profile")) -> Optional[str]:
+        """Write collapsed stacks for this process; returns the file path"""
+        if not self.stats:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"steps_{os.getpid()}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.folded_lines()) + "\n")
+        return path
+
+
+profiler = StepProfiler()
+
+
+def timed(func=None, *, selector: bool = False):
+    """
+    Time a page-object method as a step
+    
+    Args:
+        selector: Include the method's selector argument in the step name
+    """
+    def decorate(func):
+        name = func.__qualname__
+        
+        def label(args, kwargs) -> str:
+            if not selector:
+                return name
+            target = kwargs.get("selector", args[1] if len(args) > 1 else None)
+            return f"{name}({target})"
+        
+        if inspect.iscoroutinefunction(func):
+            # Each asyncio task runs in its own context, so concurrent
+            # steps nest under the step that started their task
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if profiler.observer is not None:
+                    profiler.observer(label(args, kwargs))
+                if not profiler.enabled:
+                    return await func(*args, **kwargs)
+                with profiler.step(label(args, kwargs)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if profiler.observer is not None:
+                profiler.observer(label(args, kwargs))
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler.step(label(args, kwargs)):
+                return func(*args, **kwargs)
+        return wrapper
+    
+    return decorate(func) if func is not None else decorate
@@ -0,0 +1,546 @@
+# src/utils/visual.py
+"""
+Visual baselines for screenshot assertions
+Each capture is reduced to a perceptual hash plus one signature per tile
+(an exact digest and a perceptual hash); captures are compared with the
+baseline signature first, and pixels are only diffed in tiles whose
+digest changed.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import struct
+import time
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import accumulate, repeat
+from typing import Dict, List, Optional, Tuple
+
+from src.config.config import config, config_default
+from src.utils.logger import logger
+from src.utils.perf_db import current_target
+
+VISUAL_DIR = os.path.join("reports", "visual")
+INDEX_NAME = "index.json"
+
+# A pixel differs when any color channel moved by more than this
+PIXEL_TOLERANCE = 16
+
+# Without a baseline PNG, a changed tile counts as different when its
+# perceptual hash moved by more than this many of its 64 bits
+TILE_HASH_DISTANCE = 6
+
+# Cell means closer than this (0-255 scale) hash as equal, so flat areas
+# with rendering noise keep a stable hash
+HASH_MARGIN = 2.0
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+_COLOR_TYPES = {channels: color_type for color_type, channels in _CHANNELS.items()}
+_BROWSER_PARAM = re.compile(r"(?<=\[)(chromium|firefox|webkit)(-|(?=\]))")
+
+
+@dataclass
+class Image:
+    """8-bit pixels, one bytes object per row"""
+    width: int
+    height: int
+    channels: int
+    rows: List[bytes]
+
+
+@lru_cache(maxsize=1)
+def _pillow():
+    try:
+        from PIL import Image as PillowImage
+    except ImportError:
+        return None
+    return PillowImage
+
+
+def decode_png(data: bytes) -> Image:
+    """
+    Decode a PNG capture
+    
+    Uses Pillow when it is installed; otherwise a standard-library decoder
+    that handles non-interlaced 8-bit PNGs, as browsers write screenshots,
+    at a few seconds per full-HD capture in the worst case.
+    
+    Raises:
+        ValueError: The data is not a PNG this decoder handles
+    """
+    pillow = _pillow()
+    if pillow is None:
+        return _decode_png(data)
+    if not data.startswith(_PNG_SIGNATURE):
+        raise ValueError("Not a PNG")
+    with pillow.open(io.BytesIO(data)) as decoded:
+        if decoded.mode not in ("L", "LA", "RGB", "RGBA"):
+            decoded = decoded.convert("RGBA")
+        channels = len(decoded.mode)
+        raw = decoded.tobytes()
+        width, height = decoded.size
+    stride = width * channels
+    return Image(width, height, channels, [raw[y * stride:(y + 1) * stride] for y in range(height)])
+
+
+def _decode_png(data: bytes) -> Image:
+    if not data.startswith(_PNG_SIGNATURE):
+        raise ValueError("Not a PNG")
+    pos = len(_PNG_SIGNATURE)
+    header = None
+    idat = []
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += length + 12
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"IDAT":
+            idat.append(chunk)
+        elif kind == b"IEND":
+            break
+    if header is None:
+        raise ValueError("PNG without IHDR")
+    width, height, depth, color_type, _, _, interlace = header
+    if depth != 8 or color_type not in _CHANNELS or interlace:
+        raise ValueError(f"Unsupported PNG: depth {depth}, color type {color_type}, interlace {interlace}")
+    channels = _CHANNELS[color_type]
+    return Image(width, height, channels, _unfilter(zlib.decompress(b"".join(idat)), width, height, channels))
+
+
+def encode_png(image: Image, level: int = 6) -> bytes:
+    """Encode an image as PNG, unfiltered, at a zlib compression level"""
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+    
+    header = struct.pack(">IIBBBBB", image.width, image.height, 8, _COLOR_TYPES[image.channels], 0, 0, 0)
+    raw = b"".join(b"\x00" + bytes(row) for row in image.rows)
+    return _PNG_SIGNATURE + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, level)) + chunk(b"IEND", b"")
+
+
+def _unfilter(raw: bytes, width: int, height: int, channels: int) -> List[bytes]:
+    stride = width * channels
+    rows = []
+    prev = bytes(stride)
+    pos = 0
+    for _ in range(height):
+        kind = raw[pos]
+        line = raw[pos + 1:pos + 1 + stride]
+        pos += stride + 1
+        if kind == 0:
+            row = line
+        elif kind == 1:
+            row = _unfilter_sub(line, channels)
+        elif kind == 2:
+            row = _add_bytes(line, prev)
+        elif kind == 3:
+            row = _unfilter_average(line, prev, channels)
+        elif kind == 4:
+            row = _unfilter_paeth(line, prev, channels)
+        else:
+            raise ValueError(f"Unknown PNG filter type {kind}")
+        row = bytes(row)
+        rows.append(row)
+        prev = row
+    return rows
+
+
+@lru_cache(maxsize=8)
+def _byte_masks(n: int) -> Tuple[int, int]:
+    return int.from_bytes(b"\x7f" * n, "little"), int.from_bytes(b"\x80" * n, "little")
+
+
+def _add_bytes(a: bytes, b: bytes) -> bytes:
+    """Bytewise a + b mod 256, on whole rows as integers"""
+    n = len(a)
+    low, high = _byte_masks(n)
+    x = int.from_bytes(a, "little")
+    y = int.from_bytes(b, "little")
+    return (((x & low) + (y & low)) ^ ((x ^ y) & high)).to_bytes(n, "little")
+
+
+def _unfilter_sub(line: bytes, channels: int) -> bytearray:
+    out = bytearray(line)
+    for channel in range(channels):
+        out[channel::channels] = bytes(map(int.__and__, accumulate(line[channel::channels]), repeat(255)))
+    return out
+
+
+def _unfilter_average(line: bytes, prev: bytes, channels: int) -> bytearray:
+    out = bytearray(line)
+    for i in range(channels):
+        out[i] = (out[i] + (prev[i] >> 1)) & 255
+    for i in range(channels, len(out)):
+        out[i] = (out[i] + ((out[i - channels] + prev[i]) >> 1)) & 255
+    return out
+
+
+def _unfilter_paeth(line: bytes, prev: bytes, channels: int) -> bytearray:
+    out = bytearray(line)
+    for i in range(channels):
+        out[i] = (out[i] + prev[i]) & 255
+    for i in range(channels, len(out)):
+        a = out[i - channels]
+        b = prev[i]
+        c = prev[i - channels]
+        pa = abs(b - c)
+        pb = abs(a - c)
+        pc = abs(a + b - c - c)
+        if pa <= pb and pa <= pc:
+            out[i] = (out[i] + a) & 255
+        elif pb <= pc:
+            out[i] = (out[i] + b) & 255
+        else:
+            out[i] = (out[i] + c) & 255
+    return out
+
+
+def difference_hash(image: Image, x0: int, y0: int, x1: int, y1: int, row_step: int = 1) -> int:
+    """
+    64-bit dHash of a region: each bit says whether a cell of a 9x8 grid
+    of mean intensities is brighter than its left neighbour
+    """
+    channels = image.channels
+    xs = [x0 + (x1 - x0) * i // 9 for i in range(10)]
+    ys = [y0 + (y1 - y0) * j // 8 for j in range(9)]
+    bits = 0
+    for j in range(8):
+        sampled = image.rows[ys[j]:ys[j + 1]:row_step]
+        sums = [0] * 9
+        for row in sampled:
+            for i in range(9):
+                sums[i] += sum(row[xs[i] * channels:xs[i + 1] * channels])
+        means = [
+            total / ((xs[i + 1] - xs[i]) * channels * len(sampled)) if xs[i + 1] > xs[i] and sampled else 0.0
+            for i, total in enumerate(sums)
+        ]
+        for i in range(8):
+            bits = bits << 1 | (means[i + 1] - means[i] > HASH_MARGIN)
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+@dataclass(frozen=True)
+class TileSignature:
+    """Exact digest and perceptual hash of one tile"""
+    digest: str
+    phash: int
+
+
+@dataclass
+class Signature:
+    """Compact description of a capture: size, perceptual hash and tiles in row-major order"""
+    width: int
+    height: int
+    tile_size: int
+    phash: int
+    tiles: List[TileSignature] = field(default_factory=list)
+    
+    def tile_box(self, index: int) -> Tuple[int, int, int, int]:
+        """(x0, y0, x1, y1) of a tile"""
+        columns = -(-self.width // self.tile_size)
+        x0 = index % columns * self.tile_size
+        y0 = index // columns * self.tile_size
+        return x0, y0, min(x0 + self.tile_size, self.width), min(y0 + self.tile_size, self.height)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "width": self.width,
+            "height": self.height,
+            "tile_size": self.tile_size,
+            "phash": f"{self.phash:016x}",
+            "tiles": [[tile.digest, f"{tile.phash:016x}"] for tile in self.tiles],
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Signature':
+        return cls(
+            data["width"], data["height"], data["tile_size"], int(data["phash"], 16),
+            [TileSignature(digest, int(phash, 16)) for digest, phash in data["tiles"]],
+        )
+
+
+def image_hash(image: Image) -> int:
+    """Perceptual hash of the whole capture, from every 64th of its rows"""
+    return difference_hash(image, 0, 0, image.width, image.height, max(1, image.height // 64))
+
+
+def tile_hash(image: Image, box: Tuple[int, int, int, int]) -> int:
+    """Perceptual hash of one tile, from every fourth row of a 128-pixel tile"""
+    x0, y0, x1, y1 = box
+    return difference_hash(image, x0, y0, x1, y1, max(1, (y1 - y0) // 32))
+
+
+def tile_digests(image: Image, tile_size: int) -> List[str]:
+    """Exact digest of every tile, in row-major order"""
+    channels = image.channels
+    digests = []
+    for y0 in range(0, image.height, tile_size):
+        band = image.rows[y0:y0 + tile_size]
+        for x0 in range(0, image.width, tile_size):
+            start, end = x0 * channels, min(x0 + tile_size, image.width) * channels
+            digests.append(hashlib.blake2b(b"".join(row[start:end] for row in band), digest_size=8).hexdigest())
+    return digests
+
+
+def signature(image: Image, tile_size: int = 128) -> Signature:
+    """Perceptual hash of the whole image and a signature per tile"""
+    sig = Signature(image.width, image.height, tile_size, image_hash(image))
+    sig.tiles = [
+        TileSignature(digest, tile_hash(image, sig.tile_box(i)))
+        for i, digest in enumerate(tile_digests(image, tile_size))
+    ]
+    return sig
+
+
+def diff_region(baseline: Image, current: Image, box: Tuple[int, int, int, int],
+                tolerance: int = PIXEL_TOLERANCE, mark: Optional[List[bytearray]] = None) -> int:
+    """
+    Count the pixels of a region whose color differs beyond tolerance
+    
+    Args:
+        mark: Rows of a copy of the current image; differing pixels are painted red
+    """
+    x0, y0, x1, y1 = box
+    bc, cc = baseline.channels, current.channels
+    colors = min(bc, cc, 3)
+    count = 0
+    for y in range(y0, y1):
+        base_row, row = baseline.rows[y], current.rows[y]
+        if bc == cc and base_row[x0 * bc:x1 * bc] == row[x0 * cc:x1 * cc]:
+            continue
+        for x in range(x0, x1):
+            b, c = x * bc, x * cc
+            for k in range(colors):
+                if abs(base_row[b + k] - row[c + k]) > tolerance:
+                    count += 1
+                    if mark is not None:
+                        mark[y][c:c + min(cc, 3)] = b"\xff\x00\x00"[:min(cc, 3)]
+                    break
+    return count
+
+
+@dataclass
+class VisualResult:
+    """Outcome of one visual check"""
+    key: str
+    # 'new', 'updated', 'missing', 'identical', 'match', 'mismatch' or 'resized'
+    status: str
+    tiles: int = 0
+    changed_tiles: List[int] = field(default_factory=list)
+    diff_pixels: int = 0
+    total_pixels: int = 0
+    image_distance: int = 0
+    seconds: float = 0.0
+    current_path: Optional[str] = None
+    diff_path: Optional[str] = None
+    
+    @property
+    def passed(self) -> bool:
+        return self.status not in ("mismatch", "resized")
+    
+    @property
+    def diff_ratio(self) -> float:
+        return self.diff_pixels / self.total_pixels if self.total_pixels else 0.0
+    
+    def describe(self) -> str:
+        if self.status == "resized":
+            return f"{self.key}: capture size differs from the baseline; see {self.current_path}"
+        return (
+            f"{self.key}: {self.status}, {len(self.changed_tiles)}/{self.tiles} tiles changed, "
+            f"{self.diff_pixels} pixels ({self.diff_ratio:.3%}) differ, hash distance {self.image_distance}"
+            + (f"; see {self.diff_path}" if self.diff_path else "")
+        )
+
+
+def baseline_key(nodeid: str, name: str, viewport: str, browser: str) -> str:
+    """Index key of a capture; the browser is part of the key, not of the test"""
+    test = _BROWSER_PARAM.sub("", nodeid).replace("[]", "")
+    return f"{test}::{name}|{viewport}|{browser}"
+
+
+def default_baseline_dir(root: Optional[str] = None) -> str:
+    """Baselines of the site under test; the stand-in and live sites never share them"""
+    return os.path.join(config.visual_baseline_dir if root is None else root, current_target())
+
+
+def _file_name(key: str) -> str:
+    safe = re.sub(r"[^\w.-]+", "_", key).strip("_")[-80:]
+    return f"{safe}_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]}.png"
+
+
+class VisualIndex:
+    """Baseline signatures by key, in one JSON file next to the baseline PNGs"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries: Dict[str, Dict] = json.load(f).get("baselines", {})
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    @classmethod
+    def merge_into(cls, path: str, delta: Dict[str, Dict]) -> None:
+        """Add a session's new and updated baselines to the index file"""
+        if not delta:
+            return
+        entries = cls(path).entries
+        entries.update(delta)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "baselines": dict(sorted(entries.items()))}, f, indent=1)
+        os.replace(tmp_path, path)
+
+
+class VisualChecker:
+    """
+    Compares captures with their baselines, cheapest evidence first
+    
+    Identical PNG bytes pass without decoding. Otherwise the capture is
+    decoded and signed, and only tiles whose digest differs from the
+    baseline are diffed pixel by pixel. Update mode writes every capture
+    as the new baseline; otherwise a capture without a baseline is
+    reported missing and nothing is written to the baseline directory.
+    """
+    
+    # Settings read on first use unless given
+    baseline_dir = config_default('visual_baseline_dir', default_baseline_dir)
+    tile_size = config_default('visual_tile_size')
+    threshold = config_default('visual_threshold')
+    update = config_default('visual', lambda mode: mode == "update")
+    
+    def __init__(self, baseline_dir: Optional[str] = None, output_dir: str = VISUAL_DIR,
+                 tile_size: Optional[int] = None, threshold: Optional[float] = None,
+                 update: Optional[bool] = None):
+        if baseline_dir is not None:
+            self.baseline_dir = baseline_dir
+        self.output_dir = output_dir
+        if tile_size is not None:
+            self.tile_size = tile_size
+        if threshold is not None:
+            self.threshold = threshold
+        if update is not None:
+            self.update = update
+        self._index: Optional[VisualIndex] = None
+        # New and updated entries of this session, merged into the index file at the end
+        self.session: Dict[str, Dict] = {}
+        self.stats = {"checks": 0, "identical": 0, "new": 0, "missing": 0, "mismatches": 0,
+                      "tiles": 0, "tiles_diffed": 0}
+    
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.baseline_dir, INDEX_NAME)
+    
+    @property
+    def index(self) -> VisualIndex:
+        if self._index is None:
+            self._index = VisualIndex(self.index_path)
+        return self._index
+    
+    def check(self, png: bytes, key: str) -> VisualResult:
+        """Compare one PNG capture with the baseline stored under key"""
+        start = time.perf_counter()
+        self.stats["checks"] += 1
+        entry = self.session.get(key) or self.index.entries.get(key)
+        if entry is None and not self.update:
+            self.stats["missing"] += 1
+            return VisualResult(key, "missing", seconds=time.perf_counter() - start)
+        png_digest = hashlib.sha1(png).hexdigest()
+        
+        if not self.update and entry["png_sha1"] == png_digest:
+            self.stats["identical"] += 1
+            tiles = len(entry["signature"]["tiles"])
+            self.stats["tiles"] += tiles
+            return VisualResult(key, "identical", tiles, seconds=time.perf_counter() - start)
+        
+        image = decode_png(png)
+        if self.update:
+            sig = signature(image, self.tile_size)
+            self._store(key, png, png_digest, sig)
+            self.stats["new"] += 1
+            return VisualResult(key, "updated" if entry else "new", len(sig.tiles),
+                                total_pixels=image.width * image.height, seconds=time.perf_counter() - start)
+        
+        baseline = Signature.from_dict(entry["signature"])
+        result = VisualResult(key, "match", len(baseline.tiles), total_pixels=image.width * image.height)
+        self.stats["tiles"] += len(baseline.tiles)
+        if (image.width, image.height) != (baseline.width, baseline.height):
+            result.status = "resized"
+            result.current_path = self._write(key, "current", png)
+            self.stats["mismatches"] += 1
+            result.seconds = time.perf_counter() - start
+            return result
+        
+        # Only digests are needed to find changed tiles; perceptual hashes
+        # are computed for baselines, and here only where they are used
+        result.image_distance = hamming(image_hash(image), baseline.phash)
+        result.changed_tiles = [
+            i for i, (old, new) in enumerate(zip(baseline.tiles, tile_digests(image, baseline.tile_size)))
+            if old.digest != new
+        ]
+        if result.changed_tiles:
+            self.stats["tiles_diffed"] += len(result.changed_tiles)
+            result.diff_pixels, mark = self._diff_tiles(entry, baseline, image, result.changed_tiles)
+            if result.diff_ratio > self.threshold:
+                result.status = "mismatch"
+                self.stats["mismatches"] += 1
+                result.current_path = self._write(key, "current", png)
+                if mark is not None:
+                    marked = Image(image.width, image.height, image.channels, [bytes(row) for row in mark])
+                    result.diff_path = self._write(key, "diff", encode_png(marked))
+        result.seconds = time.perf_counter() - start
+        return result
+    
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"{s['checks']} checks, {s['identical']} byte-identical, {s['new']} baselines written, "
+            f"{s['missing']} without a baseline, {s['mismatches']} mismatches; {s['tiles_diffed']} of {s['tiles']} tiles diffed"
+        )
+    
+    def _diff_tiles(self, entry: Dict, baseline: Signature, image: Image,
+                    changed: List[int]) -> Tuple[int, Optional[List[bytearray]]]:
+        path = os.path.join(self.baseline_dir, entry["png"])
+        try:
+            with open(path, "rb") as f:
+                baseline_image = decode_png(f.read())
+        except OSError:
+            # Index without its PNGs: judge changed tiles by their perceptual hashes
+            logger.warning(f"Baseline image {path} missing; comparing tile hashes only")
+            diff_pixels = 0
+            for i in changed:
+                box = baseline.tile_box(i)
+                if hamming(baseline.tiles[i].phash, tile_hash(image, box)) > TILE_HASH_DISTANCE:
+                    diff_pixels += (box[2] - box[0]) * (box[3] - box[1])
+            return diff_pixels, None
+        mark = [bytearray(row) for row in image.rows]
+        diff_pixels = sum(diff_region(baseline_image, image, baseline.tile_box(i), mark=mark) for i in changed)
+        return diff_pixels, mark
+    
+    def _store(self, key: str, png: bytes, png_digest: str, sig: Signature) -> None:
+        name = _file_name(key)
+        os.makedirs(self.baseline_dir, exist_ok=True)
+        path = os.path.join(self.baseline_dir, name)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(png)
+        os.replace(tmp_path, path)
+        self.session[key] = {"png": name, "png_sha1": png_digest, "signature": sig.to_dict()}
+        logger.info(f"Visual baseline written for {key}")
+    
+    def _write(self, key: str, kind: str, png: bytes) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, _file_name(key).replace(".png", f".{kind}.png"))
+        with open(path, "wb") as f:
+            f.write(png)
+        return path